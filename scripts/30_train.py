@@ -32,8 +32,9 @@ from sklearn.model_selection import GridSearchCV, GroupKFold, GroupShuffleSplit,
 from tqdm import tqdm
 from xgboost.callback import EarlyStopping
 
-from recur_scan.features import get_features
+from recur_scan.features import get_features_batch
 from recur_scan.transactions import (
+    Transaction,
     group_transactions,
     read_labeled_transactions,
     write_labeled_transactions,
@@ -212,16 +213,22 @@ if use_precomputed_features:
     features = pd.read_csv(precomputed_features_path).to_dict(orient="records")
     logger.info(f"Read {len(features)} precomputed features: {len(features[0])} features per transaction")
 else:
-    # feature generation is parallelized using joblib
+    # feature generation is parallelized using joblib, one task per group of transactions
+    # so the features cached on the group's list are computed once per group
     # Use backend that works better with shared memory
     try:
         with joblib.parallel_backend("loky", n_jobs=n_jobs):
-            features = joblib.Parallel(
+            group_features = joblib.Parallel(
                 verbose=1,
             )(
-                joblib.delayed(get_features)(transaction, grouped_transactions[(transaction.user_id, transaction.name)])
-                for transaction in tqdm(transactions, desc="Processing transactions")
+                # pass a copy of each group, since some features sort the list in place
+                joblib.delayed(get_features_batch)(list(group))
+                for group in tqdm(grouped_transactions.values(), desc="Processing transaction groups")
             )
+        features_by_transaction: dict[Transaction, Any] = {}
+        for group, features_list in zip(grouped_transactions.values(), group_features, strict=True):
+            features_by_transaction.update(zip(group, features_list, strict=True))
+        features = [features_by_transaction[transaction] for transaction in transactions]
         # save the features to a csv file
         pd.DataFrame(features).to_csv(precomputed_features_path, index=False)
         logger.info(f"Generated {len(features)} features")
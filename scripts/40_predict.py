@@ -13,8 +13,9 @@ import joblib
 from loguru import logger
 from tqdm import tqdm
 
-from recur_scan.features import get_features
+from recur_scan.features import get_features_batch
 from recur_scan.transactions import (
+    Transaction,
     group_transactions,
     read_earnin_test_transactions,
     read_test_transactions,
@@ -95,17 +96,29 @@ for csv_file in csv_files:
     for batch_idx, batch in enumerate(transaction_batches):
         logger.info(f"Processing batch {batch_idx + 1}/{len(transaction_batches)} with {len(batch)} transactions")
 
-        # Generate features for this batch
+        # Generate features for this batch, one task per group of transactions in the batch
+        # so the features cached on the group's list are computed once per group. Only the
+        # group's transactions in this batch get features, but against the whole group.
+        batch_by_group: dict[tuple[str, str], list[Transaction]] = {}
+        for transaction in batch:
+            batch_by_group.setdefault((transaction.user_id, transaction.name), []).append(transaction)
         with joblib.parallel_backend("loky", n_jobs=n_jobs):
-            batch_features = joblib.Parallel(verbose=1)(
-                joblib.delayed(get_features)(transaction, grouped_transactions[(transaction.user_id, transaction.name)])
-                for transaction in tqdm(batch, desc=f"Processing batch {batch_idx + 1} of {file_name}")
+            group_features = joblib.Parallel(verbose=1)(
+                # pass a copy of each group, since some features sort the list in place
+                joblib.delayed(get_features_batch)(list(grouped_transactions[key]), group_batch)
+                for key, group_batch in tqdm(
+                    batch_by_group.items(), desc=f"Processing batch {batch_idx + 1} of {file_name}"
+                )
             )
+        features_by_transaction: dict[Transaction, dict[str, float | int | bool]] = {}
+        for group_batch, features_list in zip(batch_by_group.values(), group_features, strict=True):
+            features_by_transaction.update(zip(group_batch, features_list, strict=True))
+        batch_features = [features_by_transaction[transaction] for transaction in batch]
         logger.info(f"Generated features for batch {batch_idx + 1}")
 
         # Transform batch features to matrix and release memory
         X_batch = dict_vectorizer.transform(batch_features)
-        batch_features = None  # Release memory
+        del batch_features  # Release memory
         gc.collect()  # Force garbage collection
         logger.info(f"Vectorized batch {batch_idx + 1}")
 
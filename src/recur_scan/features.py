@@ -400,7 +400,7 @@ from recur_scan.features_yoloye import (
     get_early_quarterly as get_early_quarterly_yoloye,
 )
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import cache_by_list_identity, parse_date
 
 # Turn NumPy floating-point warnings into exceptions
 np.seterr(divide="raise", invalid="raise")
@@ -408,6 +408,44 @@ np.seterr(divide="raise", invalid="raise")
 warnings.filterwarnings("error", category=RuntimeWarning)
 
 
+@cache_by_list_identity()
+def _get_vendor_features_frank(all_transactions: list[Transaction]) -> dict[str, float | int | bool]:
+    """Get Frank's features that depend only on the vendor's transactions, computed once per list."""
+    return {
+        "amount_stability_score_frank": amount_stability_score_frank(all_transactions),
+        "weekly_spendings_frank": weekly_spending_cycle_frank(all_transactions),
+        "vendor_recurrence_trend_frank": vendor_recurrence_trend_frank(all_transactions),
+        "transaction_per_week_frank": transactions_per_week_frank(all_transactions),
+        "transaction_per_month_frank": transactions_per_month_frank(all_transactions),
+        "irregular_interval_score_frank": irregular_interval_score_frank(all_transactions),
+        "amount_coefficient_of_variation_frank": amount_coefficient_of_variation_frank(all_transactions),
+        "recurring_confidence_frank": recurring_confidence_frank(all_transactions),
+        "amount_variability_ratio_frank": amount_variability_ratio_frank(all_transactions),
+        "robust_interval_iqr_frank": robust_interval_iqr_frank(all_transactions),
+        "transaction_frequency_frank": transaction_frequency_frank(all_transactions),
+        "most_common_interval_frank": most_common_interval_frank(all_transactions),
+        "enhanced_amt_iqr_frank": enhanced_amt_iqr_frank(all_transactions),
+        "get_subscription_score_frank": get_subscription_score_frank(all_transactions),
+        "get_amount_consistency_frank": get_amount_consistency_frank(all_transactions),
+        "coefficient_of_variation_intervals_frank": coefficient_of_variation_intervals_frank(all_transactions),
+        "calculate_cycle_consistency_frank": calculate_cycle_consistency_frank(all_transactions),
+        "date_irregularity_score_frank": date_irregularity_score_frank(all_transactions),
+        "amount_variability_score_frank": amount_variability_score_frank(all_transactions),
+        "is_non_recurring_frank": is_non_recurring_frank(all_transactions),
+        "temporal_pattern_stability_score_frank": temporal_pattern_stability_score_frank(all_transactions),
+        "vendor_reliability_score_frank": vendor_reliability_score_frank(all_transactions),
+        "is_business_day_aligned_frank": is_business_day_aligned_frank(all_transactions),
+        "detect_multi_tier_subscription_frank": detect_multi_tier_subscription_frank(all_transactions),
+        "detect_annual_price_adjustment_frank": detect_annual_price_adjustment_frank(all_transactions),
+        "detect_pay_period_alignment_frank": detect_pay_period_alignment_frank(all_transactions),
+        "is_cleo_ai_cash_advance_like_frank": is_cleo_ai_cash_advance_like_frank(all_transactions),
+        "is_apple_subscription_like_frank": is_apple_subscription_like_frank(all_transactions),
+        "is_amazon_prime_like_subscription_frank": is_amazon_prime_like_subscription_frank(all_transactions),
+        "is_utilities_or_insurance_like_frank": is_utilities_or_insurance_like_frank(all_transactions),
+        "is_always_recurring_vendor_frank": is_always_recurring_vendor_frank(all_transactions),
+    }
+
+
 def get_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float | int | bool]:
     """Get the features for a transaction"""
     """Extract all features for a transaction by calling individual feature functions.
@@ -454,7 +492,7 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
 
     sequence_features = detect_sequence_patterns_emmanuel_eze(transaction, all_transactions)
 
-    return {
+    features: dict[str, float | int | bool] = {
         # DallanQ's features
         "n_transactions_same_amount_dallanq": get_n_transactions_same_amount_dallanq(transaction, all_transactions),
         # "percent_transactions_same_amount_dallanq": get_percent_transactions_same_amount_dallanq(
@@ -595,61 +633,69 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # Frank's features
         # "likely_same_amount_frank": amount_similarity_frank(transaction, all_transactions),
         "normalized_days_difference_frank": normalized_days_difference_frank(transaction, all_transactions),
-        "amount_stability_score_frank": amount_stability_score_frank(all_transactions),
+    }
+    # Frank's features of the vendor's transactions as a whole are computed once per list (the first time
+    # get_features sees the list). Some of the features above sort all_transactions in place, and some of
+    # Frank's (detect_annual_price_adjustment) depend on the order of the list, so they must be computed
+    # here, after the features above and before the ones below, exactly where they were evaluated when
+    # they were calculated inline. Do not move this lookup or the features that use it.
+    vendor_features_frank = _get_vendor_features_frank(all_transactions)
+    features.update({
+        "amount_stability_score_frank": vendor_features_frank["amount_stability_score_frank"],
         "amount_z_score_frank": amount_z_score_frank(transaction, all_transactions),
-        "weekly_spendings_frank": weekly_spending_cycle_frank(all_transactions),
-        "vendor_recurrence_trend_frank": vendor_recurrence_trend_frank(all_transactions),
+        "weekly_spendings_frank": vendor_features_frank["weekly_spendings_frank"],
+        "vendor_recurrence_trend_frank": vendor_features_frank["vendor_recurrence_trend_frank"],
         "seasonal_spending_cycle_frank": seasonal_spending_cycle_frank(transaction, all_transactions),
         # "recurrence_interval_variance_frank": recurrence_interval_variance_frank(all_transactions),
-        "transaction_per_week_frank": transactions_per_week_frank(all_transactions),
-        "transaction_per_month_frank": transactions_per_month_frank(all_transactions),
-        "irregular_interval_score_frank": irregular_interval_score_frank(all_transactions),
+        "transaction_per_week_frank": vendor_features_frank["transaction_per_week_frank"],
+        "transaction_per_month_frank": vendor_features_frank["transaction_per_month_frank"],
+        "irregular_interval_score_frank": vendor_features_frank["irregular_interval_score_frank"],
         # "inconsistent_amount_score_frank": inconsistent_amount_score_frank(all_transactions),
         # "non_recurring_score_frank": non_recurring_score_frank(all_transactions),
         "amount_ratio_frank": get_same_amount_ratio_frank(transaction, all_transactions),
-        "amount_coefficient_of_variation_frank": amount_coefficient_of_variation_frank(all_transactions),
+        "amount_coefficient_of_variation_frank": vendor_features_frank["amount_coefficient_of_variation_frank"],
         # "proportional_timing_deviation_frank": proportional_timing_deviation_frank(transaction, all_transactions),
-        "recurring_confidence_frank": recurring_confidence_frank(all_transactions),
+        "recurring_confidence_frank": vendor_features_frank["recurring_confidence_frank"],
         # "matches_common_cycle_frank": matches_common_cycle_frank(all_transactions),
-        "amount_variability_ratio_frank": amount_variability_ratio_frank(all_transactions),
-        "robust_interval_iqr_frank": robust_interval_iqr_frank(all_transactions),
+        "amount_variability_ratio_frank": vendor_features_frank["amount_variability_ratio_frank"],
+        "robust_interval_iqr_frank": vendor_features_frank["robust_interval_iqr_frank"],
         # "robust_interval_median_frank": robust_interval_median_frank(all_transactions),
-        "transaction_frequency_frank": transaction_frequency_frank(all_transactions),
-        "most_common_interval_frank": most_common_interval_frank(all_transactions),
-        "enhanced_amt_iqr_frank": enhanced_amt_iqr_frank(all_transactions),
+        "transaction_frequency_frank": vendor_features_frank["transaction_frequency_frank"],
+        "most_common_interval_frank": vendor_features_frank["most_common_interval_frank"],
+        "enhanced_amt_iqr_frank": vendor_features_frank["enhanced_amt_iqr_frank"],
         # "enhanced_days_since_last_frank": enhanced_days_since_last_frank(transaction, all_transactions),
         "enhanced_n_similar_last_n_days_frank": enhanced_n_similar_last_n_days_frank(transaction, all_transactions),
-        "get_subscription_score_frank": get_subscription_score_frank(all_transactions),
-        "get_amount_consistency_frank": get_amount_consistency_frank(all_transactions),
-        "coefficient_of_variation_intervals_frank": coefficient_of_variation_intervals_frank(all_transactions),
-        "calculate_cycle_consistency_frank": calculate_cycle_consistency_frank(all_transactions),
-        "date_irregularity_score_frank": date_irregularity_score_frank(all_transactions),
-        "amount_variability_score_frank": amount_variability_score_frank(all_transactions),
+        "get_subscription_score_frank": vendor_features_frank["get_subscription_score_frank"],
+        "get_amount_consistency_frank": vendor_features_frank["get_amount_consistency_frank"],
+        "coefficient_of_variation_intervals_frank": vendor_features_frank["coefficient_of_variation_intervals_frank"],
+        "calculate_cycle_consistency_frank": vendor_features_frank["calculate_cycle_consistency_frank"],
+        "date_irregularity_score_frank": vendor_features_frank["date_irregularity_score_frank"],
+        "amount_variability_score_frank": vendor_features_frank["amount_variability_score_frank"],
         "is_recurring_company_frank": is_recurring_company_frank(transaction.name),
         "is_utility_company_frank": is_utility_company_frank(transaction.name),
         "recurring_score_frank": recurring_score_frank(transaction.name),
-        "is_non_recurring_frank": is_non_recurring_frank(all_transactions),
-        "temporal_pattern_stability_score_frank": temporal_pattern_stability_score_frank(all_transactions),
-        "vendor_reliability_score_frank": vendor_reliability_score_frank(all_transactions),
+        "is_non_recurring_frank": vendor_features_frank["is_non_recurring_frank"],
+        "temporal_pattern_stability_score_frank": vendor_features_frank["temporal_pattern_stability_score_frank"],
+        "vendor_reliability_score_frank": vendor_features_frank["vendor_reliability_score_frank"],
         "amount_progression_pattern_frank": amount_progression_pattern_frank(transaction, all_transactions),
         "payment_schedule_change_detector_frank": payment_schedule_change_detector_frank(transaction, all_transactions),
         # "detect_vendor_name_variations_frank": detect_vendor_name_variations_frank(transaction, all_transactions),
         # "detect_variable_subscription_frank": detect_variable_subscription_frank(all_transactions),
-        "is_business_day_aligned_frank": is_business_day_aligned_frank(all_transactions),
-        "detect_multi_tier_subscription_frank": detect_multi_tier_subscription_frank(all_transactions),
-        "detect_annual_price_adjustment_frank": detect_annual_price_adjustment_frank(all_transactions),
-        "detect_pay_period_alignment_frank": detect_pay_period_alignment_frank(all_transactions),
+        "is_business_day_aligned_frank": vendor_features_frank["is_business_day_aligned_frank"],
+        "detect_multi_tier_subscription_frank": vendor_features_frank["detect_multi_tier_subscription_frank"],
+        "detect_annual_price_adjustment_frank": vendor_features_frank["detect_annual_price_adjustment_frank"],
+        "detect_pay_period_alignment_frank": vendor_features_frank["detect_pay_period_alignment_frank"],
         # "is_earnin_tip_subscription_frank": is_earnin_tip_subscription_frank(all_transactions),
-        "is_cleo_ai_cash_advance_like_frank": is_cleo_ai_cash_advance_like_frank(all_transactions),
+        "is_cleo_ai_cash_advance_like_frank": vendor_features_frank["is_cleo_ai_cash_advance_like_frank"],
         # "is_apple_irregular_purchase_frank": is_apple_irregular_purchase_frank(all_transactions),
-        "is_apple_subscription_like_frank": is_apple_subscription_like_frank(all_transactions),
-        "is_amazon_prime_like_subscription_frank": is_amazon_prime_like_subscription_frank(all_transactions),
+        "is_apple_subscription_like_frank": vendor_features_frank["is_apple_subscription_like_frank"],
+        "is_amazon_prime_like_subscription_frank": vendor_features_frank["is_amazon_prime_like_subscription_frank"],
         # "is_amazon_retail_irregular_frank": is_amazon_retail_irregular_frank(all_transactions),
         # "fixed_amount_fuzzy_interval_subscription_frank": fixed_amount_fuzzy_interval_subscription_frank(
         #     all_transactions
         # ),
-        "is_utilities_or_insurance_like_frank": is_utilities_or_insurance_like_frank(all_transactions),
-        "is_always_recurring_vendor_frank": is_always_recurring_vendor_frank(all_transactions),
+        "is_utilities_or_insurance_like_frank": vendor_features_frank["is_utilities_or_insurance_like_frank"],
+        "is_always_recurring_vendor_frank": vendor_features_frank["is_always_recurring_vendor_frank"],
         # "is_brigit_repayment_like_frank": is_brigit_repayment_like_frank(all_transactions),
         # "is_brigit_subscription_like_frank": is_brigit_subscription_like_frank(all_transactions),
         # Christopher's features
@@ -1279,7 +1325,9 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # Adedotun's features
         # "percent_transactions_same_amount_tolerant_at_adedotun":
         #     get_percent_transactions_same_amount_tolerant_adedotun(transaction, vendor_txns),
-        "is_always_recurring_at_adedotun": get_is_always_recurring_adedotun(transaction),
+        "is_always_recurring_at_adedotun": (
+            is_always_recurring_adedotun := get_is_always_recurring_adedotun(transaction)
+        ),
         "is_communication_or_energy_at_adedotun": get_is_communication_or_energy_adedotun(transaction),
         # "is_recurring_monthly_at_adedotun": is_recurring_core_adedotun(
         #     transaction, vendor_txns, preprocessed, 30, 4, 2
@@ -1300,7 +1348,7 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         if total_txns and transaction.amount
         else 0.0,
         "is_recurring_allowance_at_adedotun": is_recurring_allowance_adedotun(transaction, all_transactions, 30, 2, 2),
-        "is_known_recurring_adedotun": get_is_always_recurring_adedotun(transaction),
+        "is_known_recurring_adedotun": is_always_recurring_adedotun,
         "is_one_time_vendor_adedotun": get_is_one_time_vendor_adedotun(transaction),
         # "is_utility_adedotun": get_is_utility_adedotun(transaction),
         # "is_insurance_adedotun": get_is_insurance_adedotun(transaction),
@@ -1421,4 +1469,29 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         # "is_microsoft_xbox_same_or_near_day_gideon": is_microsoft_xbox_same_or_near_day_gideon(
         #     transaction, all_transactions
         # ),
-    }
+    })
+    return features
+
+
+def get_features_batch(
+    all_transactions: list[Transaction], transactions: list[Transaction] | None = None
+) -> list[dict[str, float | int | bool]]:
+    """Get the features for every transaction in a group of transactions.
+
+    The group is the list of transactions of one user and vendor. Features that depend only on the list
+    cache their arrays and statistics on its identity, so evaluating the whole group together computes
+    them once, and a caller can dispatch one task per group instead of one per transaction.
+
+    Args:
+        all_transactions (List[Transaction]): The transactions of one user and vendor.
+        transactions (Optional[List[Transaction]]): The transactions of the group to get features for,
+            e.g. the ones in a batch of a larger file. Defaults to all of all_transactions.
+
+    Returns:
+        List[Dict[str, Union[float, int]]]: The features of each transaction, in the order of transactions
+        (or of all_transactions when transactions is not given).
+    """
+    # some features sort all_transactions in place, so iterate over a copy to visit each transaction once
+    if transactions is None:
+        transactions = list(all_transactions)
+    return [get_features(transaction, all_transactions) for transaction in transactions]
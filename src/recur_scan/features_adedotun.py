@@ -2,14 +2,20 @@ import re
 import statistics
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 
+import numpy as np
 from fuzzywuzzy import fuzz
 
 from recur_scan.transactions import Transaction
 
 INSURANCE_PATTERN = re.compile(r"\b(insurance|insur|insuranc)\b", re.IGNORECASE)
 UTILITY_PATTERN = re.compile(r"\b(utility|utilit|energy)\b", re.IGNORECASE)
-PHONE_PATTERN = re.compile(r"\b(at&t|t-mobile|verizon|comcast|spectrum)\b", re.IGNORECASE)
+PHONE_VENDOR_PATTERN = re.compile(r"\b(at&t|t-mobile|verizon|comcast|spectrum)\b", re.IGNORECASE)
+# PHONE_VENDOR_PATTERN or UTILITY_PATTERN in one scan of the name
+COMMUNICATION_OR_ENERGY_PATTERN = re.compile(
+    r"\b(at&t|t-mobile|verizon|comcast|spectrum|utility|utilit|energy)\b", re.IGNORECASE
+)
 VARIABLE_BILL_PATTERN = re.compile(r"\b(insurance|insur|bill|premium|policy|utility|energy|phone)\b", re.IGNORECASE)
 
 ALWAYS_RECURRING_VENDORS = frozenset([
@@ -25,7 +31,6 @@ ALWAYS_RECURRING_VENDORS = frozenset([
     "cpsenergy",
     "disney+",
 ])
-
 ALWAYS_RECURRING_VENDORS_AT = frozenset([
     "googlestorage",
     "netflix",
@@ -39,8 +44,23 @@ ALWAYS_RECURRING_VENDORS_AT = frozenset([
     "cpsenergy",
     "disney+",
 ])
+NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+
+
+@lru_cache(maxsize=4096)
+def _clean_vendor_name(name: str) -> str:
+    """Lowercase a vendor name and strip punctuation for fuzzy matching, cached per name."""
+    return NON_WORD_PATTERN.sub("", name.lower()).strip()
 
 
+@lru_cache(maxsize=16384)
+def _vendor_similarity(vendor: str, other_vendor: str) -> int:
+    """fuzz.token_sort_ratio of two cleaned vendor names, cached per pair of names."""
+    score: int = fuzz.token_sort_ratio(vendor, other_vendor)
+    return score
+
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> datetime:
     """
     Parse a date string in multiple formats.
@@ -80,6 +100,7 @@ def normalize_amount(amount: float) -> float:
     return rounded
 
 
+@lru_cache(maxsize=4096)
 def normalize_vendor_name(vendor: str) -> str:
     """Extract the core company name from a vendor string."""
     vendor = vendor.lower().replace(" ", "")
@@ -99,6 +120,7 @@ def normalize_vendor_name(vendor: str) -> str:
     return vendor.replace(" ", "")
 
 
+@lru_cache(maxsize=4096)
 def normalize_vendor_name_at(vendor: str) -> str:
     """Standalone version of normalize_vendor_name with _at suffix"""
     vendor = vendor.lower().replace(" ", "")
@@ -126,22 +148,22 @@ def get_is_always_recurring_at(transaction: Transaction) -> bool:
 
 def get_is_utility_at(transaction: Transaction) -> bool:
     """Standalone version of get_is_utility with _at suffix"""
-    return bool(re.search(r"\b(utility|utilit|energy)\b", transaction.name, re.IGNORECASE))
+    return bool(UTILITY_PATTERN.search(transaction.name))
 
 
 def get_is_insurance_at(transaction: Transaction) -> bool:
     """Standalone version of get_is_insurance with _at suffix"""
-    return bool(re.search(r"\b(insurance|insur|insuranc)\b", transaction.name, re.IGNORECASE))
+    return bool(INSURANCE_PATTERN.search(transaction.name))
 
 
 def get_is_phone_at(transaction: Transaction) -> bool:
     """Standalone version of get_is_phone with _at suffix"""
-    return bool(re.search(r"\b(at&t|t-mobile|verizon|comcast|spectrum)\b", transaction.name, re.IGNORECASE))
+    return bool(PHONE_VENDOR_PATTERN.search(transaction.name))
 
 
 def get_is_communication_or_energy_at(transaction: Transaction) -> bool:
     """Standalone version of get_is_communication_or_energy with _at suffix"""
-    return get_is_phone_at(transaction) or get_is_utility_at(transaction)
+    return bool(COMMUNICATION_OR_ENERGY_PATTERN.search(transaction.name))
 
 
 def preprocess_transactions_at(transactions: list[Transaction]) -> dict:
@@ -265,18 +287,19 @@ PHONE_PATTERN = re.compile(r"\d{3}[-\.\s]?\d{3}[-\.\s]?\d{4}")
 
 def get_is_one_time_vendor_at(transaction: Transaction) -> bool:
     """Check if vendor appears to be a one-time service provider."""
-    name = transaction.name.lower()
+    name = transaction.name_lower
     return (
         bool(PERSON_NAME_PATTERN.search(name)) or bool(EMAIL_PATTERN.search(name)) or bool(PHONE_PATTERN.search(name))
     )
 
 
-def get_vendor_name_entropy_at(transaction: Transaction) -> float:
-    """Calculate the entropy of the vendor name (higher = more random)."""
+@lru_cache(maxsize=4096)
+def _vendor_name_entropy(name_lower: str) -> float:
+    """Entropy of the characters of a lowercase vendor name, ignoring spaces, cached per name."""
     import math
     from collections import Counter
 
-    text = transaction.name.lower().replace(" ", "")
+    text = name_lower.replace(" ", "")
     if not text:
         return 0.0
     counts = Counter(text)
@@ -284,6 +307,11 @@ def get_vendor_name_entropy_at(transaction: Transaction) -> float:
     return -sum(p * math.log(p) for p in probs)
 
 
+def get_vendor_name_entropy_at(transaction: Transaction) -> float:
+    """Calculate the entropy of the vendor name (higher = more random)."""
+    return _vendor_name_entropy(transaction.name_lower)
+
+
 def get_vendor_occurrence_count_at(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Count how many times this vendor appears in all transactions."""
     normalized_name = normalize_vendor_name_at(transaction.name)
@@ -391,10 +419,16 @@ def get_is_travel_at(transaction: Transaction) -> bool:
     return bool(TRAVEL_PATTERN.search(transaction.name))
 
 
+@lru_cache(maxsize=4096)
+def _contains_common_nonrecurring_keywords(name: str) -> bool:
+    """Check a vendor name against the non-recurring spending patterns, cached per name."""
+    patterns = [ENTERTAINMENT_PATTERN, FOOD_PATTERN, GAMBLING_PATTERN, GAMING_PATTERN, RETAIL_PATTERN, TRAVEL_PATTERN]
+    return any(pattern.search(name) for pattern in patterns)
+
+
 def get_contains_common_nonrecurring_keywords_at(transaction: Transaction) -> bool:
     """Check for any non-recurring spending keywords"""
-    patterns = [ENTERTAINMENT_PATTERN, FOOD_PATTERN, GAMBLING_PATTERN, GAMING_PATTERN, RETAIL_PATTERN, TRAVEL_PATTERN]
-    return any(pattern.search(transaction.name) for pattern in patterns)
+    return _contains_common_nonrecurring_keywords(transaction.name)
 
 
 def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -413,13 +447,16 @@ def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Tr
         return False
 
     # Normalize vendor name
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     # Find similar .99 transactions
     similar: list[Transaction] = []
     for t in all_transactions:
-        t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-        if fuzz.token_sort_ratio(base_vendor, t_vendor) > 90 and abs((t.amount * 100) % 100 - 99) < 0.01:
+        # Check the cheap .99 ending before normalizing and fuzzy-matching the vendor
+        if abs((t.amount * 100) % 100 - 99) >= 0.01:
+            continue
+        t_vendor = _clean_vendor_name(t.name)
+        if _vendor_similarity(base_vendor, t_vendor) > 90:
             similar.append(t)
 
     # Need 2+ occurrences
@@ -459,7 +496,7 @@ def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Tr
 
 
 def get_interval_variance_coefficient(transaction: Transaction, all_transactions: list[Transaction]) -> float:
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     def parse_date(date_str: str) -> datetime:
         for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"]:
@@ -473,7 +510,7 @@ def get_interval_variance_coefficient(transaction: Transaction, all_transactions
         [
             t
             for t in all_transactions
-            if fuzz.token_sort_ratio(base_vendor, re.sub(r"[^\w\s]", "", t.name.lower()).strip()) > 90
+            if _vendor_similarity(base_vendor, _clean_vendor_name(t.name)) > 90
             and abs(t.amount - transaction.amount) < 0.01
         ],
         key=lambda x: parse_date(x.date),
@@ -498,14 +535,11 @@ def get_interval_variance_coefficient(transaction: Transaction, all_transactions
         return 0.1
 
     # Use MAD for robustness
-    try:
-        mean = statistics.mean(normalized)
-        if mean == 0:
-            return 1.0
-        mad = statistics.median([abs(i - mean) for i in normalized])
-        return mad / mean if mean > 0 else 1.0
-    except statistics.StatisticsError:
+    mean = statistics.mean(normalized)
+    if mean == 0:
         return 1.0
+    mad = statistics.median([abs(i - mean) for i in normalized])
+    return mad / mean if mean > 0 else 1.0
 
 
 def amount_variability_score(transactions: list[Transaction], base_vendor: str | None = None) -> float:
@@ -521,12 +555,8 @@ def amount_variability_score(transactions: list[Transaction], base_vendor: str |
 
     # Normalize vendor name and filter transactions
     if base_vendor:
-        base_vendor = re.sub(r"[^\w\s]", "", base_vendor.lower()).strip()
-        transactions = [
-            t
-            for t in transactions
-            if fuzz.token_sort_ratio(base_vendor, re.sub(r"[^\w\s]", "", t.name.lower()).strip()) > 85
-        ]
+        base_vendor = _clean_vendor_name(base_vendor)
+        transactions = [t for t in transactions if _vendor_similarity(base_vendor, _clean_vendor_name(t.name)) > 85]
 
     if len(transactions) < 2:
         return 1.0  # Single transactions are non-recurring
@@ -566,14 +596,11 @@ def amount_variability_score(transactions: list[Transaction], base_vendor: str |
     normalized_amounts = [normalize_amount(amount) for amount in amounts]
 
     # Calculate variability using MAD
-    try:
-        mean_amount = statistics.mean(normalized_amounts)
-        if mean_amount == 0:
-            return 1.0
-        mad = statistics.median([abs(a - mean_amount) for a in normalized_amounts])
-        variability = mad / mean_amount if mean_amount > 0 else 1.0
-    except statistics.StatisticsError:
+    mean_amount = statistics.mean(normalized_amounts)
+    if mean_amount == 0:
         return 1.0
+    mad = statistics.median([abs(a - mean_amount) for a in normalized_amounts])
+    variability = mad / mean_amount if mean_amount > 0 else 1.0
 
     # Non-linear scoring
     score = 1.0 + 9.0 * (1 - 1 / (1 + variability * 12))  # Logistic curve
@@ -655,10 +682,10 @@ def is_known_recurring_company(transaction: Transaction, all_transactions: list[
     ]
 
     # Normalize vendor name
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     # Check if vendor matches a known recurring keyword (fuzzy match)
-    is_keyword_match = any(fuzz.token_sort_ratio(base_vendor, keyword) > 85 for keyword in known_recurring_keywords)
+    is_keyword_match = any(_vendor_similarity(base_vendor, keyword) > 85 for keyword in known_recurring_keywords)
 
     # Parse date with multiple formats
     def parse_date(date_str: str) -> datetime:
@@ -673,14 +700,14 @@ def is_known_recurring_company(transaction: Transaction, all_transactions: list[
     similar_transactions = []
     for t in all_transactions:
         try:
-            t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-            if fuzz.token_sort_ratio(base_vendor, t_vendor) > 85 and abs(t.amount - transaction.amount) < 0.05:
+            t_vendor = _clean_vendor_name(t.name)
+            if _vendor_similarity(base_vendor, t_vendor) > 85 and abs(t.amount - transaction.amount) < 0.05:
                 similar_transactions.append(t)
         except ValueError:
             continue
 
-    # Sort by date
-    similar_transactions.sort(key=lambda x: parse_date(x.date))
+    # Parse each date once (as a day number)
+    days = np.array([parse_date(t.date).toordinal() for t in similar_transactions], dtype=np.int64)
 
     # If no keyword match and insufficient transactions, return False
     if not is_keyword_match and len(similar_transactions) < 2:
@@ -688,25 +715,25 @@ def is_known_recurring_company(transaction: Transaction, all_transactions: list[
 
     # Check for consistent intervals (basic pattern validation)
     if len(similar_transactions) >= 2:
-        intervals = [
-            (parse_date(t2.date) - parse_date(t1.date)).days
-            for i, t1 in enumerate(similar_transactions[:-1])
-            for t2 in similar_transactions[i + 1 :]
-            if (parse_date(t2.date) - parse_date(t1.date)).days > 0
-        ]
-        if not intervals:
+        # Positive day gaps between every pair of similar transactions, from one broadcast subtraction
+        pair_gaps = days[None, :] - days[:, None]
+        intervals = pair_gaps[pair_gaps > 0]
+        if not len(intervals):
             return is_keyword_match
 
         # Common billing cycles
-        common_intervals = [range(5, 10), range(12, 17), range(25, 36), range(55, 66)]
-        matches = sum(1 for i in intervals if any(i in r for r in common_intervals))
-        consistency_ratio = matches / len(intervals) if intervals else 0
+        common_intervals = [(5, 10), (12, 17), (25, 36), (55, 66)]
+        in_cycle = np.logical_or.reduce([(intervals >= lo) & (intervals < hi) for lo, hi in common_intervals])
+        consistency_ratio = int(np.count_nonzero(in_cycle)) / len(intervals)
 
         # Recurring if keyword match OR sufficient transactions with consistent intervals
         return (
             is_keyword_match
             or (len(similar_transactions) >= 3 and consistency_ratio >= 0.7)
-            or (len(similar_transactions) == 2 and any(abs(i - ci) <= 3 for i in intervals for ci in [7, 14, 30, 60]))
+            or (
+                len(similar_transactions) == 2
+                and bool((np.abs(intervals[:, None] - np.array([7, 14, 30, 60])) <= 3).any())
+            )
         )
 
     return is_keyword_match
@@ -723,7 +750,7 @@ def is_price_trending(transaction: Transaction, all_transactions: list[Transacti
     :return: True if part of a recurring pattern, False otherwise
     """
     # Normalize vendor name
-    base_vendor = re.sub(r"[^\w\s]", "", transaction.name.lower()).strip()
+    base_vendor = _clean_vendor_name(transaction.name)
 
     # Parse dates
     def parse_date(date_str: str) -> datetime | None:
@@ -740,8 +767,8 @@ def is_price_trending(transaction: Transaction, all_transactions: list[Transacti
         parsed_date = parse_date(t.date)
         if parsed_date is None or t.amount <= 0:
             continue
-        t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-        if fuzz.token_sort_ratio(base_vendor, t_vendor) > 85:
+        t_vendor = _clean_vendor_name(t.name)
+        if _vendor_similarity(base_vendor, t_vendor) > 85:
             same_vendor_txs.append((t, parsed_date))
 
     if len(same_vendor_txs) < 2:
@@ -762,14 +789,11 @@ def is_price_trending(transaction: Transaction, all_transactions: list[Transacti
     normalized_amounts = [normalize_amount(a) for a in amounts]
 
     # Calculate variability
-    try:
-        mean_amount = statistics.mean(normalized_amounts)
-        if mean_amount == 0:
-            return False
-        mad = statistics.median([abs(a - mean_amount) for a in normalized_amounts])
-        variability = mad / mean_amount
-    except statistics.StatisticsError:
+    mean_amount = statistics.mean(normalized_amounts)
+    if mean_amount == 0:
         return False
+    mad = statistics.median([abs(a - mean_amount) for a in normalized_amounts])
+    variability = mad / mean_amount
 
     # Check intervals
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1) if dates[i + 1] > dates[i]]
@@ -830,7 +854,7 @@ def get_n_transactions_same_amount_chris(
     :return: Number of transactions with similar amounts
     """
     # Normalize vendor name
-    base_vendor_normalized = re.sub(r"[^\w\s]", "", base_vendor.lower()).strip() if base_vendor else None
+    base_vendor_normalized = _clean_vendor_name(base_vendor) if base_vendor else None
 
     def normalize_amount(amount: float) -> float:
         if amount <= 0:
@@ -845,8 +869,8 @@ def get_n_transactions_same_amount_chris(
     for t in all_transactions:
         if t.amount <= 0:
             continue
-        t_vendor = re.sub(r"[^\w\s]", "", t.name.lower()).strip()
-        if base_vendor_normalized and fuzz.token_sort_ratio(base_vendor_normalized, t_vendor) <= 85:
+        t_vendor = _clean_vendor_name(t.name)
+        if base_vendor_normalized and _vendor_similarity(base_vendor_normalized, t_vendor) <= 85:
             continue
         if abs(normalize_amount(t.amount) - target_amount) <= 0.05:
             count += 1
@@ -868,15 +892,14 @@ def get_percent_transactions_same_amount_chris(
         return 0.0
 
     # Normalize vendor name
-    base_vendor_normalized = re.sub(r"[^\w\s]", "", base_vendor.lower()).strip() if base_vendor else None
+    base_vendor_normalized = _clean_vendor_name(base_vendor) if base_vendor else None
 
     # Filter vendor-specific transactions
     if base_vendor_normalized:
         vendor_transactions = [
             t
             for t in all_transactions
-            if fuzz.token_sort_ratio(base_vendor_normalized, re.sub(r"[^\w\s]", "", t.name.lower()).strip()) > 85
-            and t.amount > 0
+            if _vendor_similarity(base_vendor_normalized, _clean_vendor_name(t.name)) > 85 and t.amount > 0
         ]
     else:
         vendor_transactions = [t for t in all_transactions if t.amount > 0]
@@ -1133,6 +1156,7 @@ RECURRING_KEYWORDS = frozenset([
     "cable",
     "streaming",
 ])
+RECURRING_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, sorted(RECURRING_KEYWORDS))))
 
 
 def has_recurring_keywords(transaction: Transaction) -> bool:
@@ -1140,8 +1164,7 @@ def has_recurring_keywords(transaction: Transaction) -> bool:
     Check if the transaction description contains keywords typically
     associated with recurring payments.
     """
-    name_lower = transaction.name.lower()
-    return any(keyword in name_lower for keyword in RECURRING_KEYWORDS)
+    return RECURRING_KEYWORDS_PATTERN.search(transaction.name_lower) is not None
 
 
 def is_subscription_amount(amount: float) -> bool:
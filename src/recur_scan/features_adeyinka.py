@@ -1,12 +1,16 @@
+import re
 import statistics
 from collections import Counter
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 from recur_scan.features_dallanq import get_n_transactions_same_amount
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
 
 
 # parse date
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> datetime:
     """Parse date string into datetime object"""
     try:
@@ -15,7 +19,7 @@ def parse_date(date_str: str) -> datetime:
     except ValueError:
         # Fallback if format is different
         try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
+            return parse_datetime(date_str)
         except ValueError:
             # Return a default date if parsing fails
             return datetime(1970, 1, 1)
@@ -91,21 +95,23 @@ def get_time_regularity_score(transaction: Transaction, all_transactions: list[T
         return 0.0
 
 
+ALWAYS_RECURRING_VENDORS = frozenset([
+    "google storage",
+    "netflix",
+    "hulu",
+    "spotify",
+    "amazon prime",
+    "disney+",
+    "apple music",
+    "xbox game pass",
+    "youtube premium",
+    "adobe creative cloud",
+])
+
+
 def get_is_always_recurring(transaction: Transaction) -> bool:
     """Check if the transaction is always recurring because of the vendor name - check lowercase match"""
-    always_recurring_vendors = {
-        "google storage",
-        "netflix",
-        "hulu",
-        "spotify",
-        "amazon prime",
-        "disney+",
-        "apple music",
-        "xbox game pass",
-        "youtube premium",
-        "adobe creative cloud",
-    }
-    return transaction.name.lower() in always_recurring_vendors
+    return transaction.name_lower in ALWAYS_RECURRING_VENDORS
 
 
 # New helper functions for date handling
@@ -198,74 +204,75 @@ def get_recurring_confidence_score(transaction: Transaction, all_transactions: l
     return min(score, 1.0)  # Ensure the score is between 0 and 1
 
 
+SUBSCRIPTION_KEYWORDS = (
+    "monthly",
+    "subscription",
+    "premium",
+    "plus",
+    "membership",
+    "service",
+    "plan",
+    "bill",
+    "energy",
+    "utility",
+    "insurance",
+    "mobile",
+    "+",
+    "max",
+    "prime",
+    "fiber",
+    "internet",
+    "streaming",
+)
+SUBSCRIPTION_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, SUBSCRIPTION_KEYWORDS)))
+
+
+SUBSCRIPTION_VENDORS = frozenset([
+    "google storage",
+    "netflix",
+    "hulu",
+    "spotify",
+    "amazon prime",
+    "disney+",
+    "apple music",
+    "xbox game pass",
+    "youtube premium",
+    "adobe creative cloud",
+    "metro by t-mobile",
+    "t-mobile",
+    "at&t",
+    "xfinity",
+    "comcast",
+    "audible",
+    "apple",
+    "microsoft",
+    "sirius",
+    "siriusxm",
+    "hbo",
+    "progressive",
+    "geico",
+    "affirm",
+    "afterpay",
+    "klarna",
+    "starz",
+    "cps energy",
+    "verizon",
+    "planet fitness",
+])
+
+
 def get_subscription_keyword_score(transaction: Transaction) -> float:
     """
     Detect subscription-related keywords in transaction names
     that strongly indicate recurring transactions.
     """
-    subscription_keywords = [
-        "monthly",
-        "subscription",
-        "premium",
-        "plus",
-        "membership",
-        "service",
-        "plan",
-        "bill",
-        "energy",
-        "utility",
-        "insurance",
-        "mobile",
-        "+",
-        "max",
-        "prime",
-        "fiber",
-        "internet",
-        "streaming",
-    ]
-
-    # Check for exact matches in the always_recurring_vendors list first
-    always_recurring_vendors = {
-        "google storage",
-        "netflix",
-        "hulu",
-        "spotify",
-        "amazon prime",
-        "disney+",
-        "apple music",
-        "xbox game pass",
-        "youtube premium",
-        "adobe creative cloud",
-        "metro by t-mobile",
-        "t-mobile",
-        "at&t",
-        "xfinity",
-        "comcast",
-        "audible",
-        "apple",
-        "microsoft",
-        "sirius",
-        "siriusxm",
-        "hbo",
-        "progressive",
-        "geico",
-        "affirm",
-        "afterpay",
-        "klarna",
-        "starz",
-        "cps energy",
-        "verizon",
-        "planet fitness",
-    }
-
-    if transaction.name.lower() in always_recurring_vendors:
+    # Check for exact matches in the SUBSCRIPTION_VENDORS list first
+    if transaction.name_lower in SUBSCRIPTION_VENDORS:
         return 1.0
 
     # Check for keywords in the transaction name
-    txn_name_lower = transaction.name.lower()
-    for keyword in subscription_keywords:
-        if keyword in txn_name_lower:
-            return 0.8
+    if SUBSCRIPTION_KEYWORDS_PATTERN.search(transaction.name_lower):
+        return 0.8
 
     return 0.0
 
@@ -443,12 +450,12 @@ def is_bnpl_service(transaction: Transaction) -> float:
     """Identify Buy Now Pay Later services which often have recurring payments"""
     bnpl_services = {"rise up lending"}
 
-    if "credit ninja" in transaction.name.lower():
+    if "credit ninja" in transaction.name_lower:
         return 1.0
-    if "credit genie" in transaction.name.lower():
+    if "credit genie" in transaction.name_lower:
         return 1.0
 
-    return 1.0 if transaction.name.lower() in bnpl_services else 0.0
+    return 1.0 if transaction.name_lower in bnpl_services else 0.0
 
 
 def get_recent_transaction_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -468,31 +475,33 @@ def get_recent_transaction_frequency(transaction: Transaction, all_transactions:
         return 0.0
 
 
+TELECOM_PROVIDERS = (
+    "sprint",
+    "t-mobile",
+    "verizon",
+    "at&t",
+    "cricket",
+    "boost",
+    "metropcs",
+    "phone",
+    "mobile",
+    "wireless",
+    "cellular",
+    "telecom",
+    "communications",
+)
+TELECOM_PROVIDERS_PATTERN = re.compile("|".join(map(re.escape, TELECOM_PROVIDERS)))
+
+
 def get_phone_bill_indicator(transaction: Transaction) -> float:
     """
     Detect phone bill payments
     (addressing Sprint and similar)
     """
-    telecom_providers = {
-        "sprint",
-        "t-mobile",
-        "verizon",
-        "at&t",
-        "cricket",
-        "boost",
-        "metropcs",
-        "phone",
-        "mobile",
-        "wireless",
-        "cellular",
-        "telecom",
-        "communications",
-    }
-
-    name_lower = transaction.name.lower()
+    name_lower = transaction.name_lower
 
     # Check for telecom keywords
-    has_telecom_keyword = any(provider in name_lower for provider in telecom_providers)
+    has_telecom_keyword = TELECOM_PROVIDERS_PATTERN.search(name_lower) is not None
 
     # Check for typical bill amounts
     is_typical_amount = 10.0 <= transaction.amount <= 200.0
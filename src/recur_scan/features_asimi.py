@@ -4,6 +4,7 @@ from collections import Counter
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
 
 
 def get_frequency_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float]:
@@ -11,7 +12,7 @@ def get_frequency_features(transaction: Transaction, all_transactions: list[Tran
     if len(merchant_transactions) < 2:
         return {"frequency": 0.0, "date_variability": 0.0, "median_frequency": 0.0, "std_frequency": 0.0}
 
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_transactions])
+    dates = sorted([parse_datetime(t.date) for t in merchant_transactions])
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     avg_frequency = sum(date_diffs) / len(date_diffs)
     median_frequency = sorted(date_diffs)[len(date_diffs) // 2]
@@ -26,6 +27,19 @@ def get_frequency_features(transaction: Transaction, all_transactions: list[Tran
     }
 
 
+ALWAYS_RECURRING_VENDORS = frozenset([
+    "netflix",
+    "spotify",
+    "microsoft",
+    "amazon prime",
+    "at&t",
+    "verizon",
+    "spectrum",
+    "geico",
+    "hugo insurance",
+])
+
+
 def is_valid_recurring_transaction(transaction: Transaction) -> bool:
     """
     Check if a transaction is valid for being marked as recurring based on vendor-specific rules.
@@ -34,26 +48,14 @@ def is_valid_recurring_transaction(transaction: Transaction) -> bool:
     - For 'Apple', 'Brigit', 'Cleo AI', 'Credit Genie': Amount must end with '.99' (within floating point tolerance)
     and be less than 20. (Checking specific amounts is not reliable as they may change over time)
     """
-    vendor_name = transaction.name.lower()
+    vendor_name = transaction.name_lower
     amount = transaction.amount
 
-    always_recurring_vendors = {
-        "netflix",
-        "spotify",
-        "microsoft",
-        "amazon prime",
-        "at&t",
-        "verizon",
-        "spectrum",
-        "geico",
-        "hugo insurance",
-    }
-
     # instead of checking for specific amounts, which may change over time, check for small amount ending in 0.99
     if vendor_name in {"apple", "brigit", "cleo ai", "credit genie"}:
         # Better way to check for .99 ending
         return amount < 20.00 and abs(amount - round(amount) + 0.01) < 0.001  # Check if decimal part is ~0.99
-    elif vendor_name in always_recurring_vendors:
+    elif vendor_name in ALWAYS_RECURRING_VENDORS:
         return True
     else:
         return True
@@ -76,9 +78,9 @@ def get_vendor_features(transaction: Transaction, all_transactions: list[Transac
 
 
 def get_time_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int]:
-    date_obj = datetime.datetime.strptime(transaction.date, "%Y-%m-%d")
+    date_obj = parse_datetime(transaction.date)
     merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_transactions])
+    dates = sorted([parse_datetime(t.date) for t in merchant_transactions])
     next_transaction_date = dates[dates.index(date_obj) + 1] if dates.index(date_obj) < len(dates) - 1 else None
     days_until_next = (next_transaction_date - date_obj).days if next_transaction_date else 0
 
@@ -133,7 +135,7 @@ def get_user_transaction_frequency(transaction: Transaction, all_transactions: l
 
     # Sort transactions by date
     user_transactions_sorted = sorted(user_transactions, key=lambda t: t.date)
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions_sorted]
+    dates = [parse_datetime(t.date) for t in user_transactions_sorted]
 
     # Calculate the average time between transactions
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
@@ -167,7 +169,7 @@ def get_vendor_transaction_frequency(transaction: Transaction, all_transactions:
 
     # Sort transactions by date
     vendor_transactions_sorted = sorted(vendor_transactions, key=lambda t: t.date)
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_transactions_sorted]
+    dates = [parse_datetime(t.date) for t in vendor_transactions_sorted]
 
     # Calculate the average time between transactions
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
@@ -227,7 +229,7 @@ def get_temporal_consistency_features(
             # "is_weekly_consistent_asimi": 0,
         }
 
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_transactions])
+    dates = sorted([parse_datetime(t.date) for t in vendor_transactions])
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     # Check for monthly consistency (28-31 day intervals)
@@ -247,8 +249,8 @@ def get_temporal_consistency_features(
 
 def get_vendor_recurrence_profile(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float]:
     """Analyze how often this vendor appears in recurring patterns across all users"""
-    vendor_name = transaction.name.lower()
-    vendor_transactions = [t for t in all_transactions if t.name.lower() == vendor_name]
+    vendor_name = transaction.name_lower
+    vendor_transactions = [t for t in all_transactions if t.name_lower == vendor_name]
     total_vendor_transactions = len(vendor_transactions)
 
     if total_vendor_transactions == 0:
@@ -314,7 +316,7 @@ def get_user_vendor_relationship_features(
 
     # Calculate tenure (days since first transaction with this vendor)
     if user_vendor_transactions:
-        dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_vendor_transactions]
+        dates = [parse_datetime(t.date) for t in user_vendor_transactions]
         tenure = (max(dates) - min(dates)).days
     else:
         tenure = 0
@@ -352,7 +354,7 @@ def is_annual_subscription(transaction: Transaction, all_transactions: list[Tran
         return False
 
     intervals = []
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_vendor_txns]
+    dates = [parse_datetime(t.date) for t in user_vendor_txns]
 
     for i in range(1, len(dates)):
         intervals.append((dates[i] - dates[i - 1]).days)
@@ -370,7 +372,7 @@ def get_recurrence_streak(transaction: Transaction, all_transactions: list[Trans
         return 0
 
     streak = 0
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = [parse_datetime(t.date) for t in vendor_trans]
     amounts = [t.amount for t in vendor_trans]
 
     for i in range(1, len(dates)):
@@ -456,7 +458,7 @@ def get_interval_precision(transaction: Transaction, all_transactions: list[Tran
     if len(vendor_trans) < 3:
         return 0.0
 
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = [parse_datetime(t.date) for t in vendor_trans]
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     if transaction.name == "Apple":
@@ -487,7 +489,7 @@ def get_amount_temporal_consistency(transaction: Transaction, all_transactions:
         amount_std = 0.0
 
     # Temporal regularity (interval coefficient of variation)
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = [parse_datetime(t.date) for t in vendor_trans]
     intervals = np.diff([d.toordinal() for d in dates])
     interval_cv = np.std(intervals) / (np.mean(intervals) + 1e-9)
 
@@ -509,12 +511,11 @@ def get_burst_score(transaction: Transaction, all_transactions: list[Transaction
         return 0.0
 
     # Find transactions within 7 days with similar amounts
-    current_date = datetime.datetime.strptime(transaction.date, "%Y-%m-%d")
+    current_date = parse_datetime(transaction.date)
     similar_trans = [
         t
         for t in user_trans[-10:]
-        if abs((datetime.datetime.strptime(t.date, "%Y-%m-%d") - current_date).days) <= 7
-        and abs(t.amount - transaction.amount) < 2.0
+        if abs((parse_datetime(t.date) - current_date).days) <= 7 and abs(t.amount - transaction.amount) < 2.0
     ]
 
     return float(min(len(similar_trans) / 3.0, 1.0))  # Cap at 1.0
@@ -536,10 +537,7 @@ def get_series_duration(transaction: Transaction, all_transactions: list[Transac
         return 0.0
 
     sorted_trans = sorted(similar_transactions, key=lambda x: x.date)
-    duration_days = (
-        datetime.datetime.strptime(sorted_trans[-1].date, "%Y-%m-%d")
-        - datetime.datetime.strptime(sorted_trans[0].date, "%Y-%m-%d")
-    ).days
+    duration_days = (parse_datetime(sorted_trans[-1].date) - parse_datetime(sorted_trans[0].date)).days
 
     # Normalize score (0-1) where 1 = 1+ year of history
     return round(min(1.0, duration_days / 365), 2)
@@ -557,7 +555,7 @@ def is_apple_subscription(transaction: Transaction, all_transactions: list[Trans
     if len(vendor_trans) < 4:  # Require at least 4 transactions to establish a pattern
         return False
 
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = [parse_datetime(t.date) for t in vendor_trans]
 
     # ===== New Checks =====
     # 1. Burst Detection - reject if multiple charges in short windows
@@ -667,7 +665,7 @@ def get_apple_interval_score(transaction: Transaction, all_transactions: list[Tr
     if len(vendor_trans) < 3:
         return 0.0
 
-    dates = [datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in vendor_trans]
+    dates = [parse_datetime(t.date) for t in vendor_trans]
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     # Score: % of intervals that are 25-35 days (Apple's flexible billing cycle)
@@ -706,7 +704,7 @@ def get_loan_repayment_score(transaction: Transaction, all_transactions: list[Tr
         return 0.0  # Amounts vary too much for a loan repayment
 
     # Step 3: Check interval consistency (weekly = ~7 days)
-    dates = sorted([datetime.datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions])
+    dates = sorted([parse_datetime(t.date) for t in user_transactions])
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     # Allow ±1 day flexibility (e.g., 6-8 days for weekly payments)
@@ -1,8 +1,15 @@
 import re
 from collections import defaultdict
-from datetime import datetime
+from typing import TYPE_CHECKING
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_epoch_day, get_name_words, get_transaction_arrays, parse_datetime
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+# "planet fitness" needs no entry of its own, it always contains the word "fitness"
+GYM_KEYWORDS = frozenset(["gym", "fitness", "membership"])
 
 
 def get_is_subscription(transaction: Transaction) -> bool:
@@ -14,13 +21,12 @@ def get_is_subscription(transaction: Transaction) -> bool:
 def get_is_streaming_service(transaction: Transaction) -> bool:
     """Check if the transaction is a streaming service payment."""
     streaming_services = {"netflix", "hulu", "spotify", "disney+"}
-    return transaction.name.lower() in streaming_services
+    return transaction.name_lower in streaming_services
 
 
 def get_is_gym_membership(transaction: Transaction) -> bool:
     """Check if the transaction is a gym membership payment."""
-    match = re.search(r"\b(gym|fitness|membership|planet fitness)\b", transaction.name, re.IGNORECASE)
-    return bool(match)
+    return not GYM_KEYWORDS.isdisjoint(get_name_words(transaction.name))
 
 
 # The following functions are the new features added by Bassey
@@ -38,9 +44,9 @@ def get_is_recurring_apple_bassey(transaction: Transaction, all_transactions: li
     # Group transactions by month and year
     monthly_counts: dict[tuple[int, int], dict[str, int]] = defaultdict(lambda: defaultdict(int))
     for t in all_transactions:
-        t_date = datetime.strptime(t.date, "%Y-%m-%d")
+        t_date = parse_datetime(t.date)
         _month_year = (t_date.year, t_date.month)
-        if "apple" in t.name.lower():
+        if "apple" in t.name_lower:
             monthly_counts[_month_year][t.name] += 1
 
     # Check if the transaction meets the criteria
@@ -59,17 +65,17 @@ def get_is_weekly_recurring_apple_bassey(transaction: Transaction, all_transacti
     for a particular month.
     """
     # Filter transactions related to Apple
-    apple_transactions = [t for t in all_transactions if "apple" in t.name.lower()]
+    apple_transactions = [t for t in all_transactions if "apple" in t.name_lower]
 
     # Group transactions by month and year
     monthly_transactions: dict[tuple[int, int], list[datetime]] = defaultdict(list)
     for t in apple_transactions:
-        t_date = datetime.strptime(t.date, "%Y-%m-%d")
+        t_date = parse_datetime(t.date)
         month_year = (t_date.year, t_date.month)
         monthly_transactions[month_year].append(t_date)
 
     # Check if the transaction meets the criteria for the month of the given transaction
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    t_date = parse_datetime(transaction.date)
     month_year = (t_date.year, t_date.month)
     if month_year not in monthly_transactions:
         return False
@@ -98,18 +104,17 @@ def get_is_frequent_merchant_bassey(
 
 def get_is_weekend_transaction_bassey(transaction: Transaction) -> bool:
     """Check if the transaction occurred on a weekend."""
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    t_date = parse_datetime(transaction.date)
     return t_date.weekday() >= 5  # Saturday (5) or Sunday (6)
 
 
 def get_monthly_spending_average_bassey(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the average spending for the user in the month of the transaction."""
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    t_date = parse_datetime(transaction.date)
     monthly_transactions = [
         t.amount
         for t in all_transactions
-        if datetime.strptime(t.date, "%Y-%m-%d").year == t_date.year
-        and datetime.strptime(t.date, "%Y-%m-%d").month == t_date.month
+        if parse_datetime(t.date).year == t_date.year and parse_datetime(t.date).month == t_date.month
     ]
     return sum(monthly_transactions) / len(monthly_transactions) if monthly_transactions else 0.0
 
@@ -119,19 +124,20 @@ def get_is_merchant_recurring_bassey(transaction: Transaction, all_transactions:
     merchant_months = set()
     for t in all_transactions:
         if t.name == transaction.name:
-            t_date = datetime.strptime(t.date, "%Y-%m-%d")
+            t_date = parse_datetime(t.date)
             merchant_months.add((t_date.year, t_date.month))
     return len(merchant_months) > 1
 
 
 def get_days_since_last_transaction_bassey(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Calculate the number of days since the user's last transaction."""
-    t_date = datetime.strptime(transaction.date, "%Y-%m-%d")
-    previous_dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions if t.date < transaction.date]
-    if not previous_dates:
+    days = get_transaction_arrays(all_transactions).days
+    t_day = get_epoch_day(transaction.date)
+    # the days are sorted, so the last earlier transaction is just before t_day's insertion point
+    i = int(days.searchsorted(t_day, side="left"))
+    if i == 0:
         return -1  # No previous transactions
-    last_date = max(previous_dates)
-    return (t_date - last_date).days
+    return t_day - int(days[i - 1])
 
 
 def get_is_same_day_multiple_transactions_bassey(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
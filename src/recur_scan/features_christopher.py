@@ -1,28 +1,27 @@
-from datetime import datetime, timedelta
-from statistics import StatisticsError, mean, median, stdev
+import re
+from datetime import timedelta
+from statistics import mean, median, stdev
+
+import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import get_transaction_arrays, get_transaction_stats, parse_date, parse_datetime
 
 
 def get_transaction_gaps_chris(all_transactions: list[Transaction]) -> list[int]:
     """Get the number of days between consecutive transactions."""
     try:
-        dates = sorted(parse_date(t.date) for t in all_transactions)
+        gaps: list[int] = get_transaction_arrays(all_transactions).intervals.tolist()
     except Exception:
         return []
-    return [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))] if len(dates) > 1 else []
+    return gaps
 
 
 def std_amount_all_chris(all_transactions: list[Transaction]) -> float:
     """
     Compute the standard deviation of transaction amounts for a list of transactions.
     """
-    amounts = [t.amount for t in all_transactions]
-    try:
-        return stdev(amounts) if len(amounts) > 1 else 0.0
-    except StatisticsError:
-        return 0.0
+    return get_transaction_stats(all_transactions).amount_sample_std
 
 
 def get_n_transactions_same_amount_chris(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -31,7 +30,8 @@ def get_n_transactions_same_amount_chris(transaction: Transaction, all_transacti
     This tolerance helps capture minor variations due to rounding.
     """
     tol = 0.01 * transaction.amount if transaction.amount != 0 else 0.01
-    return sum(1 for t in all_transactions if abs(t.amount - transaction.amount) <= tol)
+    amounts = get_transaction_arrays(all_transactions).amounts
+    return int(np.count_nonzero(np.abs(amounts - transaction.amount) <= tol))
 
 
 def get_percent_transactions_same_amount_chris(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -48,21 +48,16 @@ def get_transaction_frequency_chris(all_transactions: list[Transaction]) -> floa
 
 def get_transaction_std_amount_chris(all_transactions: list[Transaction]) -> float:
     """Compute the standard deviation of transaction amounts."""
-    amounts = [t.amount for t in all_transactions]
-    try:
-        return stdev(amounts) if len(amounts) > 1 else 0.0
-    except StatisticsError:
-        return 0.0
+    return get_transaction_stats(all_transactions).amount_sample_std
 
 
 def get_coefficient_of_variation_chris(all_transactions: list[Transaction]) -> float:
     """
     Compute the coefficient of variation (std/mean) for transaction amounts.
     """
-    amounts = [t.amount for t in all_transactions]
-    if not amounts:
+    if not all_transactions:
         return 0.0
-    avg = sum(amounts) / len(amounts)
+    avg = get_transaction_stats(all_transactions).amount_mean
     if avg == 0:
         return 0.0
     return std_amount_all_chris(all_transactions) / avg
@@ -76,10 +71,7 @@ def follows_regular_interval_chris(all_transactions: list[Transaction]) -> bool:
     if not gaps:
         return False
     avg_gap = sum(gaps) / len(gaps)
-    try:
-        gap_std = stdev(gaps) if len(gaps) > 1 else 0.0
-    except StatisticsError:
-        gap_std = 0.0
+    gap_std = stdev(gaps) if len(gaps) > 1 else 0.0
     return (27 <= avg_gap <= 33) and (gap_std < 3)
 
 
@@ -112,49 +104,51 @@ def get_median_interval_chris(all_transactions: list[Transaction]) -> float:
     return median(gaps) if gaps else 0.0
 
 
+KNOWN_RECURRING_KEYWORDS = (
+    "amazon prime",
+    "american water works",
+    "ancestry",
+    "at&t",
+    "canva",
+    "comcast",
+    "cox",
+    "cricket wireless",
+    "disney",
+    "disney+",
+    "energy",
+    "geico",
+    "google storage",
+    "hulu",
+    "hbo max",
+    "insurance",
+    "mobile",
+    "national grid",
+    "netflix",
+    "ngrid",
+    "peacock",
+    # "placer county water age",  # too specific
+    "spotify",
+    "sezzle",
+    # "smyrna finance",  # too specific
+    "spectrum",
+    "utility",
+    "utilities",
+    "verizon",
+    "walmart+",
+    "wireless",
+    "wix",
+    "youtube",
+)
+KNOWN_RECURRING_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, KNOWN_RECURRING_KEYWORDS)))
+
+
 def is_known_recurring_company_chris(transaction_name: str) -> bool:
     """
     Flags transactions as recurring if the company name contains specific keywords,
     regardless of price variation.
     """
-    known_recurring_keywords = [
-        "amazon prime",
-        "american water works",
-        "ancestry",
-        "at&t",
-        "canva",
-        "comcast",
-        "cox",
-        "cricket wireless",
-        "disney",
-        "disney+",
-        "energy",
-        "geico",
-        "google storage",
-        "hulu",
-        "hbo max",
-        "insurance",
-        "mobile",
-        "national grid",
-        "netflix",
-        "ngrid",
-        "peacock",
-        # "placer county water age",  # too specific
-        "spotify",
-        "sezzle",
-        # "smyrna finance",  # too specific
-        "spectrum",
-        "utility",
-        "utilities",
-        "verizon",
-        "walmart+",
-        "wireless",
-        "wix",
-        "youtube",
-    ]
-
     transaction_name_lower = transaction_name.lower()
-    return any(keyword in transaction_name_lower for keyword in known_recurring_keywords)
+    return KNOWN_RECURRING_KEYWORDS_PATTERN.search(transaction_name_lower) is not None
 
 
 # Updated this function with new values
@@ -174,7 +168,7 @@ def is_known_fixed_subscription_chris(transaction: Transaction) -> bool:
         "grid": [10.00],
     }
 
-    transaction_name_lower = transaction.name.lower()
+    transaction_name_lower = transaction.name_lower
 
     for company, amounts in known_subscriptions.items():
         if company in transaction_name_lower and round(transaction.amount, 2) in amounts:
@@ -187,8 +181,8 @@ def is_known_fixed_subscription_chris(transaction: Transaction) -> bool:
 
 def get_user_vendor_history(transaction: Transaction, all_transactions: list[Transaction]) -> list[Transaction]:
     """Get historical transactions for same user-vendor pair."""
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d")
-    return [t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d") < current_date]
+    current_date = parse_datetime(transaction.date)
+    return [t for t in all_transactions if parse_datetime(t.date) < current_date]
 
 
 def is_regular_interval_chris(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -197,7 +191,7 @@ def is_regular_interval_chris(transaction: Transaction, all_transactions: list[T
     if len(history) < 2:
         return False
 
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in history])
+    dates = sorted([parse_datetime(t.date) for t in history])
     deltas = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     standard_deviation = stdev(deltas) if len(deltas) > 1 else 0
     return standard_deviation < 3  # Allow small variation in interval days
@@ -215,12 +209,8 @@ def amount_deviation_chris(transaction: Transaction, all_transactions: list[Tran
 
 def transaction_frequency_chris(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Count transactions from same user-vendor pair in last 6 months."""
-    cutoff = datetime.strptime(transaction.date, "%Y-%m-%d") - timedelta(days=180)
-    return sum(
-        1
-        for t in get_user_vendor_history(transaction, all_transactions)
-        if datetime.strptime(t.date, "%Y-%m-%d") > cutoff
-    )
+    cutoff = parse_datetime(transaction.date) - timedelta(days=180)
+    return sum(1 for t in get_user_vendor_history(transaction, all_transactions) if parse_datetime(t.date) > cutoff)
 
 
 def day_of_month_consistency_chris(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -229,8 +219,8 @@ def day_of_month_consistency_chris(transaction: Transaction, all_transactions: l
     if not history:
         return False
 
-    transaction_day = datetime.strptime(transaction.date, "%Y-%m-%d").day
-    same_day_count = sum(1 for t in history if datetime.strptime(t.date, "%Y-%m-%d").day == transaction_day)
+    transaction_day = parse_datetime(transaction.date).day
+    same_day_count = sum(1 for t in history if parse_datetime(t.date).day == transaction_day)
     return same_day_count / len(history) > 0.8
 
 
@@ -1,44 +1,47 @@
 import re
 from collections import Counter
+from functools import lru_cache
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import get_day, parse_date
+from recur_scan.utils import get_amount_count, get_day, get_epoch_day, get_transaction_arrays, parse_date
+
+# regular expressions with boundaries to match case-insensitive insurance, utility and phone
+# related terms, compiled once at import
+INSURANCE_PATTERN = re.compile(r"\b(insurance|insur|insuranc)\b", re.IGNORECASE)
+UTILITY_PATTERN = re.compile(r"\b(utility|utilit|energy)\b", re.IGNORECASE)
+PHONE_PATTERN = re.compile(r"\b(at&t|t-mobile|verizon)\b", re.IGNORECASE)
+
+
+ALWAYS_RECURRING_VENDORS = frozenset([
+    "google storage",
+    "netflix",
+    "hulu",
+    "spotify",
+])
 
 
 def get_is_always_recurring(transaction: Transaction) -> bool:
     """Check if the transaction is always recurring because of the vendor name - check lowercase match"""
-    always_recurring_vendors = {
-        "google storage",
-        "netflix",
-        "hulu",
-        "spotify",
-    }
-    return transaction.name.lower() in always_recurring_vendors
+    return transaction.name_lower in ALWAYS_RECURRING_VENDORS
 
 
 def get_is_insurance(transaction: Transaction) -> bool:
     """Check if the transaction is an insurance payment."""
-    # use a regular expression with boundaries to match case-insensitive insurance
-    # and insurance-related terms
-    match = re.search(r"\b(insurance|insur|insuranc)\b", transaction.name, re.IGNORECASE)
+    match = INSURANCE_PATTERN.search(transaction.name)
     return bool(match)
 
 
 def get_is_utility(transaction: Transaction) -> bool:
     """Check if the transaction is a utility payment."""
-    # use a regular expression with boundaries to match case-insensitive utility
-    # and utility-related terms
-    match = re.search(r"\b(utility|utilit|energy)\b", transaction.name, re.IGNORECASE)
+    match = UTILITY_PATTERN.search(transaction.name)
     return bool(match)
 
 
 def get_is_phone(transaction: Transaction) -> bool:
     """Check if the transaction is a phone payment."""
-    # use a regular expression with boundaries to match case-insensitive phone
-    # and phone-related terms
-    match = re.search(r"\b(at&t|t-mobile|verizon)\b", transaction.name, re.IGNORECASE)
+    match = PHONE_PATTERN.search(transaction.name)
     return bool(match)
 
 
@@ -52,28 +55,13 @@ def get_n_transactions_days_apart(
     Get the number of transactions in all_transactions that are within n_days_off of
     being n_days_apart from transaction
     """
-    n_txs = 0
-    transaction_date = parse_date(transaction.date)
-
-    # Pre-calculate bounds for faster checking
-    lower_remainder = n_days_apart - n_days_off
-    upper_remainder = n_days_off
-
-    for t in all_transactions:
-        t_date = parse_date(t.date)
-        days_diff = abs((t_date - transaction_date).days)
-
-        # Skip if the difference is less than minimum required
-        if days_diff < n_days_apart - n_days_off:
-            continue
-
-        # Check if the difference is close to any multiple of n_days_apart
-        remainder = days_diff % n_days_apart
-
-        if remainder <= upper_remainder or remainder >= lower_remainder:
-            n_txs += 1
+    days_diff = np.abs(get_transaction_arrays(all_transactions).days - get_epoch_day(transaction.date))
 
-    return n_txs
+    # Check if the difference is close to any multiple of n_days_apart,
+    # skipping differences less than the minimum required
+    remainder = days_diff % n_days_apart
+    close = (remainder <= n_days_off) | (remainder >= n_days_apart - n_days_off)
+    return int(np.count_nonzero(close & (days_diff >= n_days_apart - n_days_off)))
 
 
 def get_pct_transactions_days_apart(
@@ -90,7 +78,8 @@ def get_pct_transactions_days_apart(
 
 def get_n_transactions_same_day(transaction: Transaction, all_transactions: list[Transaction], n_days_off: int) -> int:
     """Get the number of transactions in all_transactions that are on the same day of the month as transaction"""
-    return len([t for t in all_transactions if abs(get_day(t.date) - get_day(transaction.date)) <= n_days_off])
+    days_of_month = get_transaction_arrays(all_transactions).days_of_month
+    return int(np.count_nonzero(np.abs(days_of_month - get_day(transaction.date)) <= n_days_off))
 
 
 def get_pct_transactions_same_day(
@@ -107,15 +96,14 @@ def get_ends_in_99(transaction: Transaction) -> bool:
 
 def get_n_transactions_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in all_transactions with the same amount as transaction"""
-    return len([t for t in all_transactions if t.amount == transaction.amount])
+    return get_amount_count(all_transactions, transaction.amount)
 
 
 def get_percent_transactions_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the percentage of transactions in all_transactions with the same amount as transaction"""
     if not all_transactions:
         return 0.0
-    n_same_amount = len([t for t in all_transactions if t.amount == transaction.amount])
-    return n_same_amount / len(all_transactions)
+    return get_amount_count(all_transactions, transaction.amount) / len(all_transactions)
 
 
 def get_transaction_z_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -148,37 +136,44 @@ def count_transactions(all_transactions: list[Transaction]) -> int:
 # ——— Time-Interval Features ———
 
 
+def _same_amount_days(transaction: Transaction, all_transactions: list[Transaction]) -> np.ndarray:
+    """Sorted day numbers of the transactions with the same amount as transaction."""
+    arrays = get_transaction_arrays(all_transactions)
+    days: np.ndarray = arrays.days[arrays.amounts == transaction.amount]
+    return days
+
+
 def days_since_last(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days since the previous transaction (-1.0 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
-    cur = parse_date(transaction.date)
-    prev = [d for d in dates if d < cur]
-    return (cur - max(prev)).days if prev else -1.0
+    days = get_transaction_arrays(all_transactions).days
+    cur = get_epoch_day(transaction.date)
+    # the days are sorted, so the previous transaction is just before cur's insertion point
+    i = int(days.searchsorted(cur, side="left"))
+    return cur - int(days[i - 1]) if i > 0 else -1.0
 
 
 def days_until_next(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days until the next transaction (-1.0 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
-    cur = parse_date(transaction.date)
-    fut = [d for d in dates if d > cur]
-    return (min(fut) - cur).days if fut else -1.0
+    days = get_transaction_arrays(all_transactions).days
+    cur = get_epoch_day(transaction.date)
+    i = int(days.searchsorted(cur, side="right"))
+    return int(days[i]) - cur if i < len(days) else -1.0
 
 
 def mean_days_between(all_transactions: list[Transaction]) -> float:
     """Mean interval (in days) between successive transactions."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
-    if len(dates) < 2:
+    days = get_transaction_arrays(all_transactions).days
+    if len(days) < 2:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    return float(np.mean(diffs))
+    return float(np.mean(np.diff(days)))
 
 
 def std_days_between(all_transactions: list[Transaction]) -> float:
     """Std. dev. of intervals (in days) between successive transactions."""
-    dates = sorted(parse_date(t.date) for t in all_transactions)
-    if len(dates) < 2:
+    days = get_transaction_arrays(all_transactions).days
+    if len(days) < 2:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    diffs = np.diff(days)
     try:
         return float(np.std(diffs, ddof=1))
     except Exception:
@@ -202,35 +197,34 @@ def regularity_score(all_transactions: list[Transaction]) -> float:
 
 def days_since_last_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days since the previous transaction with the same amount (-1 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
-    cur = parse_date(transaction.date)
-    prev = [d for d in dates if d < cur]
-    return (cur - max(prev)).days if prev else -1.0
+    days = _same_amount_days(transaction, all_transactions)
+    cur = get_epoch_day(transaction.date)
+    prev = days[days < cur]
+    return cur - int(prev[-1]) if len(prev) else -1.0
 
 
 def days_until_next_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Days until the next transaction with the same amount (-1 if none)."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
-    cur = parse_date(transaction.date)
-    fut = [d for d in dates if d > cur]
-    return (min(fut) - cur).days if fut else -1.0
+    days = _same_amount_days(transaction, all_transactions)
+    cur = get_epoch_day(transaction.date)
+    fut = days[days > cur]
+    return int(fut[0]) - cur if len(fut) else -1.0
 
 
 def mean_days_between_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Mean interval (in days) between successive transactions with the same amount."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
-    if len(dates) < 2:
+    days = _same_amount_days(transaction, all_transactions)
+    if len(days) < 2:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    return float(np.mean(diffs))
+    return float(np.mean(np.diff(days)))
 
 
 def std_days_between_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Std. dev. of intervals (in days) between successive transactions with the same amount."""
-    dates = sorted(parse_date(t.date) for t in all_transactions if t.amount == transaction.amount)
-    if len(dates) < 2:
+    days = _same_amount_days(transaction, all_transactions)
+    if len(days) < 2:
         return -1.0
-    diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    diffs = np.diff(days)
     try:
         return float(np.std(diffs, ddof=1))
     except Exception:
@@ -251,8 +245,8 @@ def regularity_score_same_amount(transaction: Transaction, all_transactions: lis
 
 def transaction_span_days(all_transactions: list[Transaction]) -> float:
     """Total span (in days) from first to last transaction."""
-    dates = [parse_date(t.date) for t in all_transactions]
-    return (max(dates) - min(dates)).days if dates else -1.0
+    days = get_transaction_arrays(all_transactions).days
+    return int(days[-1] - days[0]) if len(days) else -1.0
 
 
 # ——— Recency / Frequency ———
@@ -262,9 +256,8 @@ def count_last_n_days(transaction: Transaction, all_transactions: list[Transacti
     """
     Count of transactions in the past n days *before* this transaction.
     """
-    cur = parse_date(transaction.date)
-    prior = [t for t in all_transactions if 0 < (cur - parse_date(t.date)).days <= n]
-    return len(prior)
+    days_before = get_epoch_day(transaction.date) - get_transaction_arrays(all_transactions).days
+    return int(np.count_nonzero((days_before > 0) & (days_before <= n)))
 
 
 def count_last_28_days(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -646,146 +639,183 @@ def is_likely_subscription_amount(transaction: Transaction) -> bool:
     return transaction.amount in [0.99, 1.99, 2.99, 4.99, 5.99, 9.99, 14.99, 19.99, 24.99, 29.99, 34.99, 39.99]
 
 
+# Lowercase substrings of the vendor name that put a transaction in each company category
+AMAZON_PRIME_KEYWORDS = ("amazon prime", "amazon.ca prime")
+AMAZON_PRIME_VIDEO_KEYWORDS = ("amazon prime video",)
+APPLE_KEYWORDS = ("apple",)
+LOAN_KEYWORDS = ("lending", "credit ninja", "creditninja")
+PAY_IN_FOUR_KEYWORDS = ("afterpay", "sezzle")
+CASH_ADVANCE_KEYWORDS = (
+    "empower",
+    "brigit",
+    "cleo",
+    "credit genie",
+    "creditgenie",
+    "dave",
+    "albert",
+    "moneylion",
+    "money lion",
+)
+PHONE_KEYWORDS = ("verizon", "t-mobile", "wireless", "sprint")
+SUBSCRIPTION_KEYWORDS = (
+    "spotify",
+    "spectrum",
+    "comcast",
+    "youtube premium",
+    "espn+",
+    "amazon music",
+    "audible",
+    "netflix",
+    "disney+",
+    "bet+",
+    "hulu",
+    "hbo max",
+    "peacock",
+    "paramount+",
+    "showtime",
+    "walmart+",
+    "amazon kids+",
+    "starz",
+    "twitch",
+    "wix",
+    "linkedin",
+    "xfinity",
+)
+USUALLY_SUBSCRIPTION_KEYWORDS = (
+    "membership",
+    "fitness",
+    "gym",
+    "club",
+    "monthly",
+    "property",
+    "credit",
+    "storage",
+    "amazon digital",
+    "amazon kindle",
+    "disney",
+    "siriusxm",
+    "adobe",
+    "youtube",
+    "patreon",
+    "google",
+    "directv",
+    "rocket money",
+)
+UTILITY_KEYWORDS = ("utility", "utilities", "energy", "electric", "water", "pg&e", "municipal")
+INSURANCE_KEYWORDS = ("insurance", "geico", "progressive", "allstate", "state farm", "farmers", "liberty mutual")
+CARWASH_KEYWORDS = (" wash", "carwash")
+RENTAL_KEYWORDS = ("rent", "property")
+
+# Company category bits
+_AMAZON_PRIME = 1
+_AMAZON_PRIME_VIDEO = 2
+_APPLE = 4
+_LOAN = 8
+_PAY_IN_FOUR = 16
+_CASH_ADVANCE = 32
+_PHONE = 64
+_SUBSCRIPTION = 128
+_USUALLY_SUBSCRIPTION = 256
+_UTILITY = 512
+_INSURANCE = 1024
+_CARWASH = 2048
+_RENTAL = 4096
+
+# each category's keywords precompiled into one alternation, so a name is scanned once per category
+_COMPANY_CATEGORIES = tuple(
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in (
+        (_AMAZON_PRIME, AMAZON_PRIME_KEYWORDS),
+        (_AMAZON_PRIME_VIDEO, AMAZON_PRIME_VIDEO_KEYWORDS),
+        (_APPLE, APPLE_KEYWORDS),
+        (_LOAN, LOAN_KEYWORDS),
+        (_PAY_IN_FOUR, PAY_IN_FOUR_KEYWORDS),
+        (_CASH_ADVANCE, CASH_ADVANCE_KEYWORDS),
+        (_PHONE, PHONE_KEYWORDS),
+        (_SUBSCRIPTION, SUBSCRIPTION_KEYWORDS),
+        (_USUALLY_SUBSCRIPTION, USUALLY_SUBSCRIPTION_KEYWORDS),
+        (_UTILITY, UTILITY_KEYWORDS),
+        (_INSURANCE, INSURANCE_KEYWORDS),
+        (_CARWASH, CARWASH_KEYWORDS),
+        (_RENTAL, RENTAL_KEYWORDS),
+    )
+)
+
+
+@lru_cache(maxsize=4096)
+def _company_categories(name: str) -> int:
+    """Get the company category bits of a vendor name, lowercasing and scanning it once per name."""
+    name_lower = name.lower()
+    categories = 0
+    for category, pattern in _COMPANY_CATEGORIES:
+        if pattern.search(name_lower):
+            categories |= category
+    return categories
+
+
 def is_amazon_prime(transaction: Transaction) -> bool:
     """Check if the transaction is an Amazon Prime payment."""
-    return any(company in transaction.name.lower() for company in ["amazon prime", "amazon.ca prime"])
+    return bool(_company_categories(transaction.name) & _AMAZON_PRIME)
 
 
 def is_amazon_prime_video(transaction: Transaction) -> bool:
     """Check if the transaction is an Amazon Prime Video payment."""
-    return "amazon prime video" in transaction.name.lower()
+    return bool(_company_categories(transaction.name) & _AMAZON_PRIME_VIDEO)
 
 
 def is_apple(transaction: Transaction) -> bool:
     """Check if the transaction is an Apple payment."""
-    return "apple" in transaction.name.lower()
+    return bool(_company_categories(transaction.name) & _APPLE)
 
 
 def is_loan_company(transaction: Transaction) -> bool:
     """Check if the transaction is a loan company payment."""
-    return any(loan_company in transaction.name.lower() for loan_company in ["lending", "credit ninja", "creditninja"])
+    return bool(_company_categories(transaction.name) & _LOAN)
 
 
 def is_pay_in_four_company(transaction: Transaction) -> bool:
     """Check if the transaction is a loan company payment."""
-    return any(loan_company in transaction.name.lower() for loan_company in ["afterpay", "sezzle"])
+    return bool(_company_categories(transaction.name) & _PAY_IN_FOUR)
 
 
 def is_cash_advance_company(transaction: Transaction) -> bool:
     """Check if the transaction is a loan company payment."""
-    return any(
-        loan_company in transaction.name.lower()
-        for loan_company in [
-            "empower",
-            "brigit",
-            "cleo",
-            "credit genie",
-            "creditgenie",
-            "dave",
-            "albert",
-            "moneylion",
-            "money lion",
-        ]
-    )
+    return bool(_company_categories(transaction.name) & _CASH_ADVANCE)
 
 
 def is_phone_company(transaction: Transaction) -> bool:
     """Check if the transaction is a phone company payment."""
-    return any(
-        phone_company in transaction.name.lower() for phone_company in ["verizon", "t-mobile", "wireless", "sprint"]
-    )
+    return bool(_company_categories(transaction.name) & _PHONE)
 
 
 def is_subscription_company(transaction: Transaction) -> bool:
     """Check if the transaction is a subscription company payment."""
-    return any(
-        subscription_company in transaction.name.lower()
-        for subscription_company in [
-            "spotify",
-            "spectrum",
-            "comcast",
-            "youtube premium",
-            "espn+",
-            "amazon music",
-            "audible",
-            "netflix",
-            "disney+",
-            "bet+",
-            "hulu",
-            "hbo max",
-            "peacock",
-            "paramount+",
-            "showtime",
-            "walmart+",
-            "amazon kids+",
-            "starz",
-            "twitch",
-            "wix",
-            "linkedin",
-            "xfinity",
-        ]
-    )
+    return bool(_company_categories(transaction.name) & _SUBSCRIPTION)
 
 
 def is_usually_subscription_company(transaction: Transaction) -> bool:
     """Check if the transaction is a usually a subscription company payment."""
-    return any(
-        subscription_company in transaction.name.lower()
-        for subscription_company in [
-            "membership",
-            "fitness",
-            "gym",
-            "club",
-            "monthly",
-            "property",
-            "credit",
-            "storage",
-            "amazon digital",
-            "amazon kindle",
-            "disney",
-            "siriusxm",
-            "adobe",
-            "youtube",
-            "patreon",
-            "google",
-            "directv",
-            "rocket money",
-        ]
-    )
+    return bool(_company_categories(transaction.name) & _USUALLY_SUBSCRIPTION)
 
 
 def is_utility_company(transaction: Transaction) -> bool:
     """Check if the transaction is a utility company payment."""
-    return any(
-        utility_company in transaction.name.lower()
-        for utility_company in ["utility", "utilities", "energy", "electric", "water", "pg&e", "municipal"]
-    )
+    return bool(_company_categories(transaction.name) & _UTILITY)
 
 
 def is_insurance_company(transaction: Transaction) -> bool:
     """Check if the transaction is an insurance company payment."""
-    return any(
-        insurance_company in transaction.name.lower()
-        for insurance_company in [
-            "insurance",
-            "geico",
-            "progressive",
-            "allstate",
-            "state farm",
-            "farmers",
-            "liberty mutual",
-        ]
-    )
+    return bool(_company_categories(transaction.name) & _INSURANCE)
 
 
 def is_carwash_company(transaction: Transaction) -> bool:
     """Check if the transaction is a carwash company payment."""
-    return any(carwash_company in transaction.name.lower() for carwash_company in [" wash", "carwash"])
+    return bool(_company_categories(transaction.name) & _CARWASH)
 
 
 def is_rental_company(transaction: Transaction) -> bool:
     """Check if the transaction is a rental company payment."""
-    return any(rentals_company in transaction.name.lower() for rentals_company in ["rent", "property"])
+    return bool(_company_categories(transaction.name) & _RENTAL)
 
 
 def n_monthly_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -850,12 +880,9 @@ def pct_consecutive_months_same_amount(transaction: Transaction, all_transaction
 
 def n_same_day_same_amount(transaction: Transaction, all_transactions: list[Transaction], n_days_off: int = 0) -> int:
     """Return the number of transactions in the same day of the month with the same amount as the current tx."""
-    tx_day = day_of_month(transaction)
-    return len([
-        t
-        for t in all_transactions
-        if t.amount == transaction.amount and abs(parse_date(t.date).day - tx_day) <= n_days_off
-    ])
+    arrays = get_transaction_arrays(all_transactions)
+    same_day = np.abs(arrays.days_of_month - day_of_month(transaction)) <= n_days_off
+    return int(np.count_nonzero(same_day & (arrays.amounts == transaction.amount)))
 
 
 def pct_same_day_same_amount(
@@ -877,30 +904,13 @@ def get_n_transactions_days_apart_same_amount(
     Get the number of transactions in all_transactions that are within n_days_off of
     being n_days_apart from transaction and have the same amount as the current tx
     """
-    n_txs = 0
-    transaction_date = parse_date(transaction.date)
-
-    # Pre-calculate bounds for faster checking
-    lower_remainder = n_days_apart - n_days_off
-    upper_remainder = n_days_off
-
-    for t in all_transactions:
-        if t.amount != transaction.amount:
-            continue
-        t_date = parse_date(t.date)
-        days_diff = abs((t_date - transaction_date).days)
-
-        # Skip if the difference is less than minimum required
-        if days_diff < n_days_apart - n_days_off:
-            continue
-
-        # Check if the difference is close to any multiple of n_days_apart
-        remainder = days_diff % n_days_apart
-
-        if remainder <= upper_remainder or remainder >= lower_remainder:
-            n_txs += 1
+    days_diff = np.abs(_same_amount_days(transaction, all_transactions) - get_epoch_day(transaction.date))
 
-    return n_txs
+    # Check if the difference is close to any multiple of n_days_apart,
+    # skipping differences less than the minimum required
+    remainder = days_diff % n_days_apart
+    close = (remainder <= n_days_off) | (remainder >= n_days_apart - n_days_off)
+    return int(np.count_nonzero(close & (days_diff >= n_days_apart - n_days_off)))
 
 
 def get_pct_transactions_days_apart_same_amount(
@@ -938,8 +948,8 @@ def get_features(transaction: Transaction, all_transactions: list[Transaction])
         "is_utility": get_is_utility(transaction),
         "is_phone": get_is_phone(transaction),
         "is_always_recurring": get_is_always_recurring(transaction),
-        "z_score": get_transaction_z_score(transaction, all_transactions),
-        "abs_z_score": abs(get_transaction_z_score(transaction, all_transactions)),
+        "z_score": (z_score := get_transaction_z_score(transaction, all_transactions)),
+        "abs_z_score": abs(z_score),
     }
 
 
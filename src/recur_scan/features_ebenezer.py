@@ -1,7 +1,8 @@
+import re
 import statistics
-from datetime import datetime
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
 
 
 def get_n_transactions_same_name(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -55,28 +56,24 @@ def get_std_amount_same_name(transaction: Transaction, all_transactions: list[Tr
 
 def get_n_transactions_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in all_transactions in the same month as transaction"""
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    return len([t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month])
+    transaction_month = parse_datetime(transaction.date).month
+    return len([t for t in all_transactions if parse_datetime(t.date).month == transaction_month])
 
 
 def get_percent_transactions_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the percentage of transactions in all_transactions in the same month as transaction"""
     if not all_transactions:
         return 0.0
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    n_same_month = len([
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month
-    ])
+    transaction_month = parse_datetime(transaction.date).month
+    n_same_month = len([t for t in all_transactions if parse_datetime(t.date).month == transaction_month])
     return n_same_month / len(all_transactions)
 
 
 def get_avg_amount_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average amount of transactions in all_transactions
     in the same month as transaction"""
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    same_month_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month
-    ]
+    transaction_month = parse_datetime(transaction.date).month
+    same_month_transactions = [t for t in all_transactions if parse_datetime(t.date).month == transaction_month]
     if not same_month_transactions:
         return 0.0
     return sum(t.amount for t in same_month_transactions) / len(same_month_transactions)
@@ -85,10 +82,8 @@ def get_avg_amount_same_month(transaction: Transaction, all_transactions: list[T
 def get_std_amount_same_month(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the standard deviation of amounts for transactions in all_
     transactions in the same month as transaction"""
-    transaction_month = datetime.strptime(transaction.date, "%Y-%m-%d").month
-    same_month_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").month == transaction_month
-    ]
+    transaction_month = parse_datetime(transaction.date).month
+    same_month_transactions = [t for t in all_transactions if parse_datetime(t.date).month == transaction_month]
     if len(same_month_transactions) < 2:
         return 0.0
     try:
@@ -117,9 +112,9 @@ def get_percent_transactions_same_day_of_week(transaction: Transaction, all_tran
     all_transactions on the same day of the week as transaction"""
     if not all_transactions:
         return 0.0
-    transaction_day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    transaction_day_of_week = parse_datetime(transaction.date).weekday()
     n_same_day_of_week = len([
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_day_of_week
+        t for t in all_transactions if parse_datetime(t.date).weekday() == transaction_day_of_week
     ])
     return n_same_day_of_week / len(all_transactions)
 
@@ -127,9 +122,9 @@ def get_percent_transactions_same_day_of_week(transaction: Transaction, all_tran
 def get_avg_amount_same_day_of_week(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average amount of transactions in
     all_transactions on the same day of the week as transaction"""
-    transaction_day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    transaction_day_of_week = parse_datetime(transaction.date).weekday()
     same_day_of_week_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_day_of_week
+        t for t in all_transactions if parse_datetime(t.date).weekday() == transaction_day_of_week
     ]
     if not same_day_of_week_transactions:
         return 0.0
@@ -139,9 +134,9 @@ def get_avg_amount_same_day_of_week(transaction: Transaction, all_transactions:
 def get_std_amount_same_day_of_week(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the standard deviation of amounts for transactions in all_transactions
     on the same day of the week as transaction"""
-    transaction_day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    transaction_day_of_week = parse_datetime(transaction.date).weekday()
     same_day_of_week_transactions = [
-        t for t in all_transactions if datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_day_of_week
+        t for t in all_transactions if parse_datetime(t.date).weekday() == transaction_day_of_week
     ]
     if len(same_day_of_week_transactions) < 2:
         return 0.0
@@ -178,15 +173,12 @@ def get_percent_transactions_within_amount_range(
 def get_avg_time_between_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average time difference (in days) between transactions with the same name."""
     same_name_transactions = sorted(
-        [t for t in all_transactions if t.name == transaction.name], key=lambda t: datetime.strptime(t.date, "%Y-%m-%d")
+        [t for t in all_transactions if t.name == transaction.name], key=lambda t: parse_datetime(t.date)
     )
     if len(same_name_transactions) < 2:
         return 0.0
     time_differences = [
-        (
-            datetime.strptime(same_name_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(same_name_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(same_name_transactions[i + 1].date) - parse_datetime(same_name_transactions[i].date)).days
         for i in range(len(same_name_transactions) - 1)
     ]
     return sum(time_differences) / len(time_differences)
@@ -195,15 +187,12 @@ def get_avg_time_between_transactions(transaction: Transaction, all_transactions
 def get_is_recurring(transaction: Transaction, all_transactions: list[Transaction], threshold: int = 30) -> int:
     """Check if the transaction is recurring within a given threshold (e.g., 30 days)."""
     same_name_transactions = sorted(
-        [t for t in all_transactions if t.name == transaction.name], key=lambda t: datetime.strptime(t.date, "%Y-%m-%d")
+        [t for t in all_transactions if t.name == transaction.name], key=lambda t: parse_datetime(t.date)
     )
     if len(same_name_transactions) < 2:
         return 0
     time_differences = [
-        (
-            datetime.strptime(same_name_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(same_name_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(same_name_transactions[i + 1].date) - parse_datetime(same_name_transactions[i].date)).days
         for i in range(len(same_name_transactions) - 1)
     ]
     return int(any(diff <= threshold for diff in time_differences))
@@ -227,12 +216,12 @@ def get_amount_range_same_name(transaction: Transaction, all_transactions: list[
 
 def get_day_of_week(transaction: Transaction) -> int:
     """Get the day of the week for a transaction (0=Monday, 6=Sunday)."""
-    return datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    return parse_datetime(transaction.date).weekday()
 
 
 def get_is_weekend(transaction: Transaction) -> int:
     """Check if the transaction occurred on a weekend."""
-    day_of_week = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    day_of_week = parse_datetime(transaction.date).weekday()
     return int(day_of_week >= 5)
 
 
@@ -266,7 +255,7 @@ def get_user_transaction_frequency(transaction: Transaction, all_transactions: l
     user_transactions = [t for t in all_transactions if t.user_id == transaction.user_id]
     if len(user_transactions) < 2:
         return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions])
+    dates = sorted([parse_datetime(t.date) for t in user_transactions])
     intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     return sum(intervals) / len(intervals) if intervals else 0.0
 
@@ -281,7 +270,7 @@ def get_user_transaction_frequency(transaction: Transaction, all_transactions: l
 
 def get_is_monthly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Check if the transaction occurs approximately every 30 days."""
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions if t.name == transaction.name])
+    dates = sorted([parse_datetime(t.date) for t in all_transactions if t.name == transaction.name])
     if len(dates) < 2:
         return 0
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
@@ -290,7 +279,7 @@ def get_is_monthly(transaction: Transaction, all_transactions: list[Transaction]
 
 def get_is_weekly(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Check if the transaction occurs approximately every 7 days."""
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions if t.name == transaction.name])
+    dates = sorted([parse_datetime(t.date) for t in all_transactions if t.name == transaction.name])
     if len(dates) < 2:
         return 0
     intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
@@ -316,10 +305,13 @@ def get_is_weekly(transaction: Transaction, all_transactions: list[Transaction])
 #     return kurtosis(amounts)
 
 
+KEYWORDS = ("subscription", "monthly", "rent", "bill", "payment")
+KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, KEYWORDS)))
+
+
 def get_keyword_match(transaction: Transaction) -> int:
     """Check if the transaction name contains recurring-related keywords."""
-    keywords = ["subscription", "monthly", "rent", "bill", "payment"]
-    return int(any(keyword in transaction.name.lower() for keyword in keywords))
+    return int(KEYWORDS_PATTERN.search(transaction.name_lower) is not None)
 
 
 def get_new_features(transaction: Transaction, grouped_transactions: list[Transaction]) -> dict:
@@ -1,13 +1,15 @@
+import re
 from datetime import datetime
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
 
 
 def _get_days(date: str) -> int:
     """Get the number of days since the epoch of a transaction date."""
-    return (datetime.strptime(date, "%Y-%m-%d") - datetime(1970, 1, 1)).days
+    return (parse_datetime(date) - datetime(1970, 1, 1)).days
 
 
 def get_transaction_time_of_month(transaction: Transaction) -> int:
@@ -232,45 +234,54 @@ def get_vendor_recurrence_consistency(transaction: Transaction, all_transactions
 # --- Newly Designed Feature Functions ---#
 
 
+SUBSCRIPTION_VENDORS = [
+    "Apple",
+    "Amazon Prime",
+    "Amazon Prime Video",
+    "Cleo",
+    "Albert",
+    "Disney+",
+    "SiriusXM",
+    "Dashpass",
+    "Audible",
+    "Norton LifeLock",
+    "Adobe",
+    "BET+",
+    "Sony Playstation",
+    "Truebill",
+    "Instacart",
+]
+LOAN_VENDORS = [
+    "AfterPay",
+    "Brght Lending",
+    "Credit Ninja",
+    "CashNetUSA",
+    "Lendswift",
+    "Greenline Loans",
+    "Rise Up Lending",
+    "Affirm",
+]
+INSURANCE_VENDORS = ["GEICO", "Lemonade Insurance", "Progressive Insurance", "Hugo Insurance", "Tn Farm Mutual"]
+TELECOM_VENDORS = ["AT&T", "Sprint", "Verizon", "TMOBILE", "Straight Talk"]
+HOUSING_VENDORS: list[str] = [
+    # "Waterford Grove"  # too specific
+]
+
+# the vendors of each score, lowercased and compiled once at import
+SUBSCRIPTION_OR_LOAN_VENDORS_PATTERN = re.compile(
+    "|".join(re.escape(v.lower()) for v in SUBSCRIPTION_VENDORS + LOAN_VENDORS)
+)
+INSURANCE_TELECOM_OR_HOUSING_VENDORS_PATTERN = re.compile(
+    "|".join(re.escape(v.lower()) for v in INSURANCE_VENDORS + TELECOM_VENDORS + HOUSING_VENDORS)
+)
+
+
 def get_vendor_category_score(transaction: Transaction) -> float:
     """Assign recurrence probability based on vendor type."""
-    subscription_vendors = [
-        "Apple",
-        "Amazon Prime",
-        "Amazon Prime Video",
-        "Cleo",
-        "Albert",
-        "Disney+",
-        "SiriusXM",
-        "Dashpass",
-        "Audible",
-        "Norton LifeLock",
-        "Adobe",
-        "BET+",
-        "Sony Playstation",
-        "Truebill",
-        "Instacart",
-    ]
-    loan_vendors = [
-        "AfterPay",
-        "Brght Lending",
-        "Credit Ninja",
-        "CashNetUSA",
-        "Lendswift",
-        "Greenline Loans",
-        "Rise Up Lending",
-        "Affirm",
-    ]
-    insurance_vendors = ["GEICO", "Lemonade Insurance", "Progressive Insurance", "Hugo Insurance", "Tn Farm Mutual"]
-    telecom_vendors = ["AT&T", "Sprint", "Verizon", "TMOBILE", "Straight Talk"]
-    housing_vendors: list[str] = [
-        # "Waterford Grove"  # too specific
-    ]
-
-    vendor = transaction.name.lower()
-    if any(v.lower() in vendor for v in subscription_vendors + loan_vendors):
+    vendor = transaction.name_lower
+    if SUBSCRIPTION_OR_LOAN_VENDORS_PATTERN.search(vendor):
         return 0.9
-    elif any(v.lower() in vendor for v in insurance_vendors + telecom_vendors + housing_vendors):
+    elif INSURANCE_TELECOM_OR_HOUSING_VENDORS_PATTERN.search(vendor):
         return 0.5
     else:
         return 0.2
@@ -2,15 +2,69 @@ import re
 import statistics
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from typing import cast
 
 import dateutil.parser as _du_parser  # type: ignore
 import numpy as np
 import pandas as pd
-from scipy.stats import iqr  # type: ignore
 from thefuzz import fuzz  # type: ignore
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import (
+    cache_by_list_identity,
+    get_name_words,
+    get_sorted_median,
+    get_sorted_percentile,
+    get_transaction_arrays,
+    get_transaction_stats,
+    parse_datetime,
+)
+
+UTILITY_KEYWORDS = frozenset([
+    "water",
+    "gas",
+    "electricity",
+    "power",
+    "energy",
+    "utility",
+    "sewage",
+    "trash",
+    "waste",
+    "heating",
+    "cable",
+    "internet",
+    "broadband",
+    "tv",
+])
+MEMBERSHIP_KEYWORDS = frozenset(["membership", "subscription", "club", "gym", "association", "society"])
+ALWAYS_RECURRING_VENDORS = frozenset([
+    "google storage",
+    "netflix",
+    "hulu",
+    "spotify",
+    "apple music",
+    "apple arcade",
+    "apple tv+",
+    "apple fitness+",
+    "apple icloud",
+    "apple one",
+    "amazon prime",
+    "adobe creative cloud",
+    "microsoft 365",
+    "dropbox",
+    "youtube premium",
+    "discord nitro",
+    "playstation plus",
+    "xbox game pass",
+    "comcast xfinity",
+    "spectrum",
+    "verizon fios",
+    "centurylink",
+    "cox communications",
+    "at&t internet",
+    "t-mobile home internet",
+])
 
 
 def parse_date(date_str: str) -> datetime | None:
@@ -29,68 +83,53 @@ def get_is_near_same_amount(transaction: Transaction, all_transactions: list[Tra
     )
 
 
+UTILITY_PROVIDERS = (
+    "duke energy",
+    "pg&e",
+    "con edison",
+    "national grid",
+    "xcel energy",
+    "southern california edison",
+    "dominion energy",
+    "centerpoint energy",
+    "peoples gas",
+    "nrg energy",
+    "direct energy",
+    "atmos energy",
+    "comcast",
+    "xfinity",
+    "spectrum",
+    "verizon fios",
+    "centurylink",
+    "at&t",
+    "cox communications",
+)
+UTILITY_PROVIDERS_PATTERN = re.compile("|".join(map(re.escape, UTILITY_PROVIDERS)))
+
+
+@lru_cache(maxsize=4096)
+def _is_utility_bill_name(name: str) -> bool:
+    """Check a vendor name for utility keywords or providers, cached per name."""
+    return (
+        not UTILITY_KEYWORDS.isdisjoint(get_name_words(name))
+        or UTILITY_PROVIDERS_PATTERN.search(name.lower()) is not None
+    )
+
+
 def is_utility_bill(transaction: Transaction) -> bool:
     """Check if the transaction is a utility bill (water, gas, electricity, etc.)."""
-    utility_keywords = (
-        r"\b(water|gas|electricity|power|energy|utility|sewage|trash|waste|heating|cable|internet|broadband|tv)\b"
-    )
-    utility_providers = {
-        "duke energy",
-        "pg&e",
-        "con edison",
-        "national grid",
-        "xcel energy",
-        "southern california edison",
-        "dominion energy",
-        "centerpoint energy",
-        "peoples gas",
-        "nrg energy",
-        "direct energy",
-        "atmos energy",
-        "comcast",
-        "xfinity",
-        "spectrum",
-        "verizon fios",
-        "centurylink",
-        "at&t",
-        "cox communications",
-    }
-    name_lower = transaction.name.lower()
-    return bool(re.search(utility_keywords, name_lower, re.IGNORECASE)) or any(
-        provider in name_lower for provider in utility_providers
-    )
+    return _is_utility_bill_name(transaction.name)
+
+
+@lru_cache(maxsize=4096)
+def _is_always_recurring_name(name: str) -> bool:
+    """Fuzzy-match a lowercase vendor name against ALWAYS_RECURRING_VENDORS, cached per name."""
+    return any(fuzz.partial_ratio(name, vendor) > 85 for vendor in ALWAYS_RECURRING_VENDORS)
 
 
 def get_is_always_recurring(transaction: Transaction) -> bool:
     """Check if the transaction is always recurring using fuzzy matching."""
-    always_recurring_vendors = {
-        "google storage",
-        "netflix",
-        "hulu",
-        "spotify",
-        "apple music",
-        "apple arcade",
-        "apple tv+",
-        "apple fitness+",
-        "apple icloud",
-        "apple one",
-        "amazon prime",
-        "adobe creative cloud",
-        "microsoft 365",
-        "dropbox",
-        "youtube premium",
-        "discord nitro",
-        "playstation plus",
-        "xbox game pass",
-        "comcast xfinity",
-        "spectrum",
-        "verizon fios",
-        "centurylink",
-        "cox communications",
-        "at&t internet",
-        "t-mobile home internet",
-    }
-    return any(fuzz.partial_ratio(transaction.name.lower(), vendor) > 85 for vendor in always_recurring_vendors)
+    return _is_always_recurring_name(transaction.name_lower)
 
 
 def is_auto_pay(transaction: Transaction) -> bool:
@@ -100,8 +139,7 @@ def is_auto_pay(transaction: Transaction) -> bool:
 
 def is_membership(transaction: Transaction) -> bool:
     """Check if the transaction is a membership payment."""
-    membership_keywords = r"\b(membership|subscription|club|gym|association|society)\b"
-    return bool(re.search(membership_keywords, transaction.name, re.IGNORECASE))
+    return not MEMBERSHIP_KEYWORDS.isdisjoint(get_name_words(transaction.name))
 
 
 def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -114,10 +152,10 @@ def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Tr
     if (transaction.amount * 100) % 100 != 99:
         return False
 
-    vendor = transaction.name.lower()
+    vendor = transaction.name_lower
     date_occurrences = defaultdict(list)
     for t in all_transactions:
-        if t.name.lower() == vendor and (t.amount * 100) % 100 == 99:
+        if t.name_lower == vendor and (t.amount * 100) % 100 == 99:
             parsed_date = parse_date(t.date)
             days = None
             if parsed_date:
@@ -141,17 +179,24 @@ def is_recurring_based_on_99(transaction: Transaction, all_transactions: list[Tr
     return False
 
 
+@lru_cache(maxsize=16384)
+def _name_similarity(name: str, other_name: str) -> int:
+    """fuzz.partial_ratio of two lowercase vendor names, cached per pair of names."""
+    score: int = fuzz.partial_ratio(name, other_name)
+    return score
+
+
 def get_transaction_similarity(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Compute the average fuzzy similarity of this transaction's name to others."""
     scores = [
-        fuzz.partial_ratio(transaction.name.lower(), t.name.lower()) for t in all_transactions if t.id != transaction.id
+        _name_similarity(transaction.name_lower, t.name_lower) for t in all_transactions if t.id != transaction.id
     ]
     return float(sum(scores)) / float(len(scores)) if scores else 0.0
 
 
 def is_weekday_transaction(transaction: Transaction) -> bool:
     """Return True if the transaction happened on a weekday (Mon-Fri)."""
-    return datetime.strptime(transaction.date, "%Y-%m-%d").weekday() < 5
+    return parse_datetime(transaction.date).weekday() < 5
 
 
 def is_price_trending(transaction: Transaction, all_transactions: list[Transaction], threshold: int) -> bool:
@@ -202,8 +247,12 @@ def get_transaction_amount_variance(txn: dict, txns: list[dict]) -> float:
         return 0.0
 
 
+@cache_by_list_identity()
 def most_common_interval(all_transactions: list[Transaction]) -> int:
     """Mode of day-diffs between sorted dates."""
+    if len(all_transactions) < 2:
+        return 0  # no day-diffs, so skip building the DataFrame
+
     df = pd.DataFrame([{"date": t.date} for t in all_transactions])
     df["date"] = pd.to_datetime(df["date"])
     df2 = df.sort_values("date")
@@ -211,14 +260,17 @@ def most_common_interval(all_transactions: list[Transaction]) -> int:
     return int(diffs.mode()[0]) if not diffs.empty else 0
 
 
+@cache_by_list_identity()
 def amount_variability_ratio(all_transactions: list[Transaction]) -> float:
     """IQR / median of 'amount' column."""
-    if not all_transactions:
-        return 0.0
+    if len(all_transactions) < 2:
+        return 0.0  # the IQR of a single amount is 0
 
-    df = pd.DataFrame([{"amount": t.amount} for t in all_transactions])
-    med = float(np.median(df["amount"]))
-    return float(iqr(df["amount"])) / med if med != 0 else 0.0
+    # quartiles and median straight from the cached sorted amounts (same values as scipy's iqr and np.median)
+    sorted_amounts = get_transaction_arrays(all_transactions).sorted_amounts
+    med = get_sorted_median(sorted_amounts)
+    amount_iqr = get_sorted_percentile(sorted_amounts, 75) - get_sorted_percentile(sorted_amounts, 25)
+    return amount_iqr / med if med != 0 else 0.0
 
 
 def amount_similarity(all_transactions: list[Transaction], tolerance: float = 0.1) -> float:
@@ -226,10 +278,9 @@ def amount_similarity(all_transactions: list[Transaction], tolerance: float = 0.
     if not all_transactions:
         return 0.0
 
-    df = pd.DataFrame([{"amount": t.amount} for t in all_transactions])
-    mean_amt = float(np.mean(df["amount"]))
-    mask = np.abs(df["amount"] - mean_amt) < tolerance * mean_amt
-    return float(mask.mean()) if len(df) else 0.0
+    amounts = get_transaction_arrays(all_transactions).amounts
+    mean_amt = get_transaction_stats(all_transactions).amount_mean
+    return float(np.count_nonzero(np.abs(amounts - mean_amt) < tolerance * mean_amt)) / len(amounts)
 
 
 def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, float | int | bool]:
@@ -17,7 +17,7 @@ def detect_sequence_patterns(
     vendor_txs = [
         t
         for t in all_transactions
-        if t.name.lower() == transaction.name.lower()
+        if t.name_lower == transaction.name_lower
         and abs(t.amount - transaction.amount) / max(transaction.amount, 1) < 0.05
     ]
 
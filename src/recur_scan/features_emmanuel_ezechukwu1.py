@@ -1,93 +1,135 @@
 import re
+from collections import Counter, defaultdict
 from typing import Any
 
+import numpy as np
+
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import cache_by_list_identity, count_days_apart, get_epoch_day, get_name_words, parse_date
+
+PHONE_PATTERN = re.compile(r"\b(at&t|t-mobile|verizon|sprint|boost|cricket|metro pcs|straight talk)\b", re.IGNORECASE)
+INSURANCE_PATTERN = re.compile(
+    r"\b(insurance|insur|insuranc|geico|allstate|progressive|state farm|liberty mutual)\b", re.IGNORECASE
+)
+UTILITY_PATTERN = re.compile(
+    r"\b(utility|utilit|energy|water|gas|electric|comcast|xfinity|verizon fios|at&t u-verse|spectrum)\b", re.IGNORECASE
+)
+# "auto-renew" is left out: any name containing it also contains the word "auto"
+RECURRING_KEYWORDS = frozenset([
+    "sub",
+    "membership",
+    "renewal",
+    "monthly",
+    "annual",
+    "premium",
+    "bill",
+    "plan",
+    "fee",
+    "auto",
+    "pay",
+    "service",
+    "recurring",
+    "subscription",
+    "recurr",
+    "autopay",
+    "rec",
+    "month",
+    "year",
+    "quarterly",
+    "weekly",
+    "due",
+])
+
+
+ALWAYS_RECURRING_VENDORS = frozenset([
+    "google storage",
+    "netflix",
+    "hulu",
+    "spotify",
+    "amazon prime",
+    "disney+",
+    "apple music",
+    "xbox live",
+    "playstation plus",
+    "adobe",
+    "microsoft 365",
+    "audible",
+    "dropbox",
+    "zoom",
+    "grammarly",
+    "nordvpn",
+    "expressvpn",
+    "patreon",
+    "onlyfans",
+    "youtube premium",
+    "apple tv",
+    "hbo max",
+    "paramount+",
+    "peacock",
+    "crunchyroll",
+    "masterclass",
+])
 
 
 def get_is_always_recurring(transaction: Transaction) -> bool:
-    always_recurring_vendors = {
-        "google storage",
-        "netflix",
-        "hulu",
-        "spotify",
-        "amazon prime",
-        "disney+",
-        "apple music",
-        "xbox live",
-        "playstation plus",
-        "adobe",
-        "microsoft 365",
-        "audible",
-        "dropbox",
-        "zoom",
-        "grammarly",
-        "nordvpn",
-        "expressvpn",
-        "patreon",
-        "onlyfans",
-        "youtube premium",
-        "apple tv",
-        "hbo max",
-        "paramount+",
-        "peacock",
-        "crunchyroll",
-        "masterclass",
-    }
-    return transaction.name.lower() in always_recurring_vendors
+    return transaction.name_lower in ALWAYS_RECURRING_VENDORS
 
 
 def get_is_insurance(transaction: Transaction) -> bool:
-    match = re.search(
-        r"\b(insurance|insur|insuranc|geico|allstate|progressive|state farm|liberty mutual)\b",
-        transaction.name,
-        re.IGNORECASE,
-    )
+    match = INSURANCE_PATTERN.search(transaction.name)
     return bool(match)
 
 
 def get_is_utility(transaction: Transaction) -> bool:
-    match = re.search(
-        r"\b(utility|utilit|energy|water|gas|electric|comcast|xfinity|verizon fios|at&t u-verse|spectrum)\b",
-        transaction.name,
-        re.IGNORECASE,
-    )
+    match = UTILITY_PATTERN.search(transaction.name)
     return bool(match)
 
 
 def get_is_phone(transaction: Transaction) -> bool:
-    match = re.search(
-        r"\b(at&t|t-mobile|verizon|sprint|boost|cricket|metro pcs|straight talk)\b", transaction.name, re.IGNORECASE
-    )
+    match = PHONE_PATTERN.search(transaction.name)
     return bool(match)
 
 
+_NO_DAYS = np.zeros(0, dtype=np.int64)
+
+
+@cache_by_list_identity()
+def _user_days(all_transactions: list[Transaction]) -> dict[str, np.ndarray]:
+    """Get the sorted epoch days of each user's transactions, once per list of transactions."""
+    days_by_user: dict[str, list[int]] = defaultdict(list)
+    for t in all_transactions:
+        days_by_user[t.user_id].append(get_epoch_day(t.date))
+    return {user_id: np.sort(np.array(days, dtype=np.int64)) for user_id, days in days_by_user.items()}
+
+
 def get_n_transactions_days_apart(
     transaction: Transaction, all_transactions: list[Transaction], n_days_apart: int, n_days_off: int
 ) -> int:
-    n_txs = 0
-    transaction_date = parse_date(transaction.date)
-    user_transactions = [t for t in all_transactions if t.user_id == transaction.user_id]
+    days = _user_days(all_transactions).get(transaction.user_id, _NO_DAYS)
     effective_days_off = max(n_days_off, 1) if n_days_off == 0 else n_days_off
-    for t in user_transactions:
-        t_date = parse_date(t.date)
-        days_diff = abs((t_date - transaction_date).days)
-        if n_days_apart - effective_days_off <= days_diff <= n_days_apart + effective_days_off:
-            n_txs += 1
-    return n_txs
+    return count_days_apart(days, get_epoch_day(transaction.date), n_days_apart, effective_days_off)
+
+
+@cache_by_list_identity()
+def _user_amount_counts(all_transactions: list[Transaction]) -> tuple[Counter[str], Counter[tuple[str, float]]]:
+    """Count the transactions per user and per (user, amount), once per list of transactions."""
+    user_counts = Counter(t.user_id for t in all_transactions)
+    user_amount_counts = Counter((t.user_id, t.amount) for t in all_transactions)
+    return user_counts, user_amount_counts
 
 
 def get_n_transactions_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
-    user_transactions = [t for t in all_transactions if t.user_id == transaction.user_id]
-    return len([t for t in user_transactions if t.amount == transaction.amount])
+    _, user_amount_counts = _user_amount_counts(all_transactions)
+    return user_amount_counts[transaction.user_id, transaction.amount]
 
 
 def get_percent_transactions_same_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     if not all_transactions:
         return 0.0
     n_same_amount = get_n_transactions_same_amount(transaction, all_transactions)
-    user_transactions = [t for t in all_transactions if t.user_id == transaction.user_id]
-    return n_same_amount / len(user_transactions) if user_transactions else 0.0
+    user_counts, _ = _user_amount_counts(all_transactions)
+    n_user_transactions = user_counts[transaction.user_id]
+    return n_same_amount / n_user_transactions if n_user_transactions else 0.0
 
 
 # def get_days_between_std(
@@ -113,11 +155,8 @@ def get_percent_transactions_same_amount(transaction: Transaction, all_transacti
 
 
 def get_has_recurring_keyword(transaction: Transaction) -> int:
-    recurring_keywords = (
-        r"\b(sub|membership|renewal|monthly|annual|premium|bill|plan|fee|auto|pay|service|"
-        r"recurring|subscription|auto-renew|recurr|autopay|rec|month|year|quarterly|weekly|due)\b"
-    )
-    return int(bool(re.search(recurring_keywords, transaction.name, re.IGNORECASE)))
+    # whole-word keyword match, same as r"\b(sub|membership|...)\b" with re.IGNORECASE
+    return int(not RECURRING_KEYWORDS.isdisjoint(get_name_words(transaction.name)))
 
 
 def get_is_convenience_store(transaction: Transaction) -> int:
@@ -139,8 +178,9 @@ def get_pct_transactions_days_apart(
     if not all_transactions:
         return 0.0
     n_txs = get_n_transactions_days_apart(transaction, all_transactions, n_days_apart, n_days_off)
-    user_transactions = [t for t in all_transactions if t.user_id == transaction.user_id]
-    return n_txs / len(user_transactions) if user_transactions else 0.0
+    user_counts, _ = _user_amount_counts(all_transactions)
+    n_user_transactions = user_counts[transaction.user_id]
+    return n_txs / n_user_transactions if n_user_transactions else 0.0
 
 
 # def get_day_of_month_consistency(
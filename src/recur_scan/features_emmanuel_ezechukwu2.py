@@ -1,9 +1,10 @@
-from datetime import datetime
+from functools import lru_cache
 from statistics import mean, stdev
 
 from fuzzywuzzy import process
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
 
 RECURRING_VENDORS = {
     # Streaming & Entertainment
@@ -116,7 +117,7 @@ def get_recurrence_patterns(transaction: Transaction, transactions: list[Transac
             ]
         }
 
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_txns)
+    dates = sorted(parse_datetime(t.date) for t in merchant_txns)
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     avg_days_between = mean(date_diffs)
@@ -150,7 +151,7 @@ def get_recurring_consistency_score(transaction: Transaction, transactions: list
     if len(merchant_txns) < 2:
         return {"recurring_consistency_score_emmanuel2": 0.0}  # Not enough data to determine recurrence
 
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in merchant_txns)
+    dates = sorted(parse_datetime(t.date) for t in merchant_txns)
     date_diffs = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
 
     avg_days_between = mean(date_diffs)
@@ -187,12 +188,19 @@ def get_recurring_consistency_score(transaction: Transaction, transactions: list
     return {"recurring_consistency_score_emmanuel2": round(max(0, min(consistency_score, 1)), 2)}
 
 
+@lru_cache(maxsize=4096)
+def _recurring_vendor_match(vendor_name: str) -> tuple[str, int] | None:
+    """Fuzzy-match a lowercase vendor name against RECURRING_VENDORS, cached per name."""
+    match_result: tuple[str, int] | None = process.extractOne(vendor_name, RECURRING_VENDORS)
+    return match_result
+
+
 def validate_recurring_transaction(transaction: Transaction, threshold: int = 80) -> bool:
     """Determines if a transaction should be classified as recurring based on vendor trends."""
-    vendor_name = transaction.name.lower()
+    vendor_name = transaction.name_lower
 
-    # Fuzzy Matching for Vendor Detection
-    match_result: tuple[str, int] | None = process.extractOne(vendor_name, RECURRING_VENDORS)
+    # Fuzzy Matching for Vendor Detection (the best match only depends on the name)
+    match_result = _recurring_vendor_match(vendor_name)
 
     # If no match is found, return False
     if match_result is None:
@@ -213,7 +221,7 @@ def classify_subscription_tier(transaction: Transaction) -> int:
         "disney+": [(7.99, 1), (13.99, 2)],
     }
 
-    vendor_name = transaction.name.lower()
+    vendor_name = transaction.name_lower
     amount = transaction.amount
 
     return next((tier for price, tier in subscription_tiers.get(vendor_name, []) if price == amount), 0)
@@ -280,9 +288,7 @@ def get_refund_features(transaction: Transaction, transactions: list[Transaction
             "avg_refund_time_lag_emmanuel2": 0.0,
         }
 
-    refund_time_lags = [
-        (datetime.strptime(t.date, "%Y-%m-%d") - datetime.strptime(transaction.date, "%Y-%m-%d")).days for t in refunds
-    ]
+    refund_time_lags = [(parse_datetime(t.date) - parse_datetime(transaction.date)).days for t in refunds]
 
     return {
         # "refund_rate_emmanuel2": len(refunds) / len(transactions),
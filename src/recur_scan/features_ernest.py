@@ -1,10 +1,11 @@
+import re
 import statistics
 from typing import Any
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import get_day, parse_date
+from recur_scan.utils import get_day, get_transaction_arrays, parse_date
 
 
 def get_is_weekly(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -95,13 +96,16 @@ def get_average_transaction_amount(transaction: Transaction, all_transactions: l
     return float(np.mean(amounts)) if amounts else 0.0
 
 
+SUBSCRIPTION_KEYWORDS = ("subscription", "membership", "monthly", "annual", "recurring")
+SUBSCRIPTION_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, SUBSCRIPTION_KEYWORDS)))
+
+
 def get_is_subscription_based(transaction: Transaction) -> bool:
     """
     Check if the transaction is related to subscription services.
     This is determined by matching the transaction name against a predefined list of subscription-related keywords.
     """
-    subscription_keywords = {"subscription", "membership", "monthly", "annual", "recurring"}
-    return any(keyword in transaction.name.lower() for keyword in subscription_keywords)
+    return SUBSCRIPTION_KEYWORDS_PATTERN.search(transaction.name_lower) is not None
 
 
 def get_is_recurring_vendor(transaction: Transaction) -> bool:
@@ -109,15 +113,16 @@ def get_is_recurring_vendor(transaction: Transaction) -> bool:
     Check if the vendor is in a predefined list of vendors known for recurring transactions.
     """
     recurring_vendors = {"netflix", "spotify", "hulu", "amazon prime", "google storage"}
-    return bool(transaction.name.lower() in recurring_vendors)
+    return bool(transaction.name_lower in recurring_vendors)
 
 
 def get_is_fixed_amount(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """
     Check if the transaction amount is consistent across all transactions for the vendor.
     """
-    amounts = [t.amount for t in all_transactions if t.name == transaction.name]
-    return len(set(amounts)) == 1 if amounts else False
+    arrays = get_transaction_arrays(all_transactions)
+    amounts = arrays.amounts[arrays.names == transaction.name]
+    return bool(amounts.min() == amounts.max()) if len(amounts) else False
 
 
 def get_recurring_interval_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -319,12 +324,13 @@ KNOWN_RECURRING_MERCHANTS = [
     "you tube premium",
     "starlink",
 ]
+KNOWN_RECURRING_MERCHANTS_PATTERN = re.compile("|".join(map(re.escape, KNOWN_RECURRING_MERCHANTS)))
 
 
 def get_is_known_recurring(transaction: Transaction) -> bool:
     """Check if the transaction is from a known recurring vendor (case-insensitive)."""
-    transaction_name = transaction.name.lower().strip()
-    return any(merchant in transaction_name for merchant in KNOWN_RECURRING_MERCHANTS)
+    transaction_name = transaction.name_lower.strip()
+    return KNOWN_RECURRING_MERCHANTS_PATTERN.search(transaction_name) is not None
 
 
 # def get_amount_stability_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
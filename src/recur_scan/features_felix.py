@@ -1,12 +1,10 @@
-import math
 import re
-import statistics
 from datetime import datetime
-from statistics import mean
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_transaction_arrays, get_transaction_stats, parse_datetime
 
 # Helper function to get the number of days since the epoch
 
@@ -16,7 +14,21 @@ def _get_days(date: str) -> int:
     # Assuming date is in the format YYYY-MM-DD
     # use the datetime module for the accurate determination
     # of the number of days since the epoch
-    return (datetime.strptime(date, "%Y-%m-%d") - datetime(1970, 1, 1)).days
+    return (parse_datetime(date) - datetime(1970, 1, 1)).days
+
+
+def _get_vendor_days(transaction: Transaction, transactions: list[Transaction]) -> np.ndarray:
+    """Get the date-sorted days since the epoch of the transactions with the same vendor as transaction."""
+    arrays = get_transaction_arrays(transactions)
+    days: np.ndarray = arrays.days[arrays.names == transaction.name]
+    return days
+
+
+def _get_vendor_amounts(transaction: Transaction, transactions: list[Transaction]) -> np.ndarray:
+    """Get the amounts of the transactions with the same vendor as transaction, from the cached arrays."""
+    arrays = get_transaction_arrays(transactions)
+    amounts: np.ndarray = arrays.amounts[arrays.names == transaction.name]
+    return amounts
 
 
 # Other feature functions
@@ -33,12 +45,12 @@ def get_average_transaction_amount(transaction: Transaction, all_transactions: l
     Returns:
         float: The average transaction amount for the vendor.
     """
-    vendor_transactions = [t.amount for t in all_transactions if t.name == transaction.name]
+    vendor_amounts = _get_vendor_amounts(transaction, all_transactions)
 
-    if not vendor_transactions:
+    if not len(vendor_amounts):
         return 0.0  # Return 0 if there are no transactions for the vendor
 
-    return sum(vendor_transactions) / len(vendor_transactions)  # Compute the average
+    return float(vendor_amounts.mean())  # Compute the average
 
 
 def get_transaction_rate(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -49,10 +61,7 @@ def get_transaction_rate(transaction: Transaction, all_transactions: list[Transa
     if len(vendor_transactions) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
     intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(vendor_transactions[i + 1].date) - parse_datetime(vendor_transactions[i].date)).days
         for i in range(len(vendor_transactions) - 1)  # Calculate intervals between consecutive transactions
     ]
     if not intervals or sum(intervals) == 0:
@@ -62,49 +71,53 @@ def get_transaction_rate(transaction: Transaction, all_transactions: list[Transa
 
 def get_dispersion_transaction_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the dispersion (variance) in transaction amounts for the same vendor."""
-    vendor_transactions = [t.amount for t in all_transactions if t.name == transaction.name]
+    vendor_amounts = _get_vendor_amounts(transaction, all_transactions)
 
-    if len(vendor_transactions) < 2:
+    if len(vendor_amounts) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
 
-    mean_value = sum(vendor_transactions) / len(vendor_transactions)  # Compute mean
-    variance = sum((x - mean_value) ** 2 for x in vendor_transactions) / len(vendor_transactions)  # Compute variance
-
-    return variance
+    return float(vendor_amounts.var())  # Compute the (population) variance
 
 
 def get_median_variation_transaction_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the median absolute deviation (MAD) of transaction amounts for the same vendor"""
-    vendor_transactions = [t.amount for t in all_transactions if t.name == transaction.name]
+    vendor_amounts = _get_vendor_amounts(transaction, all_transactions)
 
-    if len(vendor_transactions) < 2:
+    if len(vendor_amounts) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
 
-    median_value = statistics.median(vendor_transactions)  # Compute the median
-    mad = statistics.median([abs(amount - median_value) for amount in vendor_transactions])  # Compute MAD
+    median_value = np.median(vendor_amounts)  # Compute the median
+    mad = np.median(np.abs(vendor_amounts - median_value))  # Compute MAD
 
     return float(mad)  # Return MAD
 
 
 def get_variation_ratio(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the coefficient of variation (CV) of transaction amounts for the same vendor"""
-    vendor_transactions = [t.amount for t in all_transactions if t.name == transaction.name]
+    vendor_amounts = _get_vendor_amounts(transaction, all_transactions)
 
-    if len(vendor_transactions) < 2:
+    if len(vendor_amounts) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
 
-    mean_value = statistics.mean(vendor_transactions)  # Compute mean
+    mean_value = float(vendor_amounts.mean())  # Compute mean
     if mean_value == 0:
         return 0.0  # Avoid division by zero
 
-    # Compute standard deviation (population std, same as np.std with ddof=0)
-    variance = sum((x - mean_value) ** 2 for x in vendor_transactions) / len(vendor_transactions)
-    try:
-        std_dev = math.sqrt(variance)  # Compute standard deviation
-    except Exception:
-        std_dev = 0.0
+    # Compute standard deviation (population std, ddof=0)
+    std_dev = float(vendor_amounts.std())
 
-    return float(std_dev / mean_value)  # Return CV
+    return std_dev / mean_value  # Return CV
+
+
+# Regular expressions with boundaries to match case-insensitive company names, compiled once at import
+ALWAYS_RECURRING_PATTERN = re.compile(
+    r"\b(netflix|spotify|google play|hulu|disney\+|youtube|adobe|microsoft|walmart\+|amazon prime)\b", re.IGNORECASE
+)
+INSURANCE_PATTERN = re.compile(r"\b(insur|geico|allstate|state farm|progressive|insur|insuranc)\b", re.IGNORECASE)
+UTILITY_PATTERN = re.compile(
+    r"\b(water|electricity|gas|internet|cable|energy|utilit|utility|cable|electric|light|phone)\b", re.IGNORECASE
+)
+MOBILE_COMPANIES = frozenset({"t-mobile", "at&t", "verizon", "boost mobile", "tello mobile", "spectrum"})
 
 
 def get_is_always_recurring(transaction: Transaction) -> bool:
@@ -112,39 +125,23 @@ def get_is_always_recurring(transaction: Transaction) -> bool:
     Check if the transaction is from a known recurring vendor.
     All transactions from these vendors are considered recurring.
     """
-    # Use a regular expression with boundaries to match case-insensitive company names
-    match = re.search(
-        r"\b(netflix|spotify|google play|hulu|disney\+|youtube|adobe|microsoft|walmart\+|amazon prime)\b",
-        transaction.name,
-        re.IGNORECASE,
-    )
-    return bool(match)
+    return bool(ALWAYS_RECURRING_PATTERN.search(transaction.name))
 
 
 def get_is_insurance(transaction: Transaction) -> bool:
     """Check if the transaction is from a known insurance company."""
-    # Use a regular expression with boundaries to match case-insensitive company names
-    match = re.search(
-        r"\b(insur|geico|allstate|state farm|progressive|insur|insuranc)\b", transaction.name, re.IGNORECASE
-    )
-    return bool(match)
+    return bool(INSURANCE_PATTERN.search(transaction.name))
 
 
 def get_is_utility(transaction: Transaction) -> bool:
     """Check if the transaction is from a known utility company."""
-    # Use a regular expression with boundaries to match case-insensitive company names
-    match = re.search(
-        r"\b(water|electricity|gas|internet|cable|energy|utilit|utility|cable|electric|light|phone)\b",
-        transaction.name,
-        re.IGNORECASE,
-    )
-    return bool(match)
+    return bool(UTILITY_PATTERN.search(transaction.name))
 
 
 def get_year(transaction: Transaction) -> int:
     """Get the year for the transaction date."""
     try:
-        return datetime.strptime(transaction.date, "%Y-%m-%d").year
+        return parse_datetime(transaction.date).year
     except ValueError:
         return -1
 
@@ -152,7 +149,7 @@ def get_year(transaction: Transaction) -> int:
 def get_month(transaction: Transaction) -> int:
     """Get the month for the transaction date."""
     try:
-        return datetime.strptime(transaction.date, "%Y-%m-%d").month
+        return parse_datetime(transaction.date).month
     except ValueError:
         return -1
 
@@ -160,15 +157,14 @@ def get_month(transaction: Transaction) -> int:
 def get_day(transaction: Transaction) -> int:
     """Get the day for the transaction date."""
     try:
-        return datetime.strptime(transaction.date, "%Y-%m-%d").day
+        return parse_datetime(transaction.date).day
     except ValueError:
         return -1
 
 
 def get_is_phone(transaction: Transaction) -> bool:
     """Check if the transaction is from a known mobile company."""
-    mobile_companies = {"t-mobile", "at&t", "verizon", "boost mobile", "tello mobile", "spectrum"}
-    return transaction.name.lower() in mobile_companies
+    return transaction.name_lower in MOBILE_COMPANIES
 
 
 def get_min_transaction_amount(all_transactions: list[Transaction]) -> float:
@@ -198,39 +194,31 @@ def get_transaction_intervals(transactions: list[Transaction]) -> dict[str, floa
             # "same_weekday_felix": 0,
             "same_amount_felix": 0,
         }
-    # Sort transactions by date
-    dates = sorted([
-        datetime.strptime(trans.date, "%Y-%m-%d") if isinstance(trans.date, str) else trans.date
-        for trans in transactions
-    ])
-
-    # calculate days between each consecutive grouped transactions
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    # days between each consecutive grouped transactions, from the cached date-sorted arrays
+    arrays = get_transaction_arrays(transactions)
+    intervals = arrays.intervals
 
     # compute average and standard deviation of transaction intervals
-    avg_days = mean(intervals) if intervals else 0.0
+    avg_days = get_transaction_stats(transactions).interval_mean
     # std_dev_days = stdev(intervals) if len(intervals) > 1 else 0.0
 
     # check for flexible monthly recurrence (±7 days)
-    monthly_count = sum(
-        1
-        for gap in intervals
-        if 23 <= gap <= 38  # 30 ± 7 days
-    )
-    monthly_recurrence = monthly_count / len(intervals) if intervals else 0.0
+    monthly_count = int(np.count_nonzero((intervals >= 23) & (intervals <= 38)))  # 30 ± 7 days
+    monthly_recurrence = monthly_count / len(intervals)
 
     # check if transactions occur on the same weekday
     # weekdays = [date.weekday() for date in dates]  # Monday = 0, Sunday = 6
     # same_weekday = 1 if len(set(weekdays)) == 1 else 0  # 1 if all transactions happen on the same weekday
 
     # check if payment amounts are within ±5% of each other
-    amounts = [trans.amount for trans in transactions]
+    # (the base is the first transaction in the list, the order of the rest does not matter)
+    amounts = arrays.amounts
 
-    base_amount = amounts[0]
+    base_amount = transactions[0].amount
     if base_amount == 0:
         consistent_amount = 0.0
     else:
-        consistent_amount = sum(1 for amt in amounts if abs(amt - base_amount) / base_amount <= 0.05) / len(amounts)
+        consistent_amount = int(np.count_nonzero(np.abs(amounts - base_amount) / base_amount <= 0.05)) / len(amounts)
 
     return {
         "avg_days_between_transactions_felix": avg_days,
@@ -243,22 +231,13 @@ def get_transaction_intervals(transactions: list[Transaction]) -> dict[str, floa
 
 def get_transactions_interval_stability(transaction: Transaction, transactions: list[Transaction]) -> float:
     """Calculate the average interval between transactions for the same vendor."""
-    # Filter transactions for the same vendor
-    vendor_transactions = [t for t in transactions if t.name == transaction.name]
-    if len(vendor_transactions) < 2:
+    # Filter transactions for the same vendor (the cached arrays are already sorted by date)
+    days = _get_vendor_days(transaction, transactions)
+    if len(days) < 2:
         return 0.0  # No intervals to calculate
 
-    # Sort transactions by date (convert date strings to datetime objects)
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-
     # Calculate intervals in days
-    intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
-        for i in range(len(vendor_transactions) - 1)
-    ]
+    intervals: list[int] = np.diff(days).tolist()
     # Return the average interval
     return sum(intervals) / len(intervals)
 
@@ -273,7 +252,7 @@ def get_n_transactions_same_vendor(transaction: Transaction, all_transactions: l
 
 def get_is_amazon_prime(transaction: Transaction) -> bool:
     """Check if the transaction is an Amazon Prime payment."""
-    return "amazon prime" in transaction.name.lower()
+    return "amazon prime" in transaction.name_lower
 
 
 def get_vendor_transaction_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -308,8 +287,8 @@ def get_vendor_transaction_recurring(transaction: Transaction, all_transactions:
         return 0  # Can't detect a pattern with fewer than 3 transactions
 
     # Sort by date
-    relevant = sorted(relevant, key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-    dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in relevant]
+    relevant = sorted(relevant, key=lambda t: parse_datetime(t.date))
+    dates = [parse_datetime(t.date) for t in relevant]
 
     # Find if dates occur approximately monthly (30 days ± 2 days)
     for i in range(len(dates) - 2):
@@ -318,7 +297,7 @@ def get_vendor_transaction_recurring(transaction: Transaction, all_transactions:
         interval2 = (d3 - d2).days
 
         if 28 <= interval1 <= 32 and 28 <= interval2 <= 32:
-            check_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+            check_date = parse_datetime(transaction.date)
             if check_date in [d1, d2, d3]:
                 return 1
 
@@ -340,18 +319,11 @@ def get_likelihood_of_recurrence(transaction: Transaction, all_transactions: lis
     Returns:
         float: Likelihood score between 0.0 and 1.0.
     """
-    vendor_transactions = [t for t in all_transactions if t.name == transaction.name]
-    if len(vendor_transactions) < n:
+    days = _get_vendor_days(transaction, all_transactions)
+    if len(days) < n:
         return 0.0
 
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-    intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
-        for i in range(len(vendor_transactions) - 1)
-    ]
+    intervals = np.diff(days)
 
     if len(intervals) < n - 1:
         return 0.0
@@ -376,7 +348,7 @@ def get_transaction_recency(transaction: Transaction, all_transactions: list[Tra
     vendor_transactions = [
         t for t in all_transactions if t.name == transaction.name and t.user_id == transaction.user_id
     ]
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    vendor_transactions.sort(key=lambda t: parse_datetime(t.date))
 
     # Find the index of our transaction
     try:
@@ -389,15 +361,15 @@ def get_transaction_recency(transaction: Transaction, all_transactions: list[Tra
         return -1
 
     # Calculate days between this transaction and the previous one
-    prev_date = datetime.strptime(vendor_transactions[idx - 1].date, "%Y-%m-%d")
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    prev_date = parse_datetime(vendor_transactions[idx - 1].date)
+    current_date = parse_datetime(transaction.date)
     delta = (current_date - prev_date).days
 
     return delta
 
     # Calculate days between this transaction and the previous one
-    prev_date = datetime.strptime(vendor_transactions[idx - 1].date, "%Y-%m-%d").date()
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    prev_date = parse_datetime(vendor_transactions[idx - 1].date).date()
+    current_date = parse_datetime(transaction.date).date()
     delta = (current_date - prev_date).days
 
     return delta
@@ -408,7 +380,7 @@ def get_is_att_transaction(transaction: Transaction) -> bool:
     """
     Mark all AT&T or transactions containing 'AT&T' as recurring.
     """
-    return "at&t" in transaction.name.lower()
+    return "at&t" in transaction.name_lower
 
 
 def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int | bool | float]:
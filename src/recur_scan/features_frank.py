@@ -1,15 +1,25 @@
 import itertools
 import re
-from collections import Counter, defaultdict
+import string
+from collections import Counter
 from collections.abc import Sequence
-from datetime import date, timedelta
+from datetime import date
 from difflib import SequenceMatcher
-from statistics import StatisticsError, mean, median, stdev
+from functools import lru_cache
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import (
+    cache_by_list_identity,
+    get_epoch_day,
+    get_linear_slope,
+    get_sorted_median,
+    get_sorted_percentile,
+    get_transaction_arrays,
+    get_transaction_stats,
+    parse_date,
+)
 
 
 def transactions_per_month(all_transactions: list[Transaction]) -> float:
@@ -17,16 +27,14 @@ def transactions_per_month(all_transactions: list[Transaction]) -> float:
     if not all_transactions:
         return 0.0
 
-    transaction_dates = sorted(parse_date(t.date) for t in all_transactions)
-    min_date, max_date = transaction_dates[0], transaction_dates[-1]
-    total_months = (max_date.year - min_date.year) * 12 + (max_date.month - min_date.month) + 1
+    arrays = get_transaction_arrays(all_transactions)
+    total_months = int(arrays.months[-1] - arrays.months[0]) + 1
 
     avg_per_month = len(all_transactions) / total_months if total_months > 0 else 0.0
 
     # Consistency Check: If most transactions fall within ±2 days of the same date each month, boost the score
-    days_of_month = [date.day for date in transaction_dates]
-    most_common_day = max(set(days_of_month), key=days_of_month.count)
-    consistency = days_of_month.count(most_common_day) / len(days_of_month)
+    day_counts = np.bincount(arrays.days_of_month, minlength=32)
+    consistency = int(day_counts.max()) / len(arrays.days_of_month)
 
     return avg_per_month * consistency  # Prioritizes stable patterns
 
@@ -36,16 +44,16 @@ def transactions_per_week(all_transactions: list[Transaction]) -> float:
     if not all_transactions:
         return 0.0
 
-    transaction_dates = sorted(parse_date(t.date) for t in all_transactions)
-    total_days = (transaction_dates[-1] - transaction_dates[0]).days
+    days = get_transaction_arrays(all_transactions).days
+    total_days = int(days[-1] - days[0])
     total_weeks = total_days / 7 if total_days > 0 else 1
 
     avg_per_week = len(all_transactions) / total_weeks if total_weeks > 0 else 0.0
 
     # Consistency Check: If most transactions happen on the same weekday, boost the score
-    weekdays = [date.weekday() for date in transaction_dates]  # 0=Monday, 6=Sunday
-    most_common_weekday = max(set(weekdays), key=weekdays.count)
-    consistency = weekdays.count(most_common_weekday) / len(weekdays)
+    weekdays = (days + 3) % 7  # 0=Monday, 6=Sunday (1970-01-01 was a Thursday)
+    weekday_counts = np.bincount(weekdays, minlength=7)
+    consistency = int(weekday_counts.max()) / len(weekdays)
 
     return avg_per_week * consistency  # Prioritizes transactions on a stable schedule
 
@@ -56,16 +64,11 @@ def recurrence_interval_variance(all_transactions: list[Transaction]) -> float:
     Returns the standard deviation (variance) of the days between consecutive transactions for the same vendor.
     A lower variance indicates a regular, recurring pattern.
     """
-    if len(all_transactions) < 2:
+    # the standard deviation of the intervals needs at least two intervals
+    if len(all_transactions) < 3:
         return 0.0
 
-    all_transactions = sorted(all_transactions, key=lambda t: parse_date(t.date))
-    intervals = [
-        (parse_date(all_transactions[i].date) - parse_date(all_transactions[i - 1].date)).days
-        for i in range(1, len(all_transactions))
-    ]
-
-    return stdev(intervals) if len(intervals) > 1 else 0.0
+    return get_transaction_stats(all_transactions).interval_sample_std
 
 
 # 2. Normalized Days Difference:
@@ -77,15 +80,10 @@ def normalized_days_difference(transaction: Transaction, all_transactions: list[
     if len(all_transactions) < 2:
         return 0.0
 
-    all_transactions = sorted(all_transactions, key=lambda t: parse_date(t.date))
-    intervals = [
-        (parse_date(all_transactions[i].date) - parse_date(all_transactions[i - 1].date)).days
-        for i in range(1, len(all_transactions))
-    ]
-
-    med_interval = median(intervals)
-    std_interval = stdev(intervals) if len(intervals) > 1 else 0.0
-    days_since_last = (parse_date(transaction.date) - parse_date(all_transactions[-1].date)).days
+    stats = get_transaction_stats(all_transactions)
+    med_interval = stats.interval_median
+    std_interval = stats.interval_sample_std
+    days_since_last = get_epoch_day(transaction.date) - int(get_transaction_arrays(all_transactions).days[-1])
 
     return (days_since_last - med_interval) / std_interval if std_interval != 0 else 0.0
 
@@ -96,17 +94,14 @@ def amount_stability_score(all_transactions: list[Transaction]) -> float:
     Returns the ratio of the median transaction amount to its standard deviation for the vendor.
     A higher ratio indicates that amounts are stable.
     """
-    amounts = [t.amount for t in all_transactions]
-    if len(amounts) < 2:
+    if len(all_transactions) < 2:
         return 0.0
-    med = median(amounts)
-    try:
-        std_amt = stdev(amounts)
-    except Exception:
-        std_amt = 0.0
-    if std_amt == 0:
+    # compare the extremes: for identical non-integer amounts the NumPy std is rounding noise, not 0
+    sorted_amounts = get_transaction_arrays(all_transactions).sorted_amounts
+    if sorted_amounts[0] == sorted_amounts[-1]:
         return 1.0  # Perfect stability if no variation.
-    return med / std_amt
+    stats = get_transaction_stats(all_transactions)
+    return stats.amount_median / stats.amount_sample_std
 
 
 # 7. Amount Z-Score:
@@ -114,51 +109,35 @@ def amount_z_score(transaction: Transaction, all_transactions: list[Transaction]
     """
     Computes the Z-score of the current transaction's amount relative to the vendor's historical amounts.
     """
-    amounts = [t.amount for t in all_transactions]
-    if len(amounts) < 2:
+    if len(all_transactions) < 2:
         return 0.0
-    med = median(amounts)
-    try:
-        std_amt = stdev(amounts)
-    except Exception:
-        std_amt = 0.0
-    if std_amt == 0:
+    sorted_amounts = get_transaction_arrays(all_transactions).sorted_amounts
+    if sorted_amounts[0] == sorted_amounts[-1]:
         return 0.0
-    return (transaction.amount - med) / std_amt
+    stats = get_transaction_stats(all_transactions)
+    return (transaction.amount - stats.amount_median) / stats.amount_sample_std
 
 
 def vendor_recurrence_trend(all_transactions: list[Transaction]) -> float:
     """
     Groups a vendor's transactions by (year, month) and counts transactions per month.
-    Fits a simple linear regression (using np.polyfit) to these monthly counts.
+    Fits a simple linear regression (closed-form least squares) to these monthly counts.
     Returns the slope as an indicator of trend.
     If there is no increase, returns 0.0 (i.e. non-negative slope).
     """
     if len(all_transactions) < 2:
         return 0.0
 
-    all_transactions = sorted(all_transactions, key=lambda t: parse_date(t.date))
-
-    monthly_counts: defaultdict[tuple[int, int], int] = defaultdict(int)
-
-    for t in all_transactions:
-        parsed_date = parse_date(t.date)  # Convert string date to datetime.date object
-        key = (parsed_date.year, parsed_date.month)  # Extract year and month correctly
-        monthly_counts[key] += 1
-
-    keys = sorted(monthly_counts.keys(), key=lambda k: (k[0], k[1]))
-    counts = [monthly_counts[k] for k in keys]
+    # Counts per (year, month), in calendar order
+    _, counts = np.unique(get_transaction_arrays(all_transactions).months, return_counts=True)
 
     if len(counts) < 2:
         return 0.0
 
-    x = np.arange(len(counts))
-    try:
-        slope, _ = np.polyfit(x, counts, 1)
-    except Exception:
-        slope = 0.0
+    # Least-squares slope of the counts over x = 0..n-1
+    slope = get_linear_slope(np.arange(len(counts)), counts)
 
-    return max(float(slope), 0.0)  # Ensure non-negative slope
+    return max(slope, 0.0)  # Ensure non-negative slope
 
 
 def weekly_spending_cycle(all_transactions: list[Transaction]) -> float:
@@ -172,19 +151,24 @@ def weekly_spending_cycle(all_transactions: list[Transaction]) -> float:
     if not all_transactions:
         return 0.0
 
-    weekly_amounts = defaultdict(list)
+    arrays = get_transaction_arrays(all_transactions)
+    # This adjusts week grouping, allowing slight shifts in weekday alignment (±2-3 days)
+    weekdays = (arrays.days + 3) % 7  # Monday is 0 (1970-01-01 was a Thursday)
+    shifted_days = arrays.days - weekdays % 3
+    # ISO week number: the week of the year that contains the Thursday of the (shifted) week
+    thursdays = (shifted_days - (shifted_days + 3) % 7 + 3).astype("datetime64[D]")
+    week_numbers = (thursdays - thursdays.astype("datetime64[Y]")).astype(np.int64) // 7 + 1
 
-    for t in all_transactions:
-        week_number = (parse_date(t.date) - timedelta(days=parse_date(t.date).weekday() % 3)).isocalendar()[1]
-        # This adjusts week grouping, allowing slight shifts in weekday alignment (±2-3 days)
-        weekly_amounts[week_number].append(t.amount)
-
-    weekly_avgs = [mean(amounts) for amounts in weekly_amounts.values() if amounts]
+    # Average amount per week number (1-53), for the weeks that have transactions
+    weekly_totals = np.bincount(week_numbers, weights=arrays.amounts)
+    week_counts = np.bincount(week_numbers)
+    has_transactions = week_counts > 0
+    weekly_avgs = weekly_totals[has_transactions] / week_counts[has_transactions]
     if len(weekly_avgs) < 2:
         return 0.0
 
-    avg = mean(weekly_avgs)
-    variation = stdev(weekly_avgs) if len(weekly_avgs) > 1 else 0.0
+    avg = float(weekly_avgs.mean())
+    variation = float(weekly_avgs.std(ddof=1)) if len(weekly_avgs) > 1 else 0.0
     return variation / avg if avg != 0 else 0.0
 
 
@@ -195,31 +179,33 @@ def seasonal_spending_cycle(transaction: Transaction, all_transactions: list[Tra
     the coefficient of variation (std/mean) of these averages.
     A lower value suggests a stable, seasonal pattern.
     """
-    vendor_transactions = [t for t in all_transactions if t.name == transaction.name]
-    if not vendor_transactions:
-        return 0.0
-    monthly_amounts = defaultdict(list)
-    for t in vendor_transactions:
-        monthly_amounts[parse_date(t.date).month].append(t.amount)
-    monthly_avgs = [mean(amounts) for amounts in monthly_amounts.values() if amounts]
+    arrays = get_transaction_arrays(all_transactions)
+    is_vendor = arrays.names == transaction.name
+    # Total amount and number of the vendor's transactions per calendar month (0 = January)
+    calendar_months = arrays.months[is_vendor] % 12
+    monthly_totals = np.bincount(calendar_months, weights=arrays.amounts[is_vendor], minlength=12)
+    monthly_counts = np.bincount(calendar_months, minlength=12)
+    has_transactions = monthly_counts > 0
+    monthly_avgs = monthly_totals[has_transactions] / monthly_counts[has_transactions]
     if len(monthly_avgs) < 2:
         return 0.0
-    avg = mean(monthly_avgs)
-    variation = stdev(monthly_avgs) if len(monthly_avgs) > 1 else 0.0
+    avg = float(monthly_avgs.mean())
+    variation = float(monthly_avgs.std(ddof=1)) if len(monthly_avgs) > 1 else 0.0
     return variation / avg if avg != 0 else 0.0
 
 
 def get_days_since_last_transaction(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of days since the last transaction with the same merchant"""
-    same_merchant_transactions = [
-        t for t in all_transactions if t.name == transaction.name and parse_date(t.date) < parse_date(transaction.date)
-    ]
+    arrays = get_transaction_arrays(all_transactions)
+    merchant_days = arrays.days[arrays.names == transaction.name]  # sorted by date
+    transaction_day = get_epoch_day(transaction.date)
 
-    if not same_merchant_transactions:
+    # Position of the first same-merchant transaction on or after this one's date
+    i = int(np.searchsorted(merchant_days, transaction_day))
+    if i == 0:
         return -1  # No previous transaction with the same merchant
 
-    last_transaction = max(same_merchant_transactions, key=lambda t: parse_date(t.date))
-    return (parse_date(transaction.date) - parse_date(last_transaction.date)).days
+    return transaction_day - int(merchant_days[i - 1])
 
 
 def get_same_amount_ratio(
@@ -247,7 +233,8 @@ def get_same_amount_ratio(
     upper_bound = current_amount * (1 + tolerance)
 
     # Count transactions within the acceptable range
-    n_similar_amounts = sum(1 for t in all_transactions if lower_bound <= t.amount <= upper_bound)
+    amounts = get_transaction_arrays(all_transactions).amounts
+    n_similar_amounts = int(np.count_nonzero((amounts >= lower_bound) & (amounts <= upper_bound)))
 
     # Calculate the ratio
     return n_similar_amounts / len(all_transactions)
@@ -264,7 +251,7 @@ def trimmed_mean(values: Sequence[float], trim_percent: float = 0.1) -> float:
         return 0.0
     k = int(n * trim_percent)
     trimmed_values = sorted(converted_values)[k : n - k] if n > 2 * k else converted_values
-    return mean(trimmed_values)
+    return float(np.mean(trimmed_values))
 
 
 def calculate_cycle_consistency(transactions: list[Transaction]) -> float:
@@ -272,19 +259,18 @@ def calculate_cycle_consistency(transactions: list[Transaction]) -> float:
     if len(transactions) < 3:
         return 0.0  # Need at least 3 to check consistency
 
-    transactions.sort(key=lambda t: parse_date(t.date))  # Ensure transactions are sorted
-    dates = [parse_date(t.date) for t in transactions]
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    transactions.sort(key=lambda t: t.date)  # Ensure transactions are sorted
+    intervals = get_transaction_arrays(transactions).intervals
 
-    if not intervals:
+    if not len(intervals):
         return 0.0
 
-    median_interval = median(intervals)
+    median_interval = get_transaction_stats(transactions).interval_median
 
     # Allow for up to 25% variation in the expected cycle interval
     tolerance = 0.25 * median_interval
 
-    consistent_count = sum(1 for interval in intervals if abs(interval - median_interval) <= tolerance)
+    consistent_count = int(np.count_nonzero(np.abs(intervals - median_interval) <= tolerance))
 
     return consistent_count / len(intervals)
 
@@ -305,26 +291,24 @@ def safe_interval_consistency(all_transactions: list[Transaction]) -> float:
         # Not enough transactions to compute intervals
         return 0.0
 
-    # Sort the filtered transactions by date
-    dates = sorted([t.date for t in all_transactions])
-
-    # Compute intervals (in days) between consecutive transactions
-    intervals = [(parse_date(dates[i]) - parse_date(dates[i - 1])).days for i in range(1, len(dates))]
+    # Intervals (in days) between consecutive transactions, in date order
+    arrays = get_transaction_arrays(all_transactions)
+    intervals = arrays.intervals
 
     if len(intervals) <= 5:
         # Not enough intervals to compute a robust consistency measure
         return 0.0
 
-    # Clip intervals to remove outliers (5th to 95th percentile)
-    lower_bound = np.percentile(intervals, 5)
-    upper_bound = np.percentile(intervals, 95)
+    # Clip intervals to remove outliers (5th to 95th percentile), read off the cached sorted intervals
+    lower_bound = get_sorted_percentile(arrays.sorted_intervals, 5)
+    upper_bound = get_sorted_percentile(arrays.sorted_intervals, 95)
     trimmed_intervals = np.clip(intervals, lower_bound, upper_bound)
 
-    m: float = float(mean(trimmed_intervals))
+    m: float = float(trimmed_intervals.mean())
     if m == 0:
         return 0.0
 
-    return float(1 - (stdev(trimmed_intervals) / m))
+    return float(1 - (trimmed_intervals.std(ddof=1) / m))
 
 
 def get_vendor_recurrence_score(all_transactions: list[Transaction], total_transactions: int) -> float:
@@ -336,21 +320,22 @@ def get_vendor_recurrence_score(all_transactions: list[Transaction], total_trans
 
 def enhanced_amt_iqr(all_transactions: list[Transaction]) -> float:
     """Interquartile range of amounts, scaled to 1-10."""
-    amounts = [t.amount for t in all_transactions]
+    if not all_transactions:
+        return 1.0
 
-    if not amounts or max(amounts) == 0:
+    sorted_amounts = get_transaction_arrays(all_transactions).sorted_amounts
+    max_amount = float(sorted_amounts[-1])
+    if max_amount == 0:
         return 1.0
 
-    iqr = float(np.subtract(*np.percentile(amounts, [75, 25])))  # Convert NumPy float to Python float
+    iqr = get_sorted_percentile(sorted_amounts, 75) - get_sorted_percentile(sorted_amounts, 25)
 
-    return min(10.0, 1.0 + (iqr / max(amounts)) * 9)
+    return min(10.0, 1.0 + (iqr / max_amount) * 9)
 
 
 def enhanced_days_since_last(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Dynamically determines recurrence cycles and scores transactions based on how well they fit."""
 
-    from statistics import mean
-
     previous_dates = sorted([
         parse_date(t.date) for t in all_transactions if t.id != transaction.id and t.name == transaction.name
     ])
@@ -364,7 +349,7 @@ def enhanced_days_since_last(transaction: Transaction, all_transactions: list[Tr
     if not intervals:
         return 1.0  # Only one previous transaction → lowest score
 
-    avg_interval = mean(intervals)  # Average time gap between transactions
+    avg_interval = float(np.mean(intervals))  # Average time gap between transactions
     days_since = (parse_date(transaction.date) - previous_dates[-1]).days
 
     # Score based on how closely it matches the expected recurrence interval
@@ -392,13 +377,16 @@ def enhanced_n_similar_last_n_days(
 # Define common subscription cycles (allowing ±3 days flexibility)
 COMMON_CYCLES = [7, 14, 30, 90, 365]
 CYCLE_RANGE = 3  # Allowed variation in cycle detection
+_COMMON_CYCLES_ARRAY = np.array(COMMON_CYCLES)
 
 
-def detect_common_interval(intervals: list[int]) -> bool:
+def detect_common_interval(intervals: Sequence[int] | np.ndarray) -> bool:
     """
     Checks if the transaction intervals match common subscription cycles (with flexibility).
     """
-    return any(any(abs(interval - cycle) <= CYCLE_RANGE for interval in intervals) for cycle in COMMON_CYCLES)
+    # Distance of every interval (rows) to every cycle (columns), compared in one pass
+    distances = np.abs(np.asarray(intervals).reshape(-1, 1) - _COMMON_CYCLES_ARRAY)
+    return bool((distances <= CYCLE_RANGE).any())
 
 
 def transaction_frequency(transactions: list[Transaction]) -> float:
@@ -406,8 +394,8 @@ def transaction_frequency(transactions: list[Transaction]) -> float:
     if len(transactions) < 2:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in transactions])
-    total_days = (dates[-1] - dates[0]).days
+    days = get_transaction_arrays(transactions).days
+    total_days = int(days[-1] - days[0])
     months = max(total_days / 30, 1)
     return float(len(transactions) / months)
 
@@ -417,9 +405,8 @@ def robust_interval_median(transactions: list[Transaction]) -> float:
     if len(transactions) < 2:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in transactions])
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    return float(median(intervals)) if intervals else 0.0
+    intervals = get_transaction_arrays(transactions).sorted_intervals
+    return get_sorted_median(intervals) if len(intervals) else 0.0
 
 
 def robust_interval_iqr(transactions: list[Transaction]) -> float:
@@ -427,11 +414,12 @@ def robust_interval_iqr(transactions: list[Transaction]) -> float:
     if len(transactions) < 2:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in transactions])
-    intervals = sorted([(dates[i] - dates[i - 1]).days for i in range(1, len(dates))])
+    intervals = get_transaction_arrays(transactions).sorted_intervals
 
     if len(intervals) > 1:
-        return float(np.percentile(intervals, 75, method="midpoint") - np.percentile(intervals, 25, method="midpoint"))
+        return get_sorted_percentile(intervals, 75, method="midpoint") - get_sorted_percentile(
+            intervals, 25, method="midpoint"
+        )
     return 0.0
 
 
@@ -440,12 +428,12 @@ def amount_variability_ratio(transactions: list[Transaction]) -> float:
     if len(transactions) < 2:
         return 0.0
 
-    amounts = [t.amount for t in transactions]
-    median_amount = median(amounts)
+    amounts = get_transaction_arrays(transactions).sorted_amounts
+    median_amount = get_sorted_median(amounts)
 
     if len(amounts) > 1:
-        iqr_amounts = float(
-            np.percentile(amounts, 75, method="midpoint") - np.percentile(amounts, 25, method="midpoint")
+        iqr_amounts = get_sorted_percentile(amounts, 75, method="midpoint") - get_sorted_percentile(
+            amounts, 25, method="midpoint"
         )
         return iqr_amounts / median_amount if median_amount > 0 else 0.0
     return 0.0
@@ -456,8 +444,7 @@ def most_common_interval(transactions: list[Transaction]) -> float:
     if len(transactions) < 2:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in transactions])
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    intervals = get_transaction_arrays(transactions).intervals.tolist()
 
     if intervals:
         counter = Counter(intervals)
@@ -470,8 +457,7 @@ def matches_common_cycle(transactions: list[Transaction]) -> float:
     if len(transactions) < 2:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in transactions])
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    intervals = get_transaction_arrays(transactions).intervals
 
     return 1.0 if detect_common_interval(intervals) else 0.0
 
@@ -481,14 +467,18 @@ def recurring_confidence(transactions: list[Transaction]) -> float:
     if not transactions:
         return 0.0
 
-    company_names = [t.name for t in transactions]
+    # the score depends only on the name, so score each distinct name once
+    company_names = dict.fromkeys(t.name for t in transactions)
     confidence = 0.0
 
     for name in company_names:
-        utility_score = is_utility_company(name)
         recurrence_score = recurring_score(name)
+        # recurring_score already matches the utility keywords (scored 0.8), which count as a full 1 here;
+        # nothing scores higher than that, so stop at the first whole-word match
+        if recurrence_score >= 0.8:
+            return 1.0
 
-        confidence = max(confidence, recurrence_score, utility_score)
+        confidence = max(confidence, recurrence_score)
 
     return float(confidence)
 
@@ -572,22 +562,51 @@ UTILITY_PATTERN = re.compile(
     r"\b(" + "|".join(re.escape(keyword) for keyword in UTILITY_KEYWORDS) + r")\b", re.IGNORECASE
 )
 
+# Matches a known recurring company anywhere in the name (case-sensitive, no word boundaries),
+# so one scan replaces a substring check per keyword
+PARTIAL_RECURRING_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in KNOWN_RECURRING_COMPANIES))
+
+# Company category bits
+_RECURRING_COMPANY = 1
+_UTILITY_COMPANY = 2
+_PARTIAL_RECURRING_COMPANY = 4
 
+
+# bytes.translate tables for ASCII names: lowercase letters, drop everything except letters, digits and whitespace
+_LOWERCASE_TABLE = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+_NON_ALPHANUMERIC_BYTES = bytes(b for b in range(128) if not (chr(b).isalnum() or chr(b).isspace()))
+
+
+@lru_cache(maxsize=4096)
 def clean_company_name(name: str) -> str:
     """Normalize company name for better matching."""
+    if name.isascii():
+        return name.encode().translate(_LOWERCASE_TABLE, _NON_ALPHANUMERIC_BYTES).decode().strip()
     return re.sub(r"[^a-zA-Z0-9\s]", "", name).strip().lower()
 
 
+@lru_cache(maxsize=4096)
+def _company_categories(company_name: str) -> int:
+    """Returns the category bits matched by the cleaned company name, computed once per name."""
+    cleaned_name = clean_company_name(company_name)
+    categories = 0
+    if RECURRING_PATTERN.search(cleaned_name):
+        categories |= _RECURRING_COMPANY
+    if UTILITY_PATTERN.search(cleaned_name):
+        categories |= _UTILITY_COMPANY
+    if PARTIAL_RECURRING_PATTERN.search(cleaned_name):
+        categories |= _PARTIAL_RECURRING_COMPANY
+    return categories
+
+
 def is_utility_company(company_name: str) -> int:
     """Returns 1 if the company is a utility provider, else 0."""
-    cleaned_name = clean_company_name(company_name)
-    return 1 if UTILITY_PATTERN.search(cleaned_name) else 0
+    return 1 if _company_categories(company_name) & _UTILITY_COMPANY else 0
 
 
 def is_recurring_company(company_name: str) -> int:
     """Returns 1 if the company is known for recurring payments, else 0."""
-    cleaned_name = clean_company_name(company_name)
-    return 1 if RECURRING_PATTERN.search(cleaned_name) else 0
+    return 1 if _company_categories(company_name) & _RECURRING_COMPANY else 0
 
 
 def recurring_score(company_name: str) -> float:
@@ -595,17 +614,14 @@ def recurring_score(company_name: str) -> float:
     Returns a confidence score (0 to 1) based on keyword matches indicating
     whether a company is likely offering recurring payments.
     """
-    cleaned_name = clean_company_name(company_name)
+    categories = _company_categories(company_name)
 
-    if RECURRING_PATTERN.search(cleaned_name):
+    if categories & _RECURRING_COMPANY:
         return 1.0
-    if UTILITY_PATTERN.search(cleaned_name):
+    if categories & _UTILITY_COMPANY:
         return 0.8  # Utilities are highly likely to be recurring
-
-    # Check for partial matches with known recurring companies
-    for keyword in KNOWN_RECURRING_COMPANIES:
-        if keyword in cleaned_name:
-            return 0.7  # Partial match confidence
+    if categories & _PARTIAL_RECURRING_COMPANY:
+        return 0.7  # Partial match with a known recurring company
 
     return 0.0
 
@@ -616,17 +632,15 @@ def get_subscription_score(all_transactions: list[Transaction]) -> float:
         return 0.0
 
     # Sort transactions by date
-    all_transactions.sort(key=lambda t: parse_date(t.date))
-    dates = [t.date for t in all_transactions]
-    amounts = [t.amount for t in all_transactions]
+    all_transactions.sort(key=lambda t: t.date)
     vendors = [t.name for t in all_transactions]  # Vendor names
 
     # Compute intervals (days)
-    intervals = [(parse_date(dates[i]) - parse_date(dates[i - 1])).days for i in range(1, len(dates))]
-    if not intervals:
+    intervals = get_transaction_arrays(all_transactions).intervals
+    if not len(intervals):
         return 0.0
 
-    median_interval = float(median(intervals))
+    median_interval = get_transaction_stats(all_transactions).interval_median
 
     # Subscription cycles with ±3-day tolerance
     base_cycles = [7, 14, 30, 90, 365]
@@ -642,18 +656,11 @@ def get_subscription_score(all_transactions: list[Transaction]) -> float:
 
     # Interval consistency (adaptive threshold)
     interval_threshold = 0.15 * detected_cycle
-    interval_consistency = sum(
-        1 for interval in intervals if abs(interval - median_interval) <= interval_threshold
-    ) / len(intervals)
+    n_consistent_intervals = int(np.count_nonzero(np.abs(intervals - median_interval) <= interval_threshold))
+    interval_consistency = n_consistent_intervals / len(intervals)
 
     # Amount consistency (adaptive threshold with rolling deviation)
-    median_amount = median(amounts)
-    try:
-        std_dev = float(np.std(amounts))  # ✅ Convert np.float64 to Python float
-    except Exception:
-        std_dev = 0.0
-    threshold = max(0.15 * median_amount, std_dev * 0.5)
-    amount_consistency = sum(1 for amount in amounts if abs(amount - median_amount) <= threshold) / len(amounts)
+    amount_consistency = get_amount_consistency(all_transactions)
 
     # Vendor similarity (if same vendor is used consistently)
     unique_vendors = len(set(vendors))
@@ -667,36 +674,30 @@ def get_subscription_score(all_transactions: list[Transaction]) -> float:
 
 def get_amount_consistency(all_transactions: list[Transaction]) -> float:
     """Detects how consistent transaction amounts are over time."""
-    amounts = [t.amount for t in all_transactions]
+    amounts = get_transaction_arrays(all_transactions).amounts
     if len(amounts) < 2:
         return 0.0
 
-    median_amount = median(amounts)
-    try:
-        std_dev = float(np.std(amounts))  # Explicit conversion
-    except Exception:
-        std_dev = 0.0
+    stats = get_transaction_stats(all_transactions)
+    median_amount = stats.amount_median
+    std_dev = stats.amount_std
     threshold = max(0.15 * median_amount, std_dev * 0.5)
 
-    amount_consistency = sum(1 for amount in amounts if abs(amount - median_amount) <= threshold) / len(amounts)
+    amount_consistency = int(np.count_nonzero(np.abs(amounts - median_amount) <= threshold)) / len(amounts)
 
     return min(1.0, amount_consistency)
 
 
 def irregular_interval_score(all_transactions: list[Transaction]) -> float:
     """Computes how irregular the intervals between transactions are (0 to 1)."""
-    if not all_transactions or len(all_transactions) < 2:
+    # the standard deviation of the intervals needs at least two intervals
+    if len(all_transactions) < 3:
         return 0.0
 
-    sorted_transactions = sorted(all_transactions, key=lambda t: t.date)
-    dates = [parse_date(t.date) for t in sorted_transactions]
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-
-    if len(intervals) > 1:
-        interval_std = stdev(intervals)
-        mean_interval = sum(intervals) / len(intervals)
-        return min(interval_std / (mean_interval + 1e-8), 1.0)
-    return 0.0
+    stats = get_transaction_stats(all_transactions)
+    interval_std = stats.interval_sample_std
+    mean_interval = stats.interval_mean
+    return min(interval_std / (mean_interval + 1e-8), 1.0)
 
 
 def inconsistent_amount_score(all_transactions: list[Transaction]) -> float:
@@ -704,13 +705,10 @@ def inconsistent_amount_score(all_transactions: list[Transaction]) -> float:
     if not all_transactions or len(all_transactions) < 2:
         return 0.0
 
-    amounts = [t.amount for t in all_transactions]
-
-    if len(amounts) > 1:
-        amount_std = stdev(amounts)
-        mean_amount = sum(amounts) / len(amounts)
-        return min(amount_std / (mean_amount + 1e-8), 1.0)
-    return 0.0
+    stats = get_transaction_stats(all_transactions)
+    amount_std = stats.amount_sample_std
+    mean_amount = stats.amount_mean
+    return min(amount_std / (mean_amount + 1e-8), 1.0)
 
 
 def non_recurring_score(all_transactions: list[Transaction]) -> float:
@@ -732,7 +730,7 @@ def amount_variability_score(all_transactions: list[Transaction]) -> float:
     if len(all_transactions) < 2:
         return 1.0  # Single transactions are inherently non-recurring
 
-    unique_amounts = len({t.amount for t in all_transactions})
+    unique_amounts = len(get_transaction_arrays(all_transactions).unique_amounts)
     ratio = unique_amounts / len(all_transactions)
 
     return min(10.0, ratio * 10)  # Scale to 1-10
@@ -743,22 +741,12 @@ def date_irregularity_score(all_transactions: list[Transaction]) -> float:
     if len(all_transactions) < 2:
         return 1.0  # Single transactions = non-recurring
 
-    months = [parse_date(t.date).month for t in all_transactions]
-    try:
-        date_std = stdev(months) if len(months) >= 2 else 0
-    except StatisticsError:
-        date_std = 0
+    months = get_transaction_arrays(all_transactions).months % 12 + 1
+    date_std = float(months.std(ddof=1)) if len(months) >= 2 else 0
 
     return min(10.0, (date_std / 2) * 10)  # Scale to 1-10, assuming >2 std dev is max irregularity
 
 
-# Helper: Calculate days between dates in a transaction list
-def _get_intervals(transactions: list[Transaction]) -> list[int]:
-    """Extract intervals between transaction dates."""
-    sorted_dates = sorted([t.date for t in transactions])  # No need to parse
-    return [(parse_date(sorted_dates[i]) - parse_date(sorted_dates[i - 1])).days for i in range(1, len(sorted_dates))]
-
-
 def proportional_timing_deviation(
     transaction: Transaction, transactions: list[Transaction], days_flexibility: int = 7
 ) -> float:
@@ -767,13 +755,14 @@ def proportional_timing_deviation(
     if len(transactions) < 2:
         return 0.0  # Not enough data to determine deviation
 
-    intervals = _get_intervals(transactions)
+    # The cached arrays are sorted by date, so the last day is the latest transaction whatever the list order
+    arrays = get_transaction_arrays(transactions)
 
-    if not intervals or all(i == 0 for i in intervals):
+    if not arrays.intervals.any():
         return 0.0  # Avoid division by zero when all intervals are zero
 
-    median_interval: float = float(median(intervals))
-    current_interval: int = (parse_date(transaction.date) - parse_date(transactions[-1].date)).days
+    median_interval: float = get_transaction_stats(transactions).interval_median
+    current_interval = get_epoch_day(transaction.date) - int(arrays.days[-1])
 
     # Allow a ±7 day window for delay flexibility
     if abs(current_interval - median_interval) <= days_flexibility:
@@ -793,7 +782,8 @@ def amount_similarity(transaction: Transaction, transactions: list[Transaction],
     current_amount = transaction.amount
     lower_bound = current_amount * (1 - tolerance)
     upper_bound = current_amount * (1 + tolerance)
-    similar_count = sum(1 for t in transactions if lower_bound <= t.amount <= upper_bound)
+    amounts = get_transaction_arrays(transactions).amounts
+    similar_count = int(np.count_nonzero((amounts >= lower_bound) & (amounts <= upper_bound)))
     return float(similar_count) / float(len(transactions))
 
 
@@ -802,15 +792,15 @@ def amount_coefficient_of_variation(transactions: list[Transaction]) -> float:
     Measures amount consistency using the population standard deviation.
     Returns (population stdev / mean). If not enough data, returns 0.0.
     """
-    amounts = [t.amount for t in transactions]
-    if len(amounts) < 2 or mean(amounts) == 0:
+    amounts = get_transaction_arrays(transactions).amounts
+    if len(amounts) < 2:
+        return 0.0
+    stats = get_transaction_stats(transactions)
+    mean_amount = stats.amount_mean
+    if mean_amount == 0:
         return 0.0
     # Use population std (ddof=0) to match test expectations.
-    try:
-        pop_std = float(np.std(amounts, ddof=0))
-    except Exception:
-        pop_std = 0.0
-    return float(pop_std / mean(amounts))
+    return stats.amount_std / mean_amount
 
 
 def detect_variable_subscription(all_transactions: list[Transaction]) -> float:
@@ -835,10 +825,7 @@ def detect_variable_subscription(all_transactions: list[Transaction]) -> float:
 
     # If changes are relatively consistent and small, likely a variable subscription
     avg_change = np.mean(pct_changes)
-    try:
-        std_change = float(np.std(pct_changes))
-    except Exception:
-        std_change = 0.0
+    std_change = float(np.std(pct_changes))
 
     # Score based on stability of changes
     if avg_change > 0.5:  # Too much variation
@@ -872,30 +859,22 @@ def detect_multi_tier_subscription(all_transactions: list[Transaction]) -> float
     if len(all_transactions) < 4:
         return 0.0
 
-    # Group amounts and count occurrences
-    amount_counts: defaultdict = defaultdict(int)
-    for t in all_transactions:
-        amount_counts[round(t.amount, 2)] += 1
+    # Date-sorted amounts in whole cents, so rounded amounts compare exactly as integers
+    cents = np.rint(get_transaction_arrays(all_transactions).amounts * 100).astype(np.int64)
 
-    # Look for multiple recurring amounts
-    recurring_amounts = [amt for amt, count in amount_counts.items() if count >= 2]
+    # Group amounts and count occurrences, then look for multiple recurring amounts
+    unique_cents, counts = np.unique(cents, return_counts=True)
+    recurring_cents = unique_cents[counts >= 2]
 
-    if len(recurring_amounts) < 2:
+    if len(recurring_cents) < 2:
         return 0.0
 
-    # Extract and sort transaction amounts
-    amounts = [round(t.amount, 2) for t in sorted(all_transactions, key=lambda x: parse_date(x.date))]
-
-    # Initialize pattern score
-    pattern_score = 0
-
     # Look for alternating patterns (e.g., 5.00, 10.00, 5.00)
-    for i in range(len(amounts) - 2):
-        if amounts[i] == amounts[i + 2] and amounts[i] in recurring_amounts:
-            pattern_score += 1
+    is_alternating = (cents[:-2] == cents[2:]) & np.isin(cents[:-2], recurring_cents)
+    pattern_score = int(np.count_nonzero(is_alternating))
 
     # Return normalized pattern score (between 0 and 1)
-    return min(1.0, pattern_score / (len(amounts) - 2))
+    return min(1.0, pattern_score / (len(cents) - 2))
 
 
 def detect_annual_price_adjustment(all_transactions: list[Transaction]) -> float:
@@ -905,9 +884,8 @@ def detect_annual_price_adjustment(all_transactions: list[Transaction]) -> float
     if len(all_transactions) < 2:
         return 0.0
 
-    # Sort transactions by date
-    sorted_transactions = sorted(all_transactions, key=lambda x: parse_date(x.date))
-    amounts = [t.amount for t in sorted_transactions]
+    # Amounts in date order
+    amounts = get_transaction_arrays(all_transactions).amounts.tolist()
 
     # Calculate year-over-year changes
     yearly_changes = []
@@ -922,10 +900,7 @@ def detect_annual_price_adjustment(all_transactions: list[Transaction]) -> float
 
     # Score based on consistency
     avg_change = np.mean(yearly_changes)
-    try:
-        std_change = float(np.std(yearly_changes))
-    except Exception:
-        std_change = 0.0
+    std_change = float(np.std(yearly_changes))
 
     consistency_score = 1.0 - min(float(std_change / avg_change) if avg_change > 0 else 1.0, 1.0)
     return float(consistency_score)
@@ -938,13 +913,7 @@ def detect_pay_period_alignment(all_transactions: list[Transaction]) -> float:
     if len(all_transactions) < 2:
         return 0.0
 
-    sorted_transactions = sorted(all_transactions, key=lambda x: parse_date(x.date))
-    dates = [parse_date(t.date) for t in sorted_transactions if parse_date(t.date)]
-
-    if len(dates) < 2:
-        return 0.0
-
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
+    intervals = get_transaction_arrays(all_transactions).intervals.tolist()
 
     if not intervals:
         return 0.0
@@ -962,7 +931,7 @@ def is_earnin_tip_subscription(transactions: list[Transaction]) -> float:
     """
     Detects Earnin tip subscriptions based on low, recurring amounts and consistent frequency (e.g., bi-weekly).
     """
-    if not transactions or not all("earnin" in t.name.lower() for t in transactions):
+    if not transactions or not all("earnin" in t.name_lower for t in transactions):
         return 0.0
 
     amounts = [t.amount for t in transactions]
@@ -983,12 +952,12 @@ def is_earnin_tip_subscription(transactions: list[Transaction]) -> float:
 
 def is_amazon_prime_like_subscription(transactions: list[Transaction]) -> float:
     """Detect recurring patterns specific to Amazon Prime, Audible, or Amazon Music subscriptions."""
-    if not transactions or not any("amazon" in t.name.lower() for t in transactions):
+    if not transactions or not any("amazon" in t.name_lower for t in transactions):
         return 0.0
 
     # Filter names for likely Prime-related descriptions
     prime_related = [
-        t for t in transactions if any(keyword in t.name.lower() for keyword in ["prime", "video", "audible", "music"])
+        t for t in transactions if any(keyword in t.name_lower for keyword in ["prime", "video", "audible", "music"])
     ]
     if len(prime_related) < 2:
         return 0.0
@@ -996,7 +965,7 @@ def is_amazon_prime_like_subscription(transactions: list[Transaction]) -> float:
     amounts = [t.amount for t in prime_related]
     dates = [parse_date(t.date) for t in prime_related]
 
-    median_amt = median(amounts)
+    median_amt = float(np.median(amounts))
     if median_amt < 3 or median_amt > 20:
         return 0.0  # Out of expected range
 
@@ -1014,21 +983,17 @@ def is_amazon_prime_like_subscription(transactions: list[Transaction]) -> float:
 
 def is_amazon_retail_irregular(transactions: list[Transaction]) -> float:
     """Detect irregular retail purchases from Amazon store with high amount variance."""
-    if not transactions or not any("amazon" in t.name.lower() for t in transactions):
+    if not transactions or not any("amazon" in t.name_lower for t in transactions):
         return 0.0
 
     # Skip obvious subscription names
-    if any(keyword in t.name.lower() for t in transactions for keyword in ["prime", "audible", "video", "music"]):
+    if any(keyword in t.name_lower for t in transactions for keyword in ["prime", "audible", "video", "music"]):
         return 0.0
 
-    amounts = [t.amount for t in transactions]
-    if len(amounts) < 2:
+    if len(transactions) < 2:
         return 0.0
 
-    try:
-        std_dev = float(np.std(amounts))
-    except Exception:
-        std_dev = 0.0
+    std_dev = get_transaction_stats(transactions).amount_std
     if std_dev > 20:  # High deviation in retail behavior
         return 1.0
     return 0.0
@@ -1039,16 +1004,16 @@ def is_apple_subscription_like(transactions: list[Transaction]) -> float:
     Detects Apple service charges that resemble recurring payments
     based on amount consistency and monthly timing.
     """
-    if not transactions or not any("apple" in t.name.lower() for t in transactions):
+    if not transactions or not any("apple" in t.name_lower for t in transactions):
         return 0.0
 
-    apple_txns = [t for t in transactions if "apple" in t.name.lower()]
+    apple_txns = [t for t in transactions if "apple" in t.name_lower]
     if len(apple_txns) < 2:
         return 0.0
 
     amounts = [t.amount for t in apple_txns]
     dates = [parse_date(t.date) for t in apple_txns]
-    median_amt = median(amounts)
+    median_amt = float(np.median(amounts))
 
     if median_amt < 1 or median_amt > 50:
         return 0.0
@@ -1067,24 +1032,15 @@ def is_apple_irregular_purchase(transactions: list[Transaction]) -> float:
     """
     Detect irregular purchase behavior for Apple purchases.
     """
-    if not transactions or not any("apple" in t.name.lower() for t in transactions):
+    if not transactions or not any("apple" in t.name_lower for t in transactions):
         return 0.0
 
-    amounts = [t.amount for t in transactions]
-    dates = [parse_date(t.date) for t in transactions if parse_date(t.date)]
-
-    if not amounts or not dates:
-        return 0.0
+    dates = [parse_date(t.date) for t in transactions]
 
-    try:
-        amount_std = float(np.std(amounts))
-    except Exception:
-        amount_std = 0.0
+    amount_std = get_transaction_stats(transactions).amount_std
+    # Gaps between consecutive transactions in list order
     interval_days = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    try:
-        interval_std = float(np.std(interval_days))
-    except Exception:
-        interval_std = 0.0
+    interval_std = float(np.std(interval_days)) if interval_days else 0.0
 
     if amount_std > 5.0 or interval_std > 5.0:
         return 1.0
@@ -1094,22 +1050,19 @@ def is_apple_irregular_purchase(transactions: list[Transaction]) -> float:
 
 def is_cleo_ai_cash_advance_like(transactions: list[Transaction]) -> float:
     """Detect irregular, one-time cash advances or repayments from Cleo AI."""
-    cleo_ai_txns = [t for t in transactions if "cleo ai" in t.name.lower()]
+    cleo_ai_txns = [t for t in transactions if "cleo ai" in t.name_lower]
     if len(cleo_ai_txns) < 2:
         return 0.0
 
     amounts = [t.amount for t in cleo_ai_txns]
-    try:
-        std_dev = float(np.std(amounts))
-    except Exception:
-        std_dev = 0.0
+    std_dev = float(np.std(amounts))
     if std_dev > 5 and max(amounts) > 10:
         return 1.0
     return 0.0
 
 
 def is_brigit_subscription_like(transactions: list[Transaction]) -> float:
-    if not transactions or not any("brigit" in t.name.lower() for t in transactions):
+    if not transactions or not any("brigit" in t.name_lower for t in transactions):
         return 0.0
 
     subscription_txns = [t for t in transactions if 8.0 <= t.amount <= 15.5 and round(t.amount % 1, 2) == 0.99]
@@ -1129,7 +1082,7 @@ def is_brigit_subscription_like(transactions: list[Transaction]) -> float:
 
 def is_brigit_repayment_like(transactions: list[Transaction]) -> float:
     """Detects Brigit cash advance repayments — irregular in amount and date."""
-    repayments = [t for t in transactions if "brigit" in t.name.lower() and not str(t.amount).endswith("0.99")]
+    repayments = [t for t in transactions if "brigit" in t.name_lower and not str(t.amount).endswith("0.99")]
 
     if len(repayments) < 2:
         return 0.0
@@ -1138,37 +1091,60 @@ def is_brigit_repayment_like(transactions: list[Transaction]) -> float:
     dates = [parse_date(t.date) for t in repayments]
     intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
 
-    try:
-        std_dev_amt = float(np.std(amounts))
-        variability_score = std_dev_amt / (float(np.mean(amounts)) + 1e-5)
-    except Exception:
-        variability_score = 0.0
+    std_dev_amt = float(np.std(amounts))
+    variability_score = std_dev_amt / (float(np.mean(amounts)) + 1e-5)
     irregular_timing = sum(1 for d in intervals if d > 10 or d < 5) / len(intervals) if intervals else 0.0
     return min(1.0, 0.5 * float(variability_score) + 0.5 * float(irregular_timing))
 
 
+ALWAYS_RECURRING_VENDORS = (
+    "sprint",
+    # "waterford grove",  # too specific
+    # "rightnow",  # too specific
+    "bet",
+    "sezzle",
+    "american water works",
+)
+ALWAYS_RECURRING_VENDORS_PATTERN = re.compile("|".join(map(re.escape, ALWAYS_RECURRING_VENDORS)))
+
+
 def is_always_recurring_vendor(transactions: list[Transaction]) -> float:
     """
     Marks known fixed recurring vendors as recurring (e.g., Sprint, Waterford Grove, RightNow)
     regardless of amount or interval consistency.
     """
-    always_recurring_vendors = {
-        "sprint",
-        # "waterford grove",  # too specific
-        # "rightnow",  # too specific
-        "bet",
-        "sezzle",
-        "american water works",
-    }
-
     for t in transactions:
-        name = t.name.lower()
-        if any(vendor in name for vendor in always_recurring_vendors):
+        if ALWAYS_RECURRING_VENDORS_PATTERN.search(t.name_lower):
             return 1.0
 
     return 0.0
 
 
+UTILITY_OR_INSURANCE_KEYWORDS = (
+    "insurance",
+    "telecom",
+    "electric",
+    "utility",
+    "power",
+    "gas",
+    "water",
+    "mtn",
+    "glo",
+    "airtel",
+    "sprint",
+    "at&t",
+    "verizon",
+    "rent",
+    "lease",
+    "housing",
+    "mortgage",
+    "trash",
+    # "rightnow",  # too specific
+    # "waterford grove",  # too specific
+)
+UTILITY_OR_INSURANCE_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, UTILITY_OR_INSURANCE_KEYWORDS)))
+
+
 def is_utilities_or_insurance_like(transactions: list[Transaction]) -> float:
     """
     Detects recurring payments for utilities, telecom, insurance —
@@ -1177,45 +1153,21 @@ def is_utilities_or_insurance_like(transactions: list[Transaction]) -> float:
     if len(transactions) < 3:
         return 0.0
 
-    vendor_name = transactions[0].name.lower()
-    utility_keywords = [
-        "insurance",
-        "telecom",
-        "electric",
-        "utility",
-        "power",
-        "gas",
-        "water",
-        "mtn",
-        "glo",
-        "airtel",
-        "sprint",
-        "at&t",
-        "verizon",
-        "rent",
-        "lease",
-        "housing",
-        "mortgage",
-        "trash",
-        # "rightnow",  # too specific
-        # "waterford grove",  # too specific
-    ]
-
-    if not any(keyword in vendor_name for keyword in utility_keywords):
+    vendor_name = transactions[0].name_lower
+    if not UTILITY_OR_INSURANCE_KEYWORDS_PATTERN.search(vendor_name):
         return 0.0
 
     # Sort by date
-    transactions.sort(key=lambda t: parse_date(t.date))
-    dates = [parse_date(t.date) for t in transactions]
+    transactions.sort(key=lambda t: t.date)
     amounts = [t.amount for t in transactions]
 
     # Check for soft recurring interval: 20 to 40 days
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    intervals = get_transaction_arrays(transactions).intervals.tolist()
     soft_interval_count = sum(1 for i in intervals if 20 <= i <= 40)
     interval_score = soft_interval_count / len(intervals) if intervals else 0.0
 
     # Check if amounts are loosely consistent (e.g., 25% tolerance from median)
-    median_amt = median(amounts)
+    median_amt = float(np.median(amounts))
     tolerance = 0.25 * median_amt
     amount_score = sum(1 for amt in amounts if abs(amt - median_amt) <= tolerance) / len(amounts)
 
@@ -1231,14 +1183,14 @@ def fixed_amount_fuzzy_interval_subscription(transactions: list[Transaction]) ->
     if len(transactions) < 3:
         return 0.0
 
-    vendor_name = transactions[0].name.lower()
+    vendor_name = transactions[0].name_lower
     fuzzy_fixed_subs = {"cleo ai", "cleo"}
 
     if not any(v in vendor_name for v in fuzzy_fixed_subs):
         return 0.0
 
     amounts = [t.amount for t in transactions]
-    median_amt = median(amounts)
+    median_amt = get_transaction_stats(transactions).amount_median
     tolerance = 0.10 * median_amt  # tighter than utilities
 
     # Check how many are within tight tolerance of median
@@ -1254,10 +1206,10 @@ def detect_vendor_name_variations(transaction: Transaction, all_transactions: li
     Detects if the same vendor appears with different name variations (e.g., Credit Ninja vs Creditninja).
     Returns a similarity score between 0 and 1.
     """
-    current_vendor = re.sub(r"[^a-zA-Z0-9]", "", transaction.name.lower())
+    current_vendor = re.sub(r"[^a-zA-Z0-9]", "", transaction.name_lower)
 
     # Get all unique vendor names
-    all_vendors = {re.sub(r"[^a-zA-Z0-9]", "", t.name.lower()) for t in all_transactions}
+    all_vendors = {re.sub(r"[^a-zA-Z0-9]", "", t.name_lower) for t in all_transactions}
 
     # Find the most similar vendor name
     max_similarity = max(
@@ -1276,16 +1228,15 @@ def payment_schedule_change_detector(transaction: Transaction, all_transactions:
     if len(all_transactions) < 4:  # Need enough history
         return 0.0
 
-    # Sort transactions by date
-    sorted_txns = sorted([t for t in all_transactions if t.name == transaction.name], key=lambda x: parse_date(x.date))
+    # Dates of this vendor's transactions, in date order
+    arrays = get_transaction_arrays(all_transactions)
+    vendor_days = arrays.days[arrays.names == transaction.name]
 
-    if len(sorted_txns) < 4:
+    if len(vendor_days) < 4:
         return 0.0
 
     # Calculate intervals between consecutive payments
-    intervals = [
-        (parse_date(sorted_txns[i].date) - parse_date(sorted_txns[i - 1].date)).days for i in range(1, len(sorted_txns))
-    ]
+    intervals = np.diff(vendor_days).tolist()
 
     # Look at the last 3 intervals vs previous intervals
     recent_intervals = intervals[-3:]
@@ -1295,8 +1246,8 @@ def payment_schedule_change_detector(transaction: Transaction, all_transactions:
         return 0.0
 
     # Calculate the difference between recent and historical median intervals
-    historical_median = median(historical_intervals)
-    recent_median = median(recent_intervals)
+    historical_median = float(np.median(historical_intervals))
+    recent_median = float(np.median(recent_intervals))
 
     # Normalize the difference
     max_interval = max(historical_median, recent_median)
@@ -1314,23 +1265,19 @@ def amount_progression_pattern(transaction: Transaction, all_transactions: list[
     if len(all_transactions) < 3:
         return 0.0
 
-    # Get transactions for the same vendor
-    vendor_txns = sorted([t for t in all_transactions if t.name == transaction.name], key=lambda x: parse_date(x.date))
+    # Get the amounts for the same vendor, in date order
+    arrays = get_transaction_arrays(all_transactions)
+    vendor_amounts = arrays.amounts[arrays.names == transaction.name].tolist()
 
-    if len(vendor_txns) < 3:
+    if len(vendor_amounts) < 3:
         return 0.0
 
     # Calculate percentage changes between consecutive amounts
-    changes = [
-        (t2.amount - t1.amount) / t1.amount if t1.amount != 0 else 0 for t1, t2 in itertools.pairwise(vendor_txns)
-    ]
+    changes = [(a2 - a1) / a1 if a1 != 0 else 0 for a1, a2 in itertools.pairwise(vendor_amounts)]
 
-    try:
-        # Calculate the consistency of these changes
-        change_std = stdev(changes)
-        return 1.0 / (1.0 + change_std)  # Normalize to [0,1]
-    except StatisticsError:
-        return 0.0
+    # Calculate the consistency of these changes
+    change_std = float(np.std(changes, ddof=1))
+    return 1.0 / (1.0 + change_std)  # Normalize to [0,1]
 
 
 def vendor_reliability_score(transactions: list[Transaction]) -> float:
@@ -1344,11 +1291,10 @@ def vendor_reliability_score(transactions: list[Transaction]) -> float:
         return 0.0
 
     # Sort by date
-    transactions.sort(key=lambda t: parse_date(t.date))
-    dates = [parse_date(t.date) for t in transactions]
-    amounts = [t.amount for t in transactions]
+    transactions.sort(key=lambda t: t.date)
+    days = get_transaction_arrays(transactions).days
 
-    days_span = (dates[-1] - dates[0]).days
+    days_span = int(days[-1] - days[0])
     if days_span < 1:
         return 0.0
 
@@ -1356,24 +1302,13 @@ def vendor_reliability_score(transactions: list[Transaction]) -> float:
     txns_per_month = len(transactions) / (days_span / 30)
     tx_density_score = min(txns_per_month / 5, 1.0)  # Cap at 5/month
 
+    stats = get_transaction_stats(transactions)
+
     # Amount consistency (lower std = higher score)
-    try:
-        amount_std = float(np.std(amounts))
-        amount_mean = float(np.mean(amounts))
-        amount_consistency = 1.0 / (1.0 + amount_std / (amount_mean + 1e-6))
-    except Exception:
-        amount_consistency = 0.0
+    amount_consistency = 1.0 / (1.0 + stats.amount_std / (stats.amount_mean + 1e-6))
 
     # Interval consistency (in days)
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-    if not intervals:
-        return 0.0
-    try:
-        interval_std = float(np.std(intervals))
-        interval_mean = float(np.mean(intervals))
-        interval_consistency = 1.0 / (1.0 + interval_std / (interval_mean + 1e-6))
-    except Exception:
-        interval_consistency = 0.0
+    interval_consistency = 1.0 / (1.0 + stats.interval_std / (stats.interval_mean + 1e-6))
 
     # Combine scores with weights
     return float(0.4 * tx_density_score + 0.3 * amount_consistency + 0.3 * interval_consistency)
@@ -1412,28 +1347,23 @@ def temporal_pattern_stability_score(transactions: list[Transaction]) -> float:
     if len(transactions) < 3:
         return 0.0
 
-    # Sort by date
-    dates = sorted([parse_date(t.date) for t in transactions])
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-    if not intervals:
+    # Intervals in date order
+    intervals = get_transaction_arrays(transactions).intervals
+    if not len(intervals):
         return 0.0
 
     # Temporal regularity (across all intervals)
-    mean_interval = float(np.mean(intervals))
-    try:
-        std_interval = float(np.std(intervals))
-        temporal_score = 1.0 / (1.0 + std_interval / (mean_interval + 1e-6))
-    except Exception:
-        temporal_score = 0.0
+    stats = get_transaction_stats(transactions)
+    temporal_score = 1.0 / (1.0 + stats.interval_std / (stats.interval_mean + 1e-6))
 
     # Rolling pattern in recent activity (last 90 days)
-    recent_intervals = [i for i in intervals if i <= 90]
+    recent_intervals = intervals[intervals <= 90]
     rolling_score = (
-        1.0 / (1.0 + np.std(recent_intervals) / (np.mean(recent_intervals) + 1e-6)) if recent_intervals else 0.0
+        1.0 / (1.0 + np.std(recent_intervals) / (np.mean(recent_intervals) + 1e-6)) if len(recent_intervals) else 0.0
     )
 
     # Seasonality (e.g., ~30-day or ~7-day cycles)
-    seasonal_score = _detect_seasonality(intervals)
+    seasonal_score = _detect_seasonality(intervals.tolist())
 
     # Combine scores with tuned weights
     return float(0.4 * temporal_score + 0.3 * rolling_score + 0.3 * seasonal_score)
@@ -1444,12 +1374,11 @@ def is_non_recurring(transactions: list[Transaction]) -> float:
     if len(transactions) < 2:
         return 1.0
 
-    transactions.sort(key=lambda t: parse_date(t.date))
-    dates = [parse_date(t.date) for t in transactions]
+    transactions.sort(key=lambda t: t.date)
     amounts = [t.amount for t in transactions]
 
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    avg_amount = mean(amounts)
+    intervals = get_transaction_arrays(transactions).intervals.tolist()
+    avg_amount = get_transaction_stats(transactions).amount_mean
 
     irregular_intervals = sum(1 for i in intervals if i < 7 or i > 35) / len(intervals)
     high_amount_variation = sum(1 for amt in amounts if abs(amt - avg_amount) / avg_amount > 0.2) / len(amounts)
@@ -1458,11 +1387,9 @@ def is_non_recurring(transactions: list[Transaction]) -> float:
     return round((irregular_intervals + high_amount_variation) / 2, 2)
 
 
-def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int | bool | float]:
-    """Get the new features for the transaction."""
-
-    # NOTE: Do NOT add features that are already in the original features.py file.
-    # NOTE: Each feature should be on a separate line. Do not use **dict shorthand.
+@cache_by_list_identity()
+def _get_vendor_features(all_transactions: list[Transaction]) -> dict[str, float]:
+    """Get the new features that depend only on the vendor's transactions, computed once per list."""
     return {
         # 3
         "is_non_recurring": is_non_recurring(all_transactions),
@@ -1471,11 +1398,6 @@ def get_new_features(transaction: Transaction, all_transactions: list[Transactio
         "temporal_pattern_stability_score": temporal_pattern_stability_score(all_transactions),
         # "amount_stability_cluster_score": amount_stability_cluster_score(all_transactions),
         "vendor_reliability_score": vendor_reliability_score(all_transactions),
-        "amount_progression_pattern": amount_progression_pattern(transaction, all_transactions),
-        "payment_schedule_change_detector": payment_schedule_change_detector(transaction, all_transactions),
-        # "detect_parallel_loans": detect_parallel_loans(transaction, all_transactions),
-        "detect_vendor_name_variations": detect_vendor_name_variations(transaction, all_transactions),
-        # ... existing features ...
         # 1
         "detect_variable_subscription": detect_variable_subscription(all_transactions),
         "is_business_day_aligned": is_business_day_aligned(all_transactions),
@@ -1499,6 +1421,45 @@ def get_new_features(transaction: Transaction, all_transactions: list[Transactio
     }
 
 
+def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int | bool | float]:
+    """Get the new features for the transaction."""
+
+    # Features of the vendor's transactions as a whole are the same for every transaction in the list
+    vendor_features = _get_vendor_features(all_transactions)
+
+    # NOTE: Do NOT add features that are already in the original features.py file.
+    # NOTE: Each feature should be on a separate line. Do not use **dict shorthand.
+    return {
+        # 3
+        "is_non_recurring": vendor_features["is_non_recurring"],
+        "temporal_pattern_stability_score": vendor_features["temporal_pattern_stability_score"],
+        "vendor_reliability_score": vendor_features["vendor_reliability_score"],
+        "amount_progression_pattern": amount_progression_pattern(transaction, all_transactions),
+        "payment_schedule_change_detector": payment_schedule_change_detector(transaction, all_transactions),
+        # "detect_parallel_loans": detect_parallel_loans(transaction, all_transactions),
+        "detect_vendor_name_variations": detect_vendor_name_variations(transaction, all_transactions),
+        # ... existing features ...
+        # 1
+        "detect_variable_subscription": vendor_features["detect_variable_subscription"],
+        "is_business_day_aligned": vendor_features["is_business_day_aligned"],
+        "detect_multi_tier_subscription": vendor_features["detect_multi_tier_subscription"],
+        "detect_annual_price_adjustment": vendor_features["detect_annual_price_adjustment"],
+        "detect_pay_period_alignment": vendor_features["detect_pay_period_alignment"],
+        # 2
+        "is_earnin_tip_subscription": vendor_features["is_earnin_tip_subscription"],
+        "is_cleo_ai_cash_advance_like": vendor_features["is_cleo_ai_cash_advance_like"],
+        "is_apple_irregular_purchase": vendor_features["is_apple_irregular_purchase"],
+        "is_apple_subscription_like": vendor_features["is_apple_subscription_like"],
+        "is_amazon_prime_like_subscription": vendor_features["is_amazon_prime_like_subscription"],
+        "is_amazon_retail_irregular": vendor_features["is_amazon_retail_irregular"],
+        "fixed_amount_fuzzy_interval_subscription": vendor_features["fixed_amount_fuzzy_interval_subscription"],
+        "is_utilities_or_insurance_like": vendor_features["is_utilities_or_insurance_like"],
+        "is_always_recurring_vendor": vendor_features["is_always_recurring_vendor"],
+        "is_brigit_repayment_like": vendor_features["is_brigit_repayment_like"],
+        "is_brigit_subscription_like": vendor_features["is_brigit_subscription_like"],
+    }
+
+
 # def dominant_amount_pattern_score(transactions: list[Transaction]) -> float:
 #     """
 #     Detects recurring patterns based on a combination of:
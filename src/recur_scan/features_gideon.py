@@ -8,12 +8,12 @@ def is_microsoft_xbox_same_or_near_day(transaction: Transaction, all_transaction
     Check if the transaction is for 'Microsoft Xbox' and occurs on the same day of the month
     or within 2 days before or after the previous transaction date.
     """
-    if "microsoft xbox" not in transaction.name.lower():
+    if "microsoft xbox" not in transaction.name_lower:
         return False
 
     transaction_day = get_day(transaction.date)
     for t in all_transactions:
-        if "microsoft xbox" in t.name.lower():
+        if "microsoft xbox" in t.name_lower:
             previous_day = get_day(t.date)
             if abs(transaction_day - previous_day) <= 2:
                 return True
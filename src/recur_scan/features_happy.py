@@ -1,7 +1,48 @@
+from collections import defaultdict
 from difflib import SequenceMatcher
 
+import numpy as np
+
 from recur_scan.transactions import Transaction
-from recur_scan.utils import get_day, parse_date
+from recur_scan.utils import cache_by_list_identity, get_day, parse_date
+
+
+def _same_vendor_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> list[Transaction]:
+    """Get the transactions with the same vendor name as transaction, ignoring case."""
+    name = transaction.name.lower()
+    # names of the same vendor are usually identical, so compare them as-is before normalizing
+    return [t for t in all_transactions if t.name == transaction.name or t.name.lower() == name]
+
+
+_NO_DAYS = np.zeros(0, dtype=np.int64)
+
+
+@cache_by_list_identity()
+def _vendor_days(all_transactions: list[Transaction]) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Get the sorted date ordinals of each vendor (by lowercase name) and the intervals between them."""
+    days_by_vendor: dict[str, list[int]] = defaultdict(list)
+    for t in all_transactions:
+        days_by_vendor[t.name.lower()].append(parse_date(t.date).toordinal())
+    result = {}
+    for name, days in days_by_vendor.items():
+        sorted_days = np.sort(np.array(days, dtype=np.int64))
+        result[name] = (sorted_days, np.diff(sorted_days))
+    return result
+
+
+def _same_vendor_days(transaction: Transaction, all_transactions: list[Transaction]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the sorted date ordinals of the transactions with the same vendor name as transaction, ignoring case,
+    and the intervals between them. The pattern scores share these instead of each sorting the dates again.
+    """
+    return _vendor_days(all_transactions).get(transaction.name.lower(), (_NO_DAYS, _NO_DAYS))
+
+
+def _fraction_of_intervals_between(intervals: np.ndarray, low: int, high: int) -> float:
+    """Get the fraction of the intervals between low and high days (inclusive), or 0.0 without intervals."""
+    if not len(intervals):
+        return 0.0
+    return int(np.count_nonzero((intervals >= low) & (intervals <= high))) / len(intervals)
 
 
 def get_n_transactions_same_description(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -19,18 +60,16 @@ def get_percent_transactions_same_description(transaction: Transaction, all_tran
 
 def get_transaction_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the average number of days between occurrences of this transaction."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
-    if len(same_transactions) < 2:
+    days, intervals = _same_vendor_days(transaction, all_transactions)
+    if len(days) < 2:
         return 0.0  # Not enough data to calculate frequency
 
-    dates = sorted([parse_date(t.date).toordinal() for t in same_transactions])
-    intervals = [dates[i] - dates[i - 1] for i in range(1, len(dates))]
-    return sum(intervals) / len(intervals)
+    return int(intervals.sum()) / len(intervals)
 
 
 def get_day_of_month_consistency(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the consistency of the day of the month for transactions with the same name."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    same_transactions = _same_vendor_transactions(transaction, all_transactions)
     if len(same_transactions) < 2:
         return 0.0  # Not enough data to calculate consistency
 
@@ -69,7 +108,7 @@ def get_new_features(transaction: Transaction, all_transactions: list[Transactio
 
 def get_amount_consistency(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate how consistent the amount is for transactions with the same name."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    same_transactions = _same_vendor_transactions(transaction, all_transactions)
     if len(same_transactions) < 2:
         return 0.0
 
@@ -80,7 +119,7 @@ def get_amount_consistency(transaction: Transaction, all_transactions: list[Tran
 
 def get_amount_variance(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the normalized variance in amounts for transactions with the same name."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    same_transactions = _same_vendor_transactions(transaction, all_transactions)
     if len(same_transactions) < 2:
         return 1.0  # High variance (bad) when not enough data
 
@@ -95,79 +134,58 @@ def get_amount_variance(transaction: Transaction, all_transactions: list[Transac
 
 def get_monthly_pattern_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Score how well the transaction fits a monthly pattern."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
-    if len(same_transactions) < 3:
+    days, intervals = _same_vendor_days(transaction, all_transactions)
+    if len(days) < 3:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in same_transactions])
-    # Convert to days since first transaction
-    first_date = dates[0]
-    days_since_first = [(d - first_date).days for d in dates]
-
     # Check if intervals are close to 28-31 days
-    intervals = [days_since_first[i] - days_since_first[i - 1] for i in range(1, len(days_since_first))]
-    monthly_intervals = [i for i in intervals if 25 <= i <= 35]
-    return len(monthly_intervals) / len(intervals) if intervals else 0.0
+    return _fraction_of_intervals_between(intervals, 25, 35)
 
 
 def get_weekly_pattern_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Score how well the transaction fits a weekly pattern."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
-    if len(same_transactions) < 3:
+    days, intervals = _same_vendor_days(transaction, all_transactions)
+    if len(days) < 3:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in same_transactions])
-    # Get day of week consistency (0=Monday, 6=Sunday)
-    weekdays = [d.weekday() for d in dates]
-    most_common_weekday = max(set(weekdays), key=weekdays.count)
-    weekday_consistency = sum(1 for wd in weekdays if wd == most_common_weekday) / len(weekdays)
+    # Get day of week consistency (0=Monday, 6=Sunday; ordinal 1 is Monday 0001-01-01)
+    weekdays = (days - 1) % 7
+    weekday_consistency = int(np.bincount(weekdays, minlength=7).max()) / len(weekdays)
 
     # Check if intervals are close to 7 days
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    weekly_intervals = [i for i in intervals if 6 <= i <= 8]
-    interval_match = len(weekly_intervals) / len(intervals) if intervals else 0.0
+    interval_match = _fraction_of_intervals_between(intervals, 6, 8)
 
     return (weekday_consistency + interval_match) / 2
 
 
 def get_biweekly_pattern_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Score how well the transaction fits a biweekly (every two weeks) pattern."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
-    if len(same_transactions) < 3:
+    days, intervals = _same_vendor_days(transaction, all_transactions)
+    if len(days) < 3:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in same_transactions])
-
     # Check if intervals are close to 14 days
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    biweekly_intervals = [i for i in intervals if 13 <= i <= 15]
-    return len(biweekly_intervals) / len(intervals) if intervals else 0.0
+    return _fraction_of_intervals_between(intervals, 13, 15)
 
 
 def get_quarterly_pattern_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Score how well the transaction fits a quarterly pattern."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
-    if len(same_transactions) < 3:
+    days, intervals = _same_vendor_days(transaction, all_transactions)
+    if len(days) < 3:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in same_transactions])
     # Check if intervals are close to 90 days
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    quarterly_intervals = [i for i in intervals if 85 <= i <= 95]
-    return len(quarterly_intervals) / len(intervals) if intervals else 0.0
+    return _fraction_of_intervals_between(intervals, 85, 95)
 
 
 def get_yearly_pattern_score(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Score how well the transaction fits a yearly pattern."""
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
-    if len(same_transactions) < 2:
+    days, intervals = _same_vendor_days(transaction, all_transactions)
+    if len(days) < 2:
         return 0.0
 
-    dates = sorted([parse_date(t.date) for t in same_transactions])
     # Check if intervals are close to 365 days
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
-    yearly_intervals = [i for i in intervals if 360 <= i <= 370]
-    return len(yearly_intervals) / len(intervals) if intervals else 0.0
+    return _fraction_of_intervals_between(intervals, 360, 370)
 
 
 def get_description_similarity(transaction: Transaction, other_transaction: Transaction) -> float:
@@ -237,7 +255,7 @@ def get_same_category_ratio(transaction: Transaction, all_transactions: list[Tra
     if not hasattr(transaction, "category") or transaction.category is None:
         return 0.0
 
-    same_name_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    same_name_transactions = _same_vendor_transactions(transaction, all_transactions)
     if len(same_name_transactions) < 2:
         return 0.0
 
@@ -286,7 +304,7 @@ def get_recurring_score(
         biweekly_pattern = features.get("biweekly_pattern_score", 0.0)
 
     # Count how many similar transactions we have
-    same_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    same_transactions = _same_vendor_transactions(transaction, all_transactions)
     count_factor = min(len(same_transactions) / 5, 1.0)  # Scales up to 5 occurrences
 
     # Check for time patterns - take the strongest pattern
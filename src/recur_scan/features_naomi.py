@@ -1,3 +1,4 @@
+import re
 from datetime import date, datetime
 from statistics import mean, stdev
 from typing import TypedDict
@@ -5,7 +6,7 @@ from typing import TypedDict
 import pandas as pd
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import get_epoch_day, get_transaction_arrays, parse_date, parse_datetime
 
 
 def get_is_monthly_recurring(transaction: Transaction, transactions: list[Transaction]) -> bool:
@@ -47,14 +48,17 @@ def get_cluster_label(transaction: Transaction, transactions: list[Transaction])
     return 1 if len(same_name_txns) > 1 and get_is_similar_amount(transaction, transactions) else 0
 
 
+SUBSCRIPTION_KEYWORDS = ("premium", "monthly", "plan", "subscription")
+SUBSCRIPTION_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, SUBSCRIPTION_KEYWORDS)))
+
+
 def get_subscription_keyword_score(transaction: Transaction) -> float:
     """Score based on subscription-related keywords."""
     name_lower = transaction.name.lower()
     always_recurring = {"netflix", "spotify", "disney+", "hulu", "amazon prime"}
-    keywords = {"premium", "monthly", "plan", "subscription"}
     if name_lower in always_recurring:
         return 1.0
-    if any(kw in name_lower for kw in keywords):
+    if SUBSCRIPTION_KEYWORDS_PATTERN.search(name_lower):
         return 0.8
     return 0.0
 
@@ -116,20 +120,20 @@ class TestTransaction:
 def get_date(txn: Transaction) -> date:
     if hasattr(txn, "timestamp") and txn.timestamp:
         return datetime.fromtimestamp(txn.timestamp).date()
-    return datetime.strptime(txn.date, "%Y-%m-%d").date() if isinstance(txn.date, str) else txn.date
+    return parse_datetime(txn.date).date() if isinstance(txn.date, str) else txn.date
 
 
 def days_since_last(transaction: Transaction, transactions: list[Transaction], grace_period: int = 0) -> int:
     """Calculate the number of days since the last transaction for a merchant."""
 
-    tx_date = get_date(transaction)
-    txns_sorted = sorted(transactions, key=lambda x: get_date(x), reverse=True)
-    for txn in txns_sorted:
-        txn_date = get_date(txn)
-        if txn_date < tx_date:
-            days = (tx_date - txn_date).days
-            return max(days - grace_period, 30) if grace_period else days
-    return -1
+    days_sorted = get_transaction_arrays(transactions).days
+    tx_day = get_epoch_day(transaction.date)
+    # the latest earlier transaction is just before tx_day's insertion point in the sorted days
+    i = int(days_sorted.searchsorted(tx_day, side="left"))
+    if i == 0:
+        return -1
+    days = tx_day - int(days_sorted[i - 1])
+    return max(days - grace_period, 30) if grace_period else days
 
 
 def get_amount_change_trend(transactions: list[Transaction]) -> float:
@@ -143,15 +147,12 @@ def get_amount_change_trend(transactions: list[Transaction]) -> float:
 
 def get_txns_last_30_days(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of transactions in the last 30 days."""
-    if isinstance(transaction.date, str):
-        today = datetime.strptime(transaction.date, "%Y-%m-%d").date()
-    else:
-        today = transaction.date
+    today = parse_datetime(transaction.date).date() if isinstance(transaction.date, str) else transaction.date
     count = 0
     for t in all_transactions:
         if t.name != transaction.name:
             continue
-        t_date = datetime.strptime(t.date, "%Y-%m-%d").date() if isinstance(t.date, str) else t.date
+        t_date = parse_datetime(t.date).date() if isinstance(t.date, str) else t.date
         days_diff = (today - t_date).days
         if 0 < days_diff <= 30:
             count += 1
@@ -172,9 +173,7 @@ def get_empower_twice_monthly_count(transactions: list[Transaction]) -> int:
     df_empower = df[df["name"].str.contains("Empower", case=False, na=False)].copy()
     if df_empower.empty:
         return 0
-    df_empower["date"] = df_empower["date"].apply(
-        lambda x: datetime.strptime(x, "%Y-%m-%d") if isinstance(x, str) else x
-    )
+    df_empower["date"] = df_empower["date"].apply(lambda x: parse_datetime(x) if isinstance(x, str) else x)
     df_empower["year"] = df_empower["date"].apply(lambda x: x.year)
     df_empower["month"] = df_empower["date"].apply(lambda x: x.month)
     monthly_counts = df_empower.groupby(["year", "month"]).size()
@@ -186,7 +185,7 @@ def get_merchant_recurrence_score(transaction: Transaction, transactions: list[T
     merchant_dates = [txn.date for txn in transactions if txn.name == transaction.name]
     if not merchant_dates:
         return 0.0
-    parsed_dates = [datetime.strptime(d, "%Y-%m-%d") if isinstance(d, str) else d for d in merchant_dates]
+    parsed_dates = [parse_datetime(d) if isinstance(d, str) else d for d in merchant_dates]
     months = {(d.year, d.month) for d in parsed_dates}
     total_months = max((max(months)[0] - min(months)[0]) * 12 + (max(months)[1] - min(months)[1]) + 1, 1)
     return float(len(months) / total_months)
@@ -1,24 +1,21 @@
 import re
-from datetime import datetime
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_transaction_arrays, parse_datetime
 
 
 def get_time_interval_between_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get the average time interval (in days) between transactions with the same amount"""
     same_amount_transactions = sorted(
         [t for t in all_transactions if t.amount == transaction.amount],  # Filter transactions with the same amount
-        key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"),  # Sort by date
+        key=lambda t: parse_datetime(t.date),  # Sort by date
     )
     if len(same_amount_transactions) < 2:
         return 365.0  # Return a large number if there are less than 2 transactions
     intervals = [
-        (
-            datetime.strptime(same_amount_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(same_amount_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(same_amount_transactions[i + 1].date) - parse_datetime(same_amount_transactions[i].date)).days
         for i in range(len(same_amount_transactions) - 1)  # Calculate intervals between consecutive transactions
     ]
     return sum(intervals) / len(intervals)  # Return the average interval
@@ -44,10 +41,7 @@ def get_transaction_frequency(transaction: Transaction, all_transactions: list[T
     if len(vendor_transactions) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
     intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(vendor_transactions[i + 1].date) - parse_datetime(vendor_transactions[i].date)).days
         for i in range(len(vendor_transactions) - 1)  # Calculate intervals between consecutive transactions
     ]
     if not intervals or sum(intervals) == 0:
@@ -79,19 +73,15 @@ def get_mad_transaction_amount(transaction: Transaction, all_transactions: list[
 
 def get_coefficient_of_variation(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate the coefficient of variation (CV) of transaction amounts for the same vendor"""
-    vendor_transactions = [
-        t.amount for t in all_transactions if t.name == transaction.name
-    ]  # Get amounts for the same vendor
-    if len(vendor_transactions) < 2:
+    arrays = get_transaction_arrays(all_transactions)
+    vendor_amounts = arrays.amounts[arrays.names == transaction.name]  # Get amounts for the same vendor
+    if len(vendor_amounts) < 2:
         return 0.0  # Return 0 if there are less than 2 transactions
-    mean = np.mean(vendor_transactions)  # Calculate the mean
+    mean = float(vendor_amounts.mean())  # Calculate the mean
     if mean == 0:
         return 0.0  # Avoid division by zero
-    try:
-        std_dev = float(np.std(vendor_transactions))  # Calculate the standard deviation
-    except Exception:
-        std_dev = 0.0
-    return float(std_dev / mean)  # Return the coefficient of variation
+    std_dev = float(vendor_amounts.std())  # Calculate the standard deviation
+    return std_dev / mean  # Return the coefficient of variation
 
 
 def get_transaction_interval_consistency(transaction: Transaction, transactions: list[Transaction]) -> float:
@@ -102,14 +92,11 @@ def get_transaction_interval_consistency(transaction: Transaction, transactions:
         return 0.0  # No intervals to calculate
 
     # Sort transactions by date (convert date strings to datetime objects)
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    vendor_transactions.sort(key=lambda t: parse_datetime(t.date))
 
     # Calculate intervals in days
     intervals = [
-        (
-            datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(vendor_transactions[i + 1].date) - parse_datetime(vendor_transactions[i].date)).days
         for i in range(len(vendor_transactions) - 1)
     ]
     # Return the average interval
@@ -481,10 +468,10 @@ def is_monthly_apple_storage(transaction: Transaction, all_transactions: list[Tr
     if len(vendor_transactions) < 2:
         return False
 
-    vendor_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    vendor_transactions.sort(key=lambda t: parse_datetime(t.date))
     for i in range(len(vendor_transactions) - 1):
-        current_date = datetime.strptime(vendor_transactions[i].date, "%Y-%m-%d")
-        next_date = datetime.strptime(vendor_transactions[i + 1].date, "%Y-%m-%d")
+        current_date = parse_datetime(vendor_transactions[i].date)
+        next_date = parse_datetime(vendor_transactions[i + 1].date)
         if not (28 <= (next_date - current_date).days <= 31):
             return False
 
@@ -515,12 +502,9 @@ def get_cobblestone_recurrence_score(transaction: Transaction, all_transactions:
         return 0.0
 
     # Sort by date
-    recurring_transactions.sort(key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
+    recurring_transactions.sort(key=lambda t: parse_datetime(t.date))
     intervals = [
-        (
-            datetime.strptime(recurring_transactions[i + 1].date, "%Y-%m-%d")
-            - datetime.strptime(recurring_transactions[i].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(recurring_transactions[i + 1].date) - parse_datetime(recurring_transactions[i].date)).days
         for i in range(len(recurring_transactions) - 1)
     ]
 
@@ -6,13 +6,20 @@ from recur_scan.transactions import Transaction
 from recur_scan.utils import get_day, parse_date
 
 
+def _same_vendor_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> list[Transaction]:
+    """Get the transactions with the same vendor name as transaction, ignoring case."""
+    name = transaction.name_lower
+    # names of the same vendor are usually identical, so compare them as-is before normalizing
+    return [t for t in all_transactions if t.name == transaction.name or t.name_lower == name]
+
+
 def has_min_recurrence_period(
     transaction: Transaction,
     all_transactions: list[Transaction],
     min_days: int = 60,
 ) -> bool:
     """Check if transactions from the same vendor span at least `min_days`."""
-    vendor_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    vendor_txs = _same_vendor_transactions(transaction, all_transactions)
     if len(vendor_txs) < 2:
         return False
     dates = sorted([parse_date(t.date) for t in vendor_txs])
@@ -25,7 +32,7 @@ def get_day_of_month_consistency(
     tolerance_days: int = 7,
 ) -> float:
     """Calculate the fraction of transactions within `tolerance_days` of the target day."""
-    vendor_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    vendor_txs = _same_vendor_transactions(transaction, all_transactions)
     if len(vendor_txs) < 2:
         return 0.0
     target_day = get_day(transaction.date)
@@ -42,7 +49,7 @@ def get_day_of_month_variability(
     all_transactions: list[Transaction],
 ) -> float:
     """Measure consistency of day-of-month (lower = more consistent)."""
-    vendor_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    vendor_txs = _same_vendor_transactions(transaction, all_transactions)
     if len(vendor_txs) < 2:
         return 31.0  # Max possible variability
 
@@ -67,7 +74,7 @@ def get_recurrence_confidence(
 ) -> float:
     """Calculate a confidence score (0-1) based on weighted historical recurrences."""
     vendor_txs = sorted(
-        [t for t in all_transactions if t.name.lower() == transaction.name.lower()],
+        _same_vendor_transactions(transaction, all_transactions),
         key=lambda x: x.date,
     )
     if len(vendor_txs) < 2:
@@ -83,13 +90,16 @@ def get_recurrence_confidence(
 
 
 def is_weekday_consistent(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
-    vendor_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
-    weekdays = [parse_date(t.date).weekday() for t in vendor_txs]  # Monday=0, Sunday=6
-    return len(set(weekdays)) <= 2  # Allow minor drift (e.g., weekend vs. Monday)
+    name = transaction.name_lower
+    weekday_mask = 0  # bit i is set when a vendor transaction falls on weekday i (Monday=0, Sunday=6)
+    for t in all_transactions:
+        if t.name_lower == name:
+            weekday_mask |= 1 << parse_date(t.date).weekday()
+    return weekday_mask.bit_count() <= 2  # Allow minor drift (e.g., weekend vs. Monday)
 
 
 def get_median_period(transaction: Transaction, all_transactions: list[Transaction]) -> float:
-    vendor_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    vendor_txs = _same_vendor_transactions(transaction, all_transactions)
     dates = sorted([parse_date(t.date) for t in vendor_txs])
     if len(dates) < 2:
         return 0.0
@@ -103,7 +113,7 @@ def get_median_period(transaction: Transaction, all_transactions: list[Transacti
 def get_fixed_recurring(name: str, transaction: Transaction) -> bool:
     """Check if the transaction is a fixed recurring payment."""
     # Check if the transaction name contains the specified name (case-insensitive)
-    return name.lower() in transaction.name.lower()
+    return name.lower() in transaction.name_lower
 
 
 # def is_att_recurring_pattern(
@@ -145,6 +155,19 @@ def get_fixed_recurring(name: str, transaction: Transaction) -> bool:
 #     return len(att_transactions) >= 2
 
 
+# List of common installment payment services
+INSTALLMENT_SERVICES = (
+    "afterpay",
+    "klarna",
+    "affirm",
+    "splitit",
+    "sezzle",
+    "quadpay",
+    "zip",
+)
+INSTALLMENT_SERVICES_PATTERN = re.compile("|".join(map(re.escape, INSTALLMENT_SERVICES)))
+
+
 def detect_installment_payments(
     transaction: Transaction,
     all_transactions: list[Transaction],
@@ -159,24 +182,14 @@ def detect_installment_payments(
     Returns:
         True if the transaction appears to be an installment payment, False otherwise
     """
-    # List of common installment payment services
-    installment_services = [
-        "afterpay",
-        "klarna",
-        "affirm",
-        "splitit",
-        "sezzle",
-        "quadpay",
-        "zip",
-    ]
     # Get all transactions from the same vendor
-    vendor_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    vendor_txs = _same_vendor_transactions(transaction, all_transactions)
     # Installment payments typically have at least 2 payments
     if len(vendor_txs) < 2:
         return False
 
     # Check if transaction is from an installment service
-    if not any(service in transaction.name.lower() for service in installment_services):
+    if INSTALLMENT_SERVICES_PATTERN.search(transaction.name_lower) is None:
         return False
 
     # Analyze date patterns - installments often happen every 2-4 weeks
@@ -193,6 +206,21 @@ def detect_installment_payments(
     return has_biweekly
 
 
+# Common financial service apps
+FINANCIAL_SERVICES = (
+    "albert",
+    "floatme",
+    "earnin",
+    "dave",
+    "brigit",
+    "empower",
+    "moneyLion",
+    "vola",
+    "chime",
+)
+FINANCIAL_SERVICES_PATTERN = re.compile("|".join(map(re.escape, FINANCIAL_SERVICES)))
+
+
 def detect_financial_service_fees(
     transaction: Transaction,
     all_transactions: list[Transaction],
@@ -207,25 +235,12 @@ def detect_financial_service_fees(
     Returns:
         True if the transaction appears to be a financial service fee, False otherwise
     """
-    # Common financial service apps
-    financial_services = [
-        "albert",
-        "floatme",
-        "earnin",
-        "dave",
-        "brigit",
-        "empower",
-        "moneyLion",
-        "vola",
-        "chime",
-    ]
-
     # Check if transaction is from a financial service
-    if not any(service in transaction.name.lower() for service in financial_services):
+    if FINANCIAL_SERVICES_PATTERN.search(transaction.name_lower) is None:
         return False
 
     # Get all transactions from the same vendor
-    vendor_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    vendor_txs = _same_vendor_transactions(transaction, all_transactions)
 
     # If we have 3+ transactions from the same financial service with the same amount,
     # it's likely a recurring service fee
@@ -343,6 +358,27 @@ def normalize_vendor_name(name: str) -> str:
     return name
 
 
+# Housing-related keywords
+HOUSING_KEYWORDS = (
+    "rent",
+    "lease",
+    "apartment",
+    "apt",
+    "condo",
+    "townhome",
+    "housing",
+    "mortgage",
+    "property",
+    "realty",
+    "real estate",
+    # "waterford",  # too specific
+    # "grove",  # too specific
+    "residence",
+    "home",
+)
+HOUSING_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, HOUSING_KEYWORDS)))
+
+
 def detect_housing_payments(
     transaction: Transaction,
     all_transactions: list[Transaction],
@@ -357,27 +393,8 @@ def detect_housing_payments(
     Returns:
         True if the transaction appears to be housing/rent related, False otherwise
     """
-    # Housing-related keywords
-    housing_keywords = [
-        "rent",
-        "lease",
-        "apartment",
-        "apt",
-        "condo",
-        "townhome",
-        "housing",
-        "mortgage",
-        "property",
-        "realty",
-        "real estate",
-        # "waterford",  # too specific
-        # "grove",  # too specific
-        "residence",
-        "home",
-    ]
-
     # Check if transaction name contains housing keywords
-    if not any(keyword in transaction.name.lower() for keyword in housing_keywords):
+    if HOUSING_KEYWORDS_PATTERN.search(transaction.name_lower) is None:
         return False
 
     # Normalize the vendor name
@@ -447,6 +464,29 @@ def detect_housing_payments(
 #     return matches / len(vendor_txs)
 
 
+STREAMING_SERVICES = (
+    "netflix",
+    "hulu",
+    "disney+",
+    "disney plus",
+    "hbo max",
+    "paramount+",
+    "peacock",
+    "apple tv",
+    "amazon prime video",
+    "youtube premium",
+    "spotify",
+    "pandora",
+    "tidal",
+    "apple music",
+    "amazon music",
+    "deezer",
+    "youtube music",
+    "amazon kids+",
+)
+STREAMING_SERVICES_PATTERN = re.compile("|".join(map(re.escape, STREAMING_SERVICES)))
+
+
 def detect_streaming_services(transaction: Transaction) -> bool:
     """
     Detects if the transaction is from a common streaming service.
@@ -457,28 +497,23 @@ def detect_streaming_services(transaction: Transaction) -> bool:
     Returns:
         True if it's a streaming service, False otherwise
     """
-    streaming_services = [
-        "netflix",
-        "hulu",
-        "disney+",
-        "disney plus",
-        "hbo max",
-        "paramount+",
-        "peacock",
-        "apple tv",
-        "amazon prime video",
-        "youtube premium",
-        "spotify",
-        "pandora",
-        "tidal",
-        "apple music",
-        "amazon music",
-        "deezer",
-        "youtube music",
-        "amazon kids+",
-    ]
-
-    return any(service in transaction.name.lower() for service in streaming_services)
+    return STREAMING_SERVICES_PATTERN.search(transaction.name_lower) is not None
+
+
+INSURANCE_KEYWORDS = (
+    "insurance",
+    "geico",
+    "progressive",
+    "allstate",
+    "state farm",
+    "farmers",
+    "liberty mutual",
+    "nationwide",
+    "root insurance",
+    "national general",
+    "usaa",
+)
+INSURANCE_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, INSURANCE_KEYWORDS)))
 
 
 def detect_insurance_payments(transaction: Transaction) -> bool:
@@ -491,21 +526,7 @@ def detect_insurance_payments(transaction: Transaction) -> bool:
     Returns:
         True if it's an insurance payment, False otherwise
     """
-    insurance_keywords = [
-        "insurance",
-        "geico",
-        "progressive",
-        "allstate",
-        "state farm",
-        "farmers",
-        "liberty mutual",
-        "nationwide",
-        "root insurance",
-        "national general",
-        "usaa",
-    ]
-
-    return any(keyword in transaction.name.lower() for keyword in insurance_keywords)
+    return INSURANCE_KEYWORDS_PATTERN.search(transaction.name_lower) is not None
 
 
 # def detect_subscription_box(transaction: Transaction) -> bool:
@@ -678,6 +699,19 @@ def detect_insurance_payments(transaction: Transaction) -> bool:
 #     )
 
 
+RECURRING_MERCHANTS = (
+    "kikoff",
+    "albert",
+    "amazon kids+",
+    "amazon music",
+    "microsoft xbox",
+    "apple",
+    "floatme",
+    "sezzle",
+)
+RECURRING_MERCHANTS_PATTERN = re.compile("|".join(map(re.escape, RECURRING_MERCHANTS)))
+
+
 def is_likely_recurring_by_merchant(transaction: Transaction) -> bool:
     """
     Identifies merchants that are almost always recurring subscriptions.
@@ -688,18 +722,7 @@ def is_likely_recurring_by_merchant(transaction: Transaction) -> bool:
     Returns:
         True if this merchant is likely to be a recurring subscription
     """
-    recurring_merchants = [
-        "kikoff",
-        "albert",
-        "amazon kids+",
-        "amazon music",
-        "microsoft xbox",
-        "apple",
-        "floatme",
-        "sezzle",
-    ]
-
-    return any(merchant.lower() in transaction.name.lower() for merchant in recurring_merchants)
+    return RECURRING_MERCHANTS_PATTERN.search(transaction.name_lower) is not None
 
 
 def has_consistent_amount(
@@ -718,7 +741,7 @@ def has_consistent_amount(
     Returns:
         True if the amount is consistent with other transactions from this merchant
     """
-    merchant_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    merchant_txs = _same_vendor_transactions(transaction, all_transactions)
     if len(merchant_txs) <= 1:
         return False
 
@@ -781,7 +804,7 @@ def has_regular_interval(
     Returns:
         True if transactions occur at regular intervals
     """
-    merchant_txs = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    merchant_txs = _same_vendor_transactions(transaction, all_transactions)
     if len(merchant_txs) < 3:
         return False
 
@@ -1,13 +1,15 @@
 import itertools
+import re
 import statistics
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+from datetime import timedelta
 from itertools import pairwise
 from statistics import mean
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_linear_slope, get_sorted_percentile, get_transaction_arrays, parse_date, parse_datetime
 
 
 def get_average_transaction_amount(all_transactions: list[Transaction]) -> float:
@@ -39,11 +41,9 @@ def is_recurring(transaction: Transaction, all_transactions: list[Transaction])
         grouped_transactions[(t.user_id, t.name)].append(t)
     for (_user_id, name), transactions in grouped_transactions.items():
         if transaction.name == name:
-            transactions.sort(key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"))
+            transactions.sort(key=lambda x: parse_datetime(x.date))
             for i in range(1, len(transactions)):
-                date_diff = datetime.strptime(transactions[i].date, "%Y-%m-%d") - datetime.strptime(
-                    transactions[i - 1].date, "%Y-%m-%d"
-                )
+                date_diff = parse_datetime(transactions[i].date) - parse_datetime(transactions[i - 1].date)
                 if (
                     transactions[i].amount == transactions[i - 1].amount
                     or transactions[i].amount == 1
@@ -66,18 +66,21 @@ def amount_ends_in_00(transaction: Transaction) -> bool:
     return round(transaction.amount % 1, 2) == 0.00
 
 
+RECURRING_MERCHANT_KEYWORDS = frozenset({
+    "at&t",
+    "google play",
+    "verizon",
+    "vz wireless",
+    "t-mobile",
+    "apple",
+    "disney+",
+    "amazon prime",
+})
+RECURRING_MERCHANT_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, RECURRING_MERCHANT_KEYWORDS)))
+
+
 def is_recurring_merchant(transaction: Transaction) -> bool:
-    recurring_keywords = {
-        "at&t",
-        "google play",
-        "verizon",
-        "vz wireless",
-        "t-mobile",
-        "apple",
-        "disney+",
-        "amazon prime",
-    }
-    return any(keyword in transaction.name.lower() for keyword in recurring_keywords)
+    return RECURRING_MERCHANT_KEYWORDS_PATTERN.search(transaction.name_lower) is not None
 
 
 def get_n_transactions_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -94,24 +97,18 @@ def get_interval_variance_coefficient(transaction: Transaction, all_transactions
     """Calculate the coefficient of variation for transaction intervals to measure consistency."""
     same_transactions = sorted(
         [t for t in all_transactions if t.name == transaction.name and t.amount == transaction.amount],
-        key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"),
+        key=lambda x: parse_datetime(x.date),
     )
     if len(same_transactions) < 3:  # Need at least 3 to establish a pattern
         return 1.0  # High variance (low consistency)
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals = [(parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_transactions)]
     if len(intervals) <= 1:
         return 1.0
-    try:
-        mean_interval = statistics.mean(intervals)
-        if mean_interval == 0:
-            return 1.0
-        # Lower value means more consistent intervals
-        return statistics.stdev(intervals) / mean_interval if mean_interval > 0 else 1.0
-    except statistics.StatisticsError:
+    mean_interval = statistics.mean(intervals)
+    if mean_interval == 0:
         return 1.0
+    # Lower value means more consistent intervals
+    return statistics.stdev(intervals) / mean_interval if mean_interval > 0 else 1.0
 
 
 def get_avg_days_between_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
@@ -122,8 +119,7 @@ def get_avg_days_between_same_merchant_amount(transaction: Transaction, all_tran
     if len(same_transactions) < 2:
         return 0.0
     intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d").date() - datetime.strptime(t1.date, "%Y-%m-%d").date()).days
-        for t1, t2 in pairwise(same_transactions)
+        (parse_datetime(t2.date).date() - parse_datetime(t1.date).date()).days for t1, t2 in pairwise(same_transactions)
     ]
     return sum(intervals) / len(intervals) if intervals else 0.0
 
@@ -138,15 +134,11 @@ def get_stddev_days_between_same_merchant_amount(
     if len(same_transactions) < 2:
         return 0.0
     intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d").date() - datetime.strptime(t1.date, "%Y-%m-%d").date()).days
-        for t1, t2 in pairwise(same_transactions)
+        (parse_datetime(t2.date).date() - parse_datetime(t1.date).date()).days for t1, t2 in pairwise(same_transactions)
     ]
     if len(intervals) <= 1:
         return 0.0
-    try:
-        return statistics.stdev(intervals)
-    except statistics.StatisticsError:
-        return 0.0
+    return statistics.stdev(intervals)
 
 
 def get_days_since_last_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -157,8 +149,8 @@ def get_days_since_last_same_merchant_amount(transaction: Transaction, all_trans
     ]
     if not same_transactions:
         return 0
-    last_date = max(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_transactions)
-    return (datetime.strptime(transaction.date, "%Y-%m-%d").date() - last_date).days
+    last_date = max(parse_datetime(t.date).date() for t in same_transactions)
+    return (parse_datetime(transaction.date).date() - last_date).days
 
 
 def is_expected_transaction_date(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -177,7 +169,7 @@ def is_expected_transaction_date(transaction: Transaction, all_transactions: lis
 
     # Calculate average interval
     intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d").date() - datetime.strptime(t1.date, "%Y-%m-%d").date()).days
+        (parse_datetime(t2.date).date() - parse_datetime(t1.date).date()).days
         for t1, t2 in itertools.pairwise(same_transactions)
     ]
 
@@ -187,8 +179,8 @@ def is_expected_transaction_date(transaction: Transaction, all_transactions: lis
     avg_interval = sum(intervals) / len(intervals)
 
     # Get the last transaction date before the current one
-    last_date = datetime.strptime(same_transactions[-1].date, "%Y-%m-%d").date()
-    current_date = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    last_date = parse_datetime(same_transactions[-1].date).date()
+    current_date = parse_datetime(transaction.date).date()
 
     # Calculate expected date
     expected_date = last_date + timedelta(days=round(avg_interval))
@@ -225,7 +217,7 @@ def has_incrementing_numbers(transaction: Transaction, all_transactions: list[Tr
 
 def has_consistent_reference_codes(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Check if transaction descriptions contain consistent reference codes"""
-    same_merchant_transactions = [t for t in all_transactions if t.name.lower() == transaction.name.lower()]
+    same_merchant_transactions = [t for t in all_transactions if t.name_lower == transaction.name_lower]
 
     if len(same_merchant_transactions) < 2:
         return False
@@ -237,7 +229,7 @@ def has_consistent_reference_codes(transaction: Transaction, all_transactions: l
     for t in same_merchant_transactions:
         # Look for patterns like REF:12345 or ID-ABC123
         pattern: str = r"(?:ref|id|no)[-:]\s*([a-zA-Z0-9]+)"
-        matches = re.findall(pattern, t.name.lower())
+        matches = re.findall(pattern, t.name_lower)
         if matches:
             ref_codes.extend(matches)
 
@@ -260,7 +252,7 @@ def calculate_markovian_probability(transaction: Transaction, all_transactions:
         return 0.0  # Not enough data to calculate probability
 
     # Extract the last n transactions
-    same_merchant_transactions.sort(key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"))
+    same_merchant_transactions.sort(key=lambda x: parse_datetime(x.date))
     recent_transactions = same_merchant_transactions[-(n + 1) :]
 
     # Check if the pattern of the last n transactions matches the current transaction
@@ -274,15 +266,14 @@ def calculate_streaks(transaction: Transaction, all_transactions: list[Transacti
     """Calculate the number of consecutive transactions within expected intervals."""
     same_merchant_transactions = sorted(
         [t for t in all_transactions if t.name == transaction.name],
-        key=lambda x: datetime.strptime(x.date, "%Y-%m-%d"),
+        key=lambda x: parse_datetime(x.date),
     )
     if len(same_merchant_transactions) < 2:
         return 0  # Not enough data to calculate streaks
 
     # Calculate intervals between transactions
     intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_merchant_transactions)
+        (parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_merchant_transactions)
     ]
 
     # Count consecutive intervals within expected ranges (e.g., weekly, monthly)
@@ -313,18 +304,13 @@ def get_ewma_interval_deviation(
     if len(same_transactions) < 3:
         return 1.0
 
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals = [(parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_transactions)]
 
     ewma = float(intervals[0])
     for interval in intervals[1:]:
         ewma = alpha * interval + (1 - alpha) * ewma
 
-    last_interval = (
-        datetime.strptime(transaction.date, "%Y-%m-%d") - datetime.strptime(same_transactions[-1].date, "%Y-%m-%d")
-    ).days
+    last_interval = (parse_datetime(transaction.date) - parse_datetime(same_transactions[-1].date)).days
 
     return abs(last_interval - ewma) / ewma if ewma else 1.0
 
@@ -343,8 +329,7 @@ def get_hurst_exponent(transaction: Transaction, all_transactions: list[Transact
         return 0.5  # Default to random-walk-like
 
     intervals: list[float] = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
+        (parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_transactions)
     ]
 
     n = len(intervals)
@@ -380,10 +365,7 @@ def get_fourier_periodicity_score(transaction: Transaction, all_transactions: li
         return 0.0
 
     intervals = np.array(
-        [
-            (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-            for t1, t2 in pairwise(same_transactions)
-        ],
+        [(parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_transactions)],
         dtype=float,
     )
 
@@ -402,10 +384,7 @@ def is_recurring_through_past_transactions(transaction: Transaction, all_transac
         return False
 
     # Check if the transaction occurs at regular intervals (weekly, monthly, etc.)
-    intervals = [
-        (datetime.strptime(t2.date, "%Y-%m-%d") - datetime.strptime(t1.date, "%Y-%m-%d")).days
-        for t1, t2 in pairwise(same_transactions)
-    ]
+    intervals = [(parse_datetime(t2.date) - parse_datetime(t1.date)).days for t1, t2 in pairwise(same_transactions)]
 
     # Check for regular intervals (e.g., weekly or monthly)
     return any(6 <= interval <= 8 or 28 <= interval <= 31 for interval in intervals)
@@ -413,15 +392,13 @@ def is_recurring_through_past_transactions(transaction: Transaction, all_transac
 
 def get_amount_zscore(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Standardize this transaction's amount relative to the user's overall distribution."""
-    user_amounts = [t.amount for t in all_transactions if t.user_id == transaction.user_id]
-    if len(user_amounts) < 2:
-        return 0.0
-    try:
-        mean = statistics.mean(user_amounts)
-        stdev = statistics.stdev(user_amounts)
-        return (transaction.amount - mean) / stdev if stdev > 0 else 0.0
-    except Exception:
+    user_amounts = np.array([t.amount for t in all_transactions if t.user_id == transaction.user_id])
+    # identical amounts have no spread; the NumPy std of them is rounding noise rather than exactly 0
+    if len(user_amounts) < 2 or user_amounts.min() == user_amounts.max():
         return 0.0
+    mean = float(user_amounts.mean())
+    stdev = float(user_amounts.std(ddof=1))
+    return (transaction.amount - mean) / stdev if stdev > 0 else 0.0
 
 
 def is_amount_outlier(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
@@ -444,7 +421,7 @@ def get_avg_days_between_same_merchant(transaction: Transaction, all_transaction
     """Average gap in days between transactions at this merchant (ignoring amount)."""
     same = sorted(
         [
-            datetime.strptime(t.date, "%Y-%m-%d").date()
+            parse_datetime(t.date).date()
             for t in all_transactions
             if t.user_id == transaction.user_id and t.name == transaction.name
         ],
@@ -457,39 +434,35 @@ def get_avg_days_between_same_merchant(transaction: Transaction, all_transaction
 
 def is_weekend_transaction(transaction: Transaction) -> bool:
     """Did this fall on a Saturday or Sunday?"""
-    dow = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    dow = parse_datetime(transaction.date).weekday()
     return dow >= 5
 
 
 def is_end_of_month_transaction(transaction: Transaction) -> bool:
     """Is the date the last day of its month?"""
-    d = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    d = parse_datetime(transaction.date).date()
     return (d + timedelta(days=1)).month != d.month
 
 
 def get_days_since_first_transaction(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Number of days between the user's very first transaction and this one."""
-    user_dates = [
-        datetime.strptime(t.date, "%Y-%m-%d").date() for t in all_transactions if t.user_id == transaction.user_id
-    ]
+    user_dates = [parse_datetime(t.date).date() for t in all_transactions if t.user_id == transaction.user_id]
     if not user_dates:
         return 0
     first = min(user_dates)
-    current = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    current = parse_datetime(transaction.date).date()
     return (current - first).days
 
 
 def get_amount_coefficient_of_variation(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Relative variability of amounts for this user."""
-    user_amounts = [t.amount for t in all_transactions if t.user_id == transaction.user_id]
-    if len(user_amounts) < 2:
-        return 0.0
-    try:
-        mean = statistics.mean(user_amounts)
-        stdev = statistics.stdev(user_amounts)
-        return (stdev / mean) if mean > 0 else 0.0
-    except Exception:
+    user_amounts = np.array([t.amount for t in all_transactions if t.user_id == transaction.user_id])
+    # identical amounts have no spread; the NumPy std of them is rounding noise rather than exactly 0
+    if len(user_amounts) < 2 or user_amounts.min() == user_amounts.max():
         return 0.0
+    mean = float(user_amounts.mean())
+    stdev = float(user_amounts.std(ddof=1))
+    return (stdev / mean) if mean > 0 else 0.0
 
 
 def get_unique_merchants_count(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -513,8 +486,10 @@ def is_consistent_weekday_pattern(transaction: Transaction, all_transactions: li
     ]
     if len(same) < 3:
         return False
-    weekdays = {datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in same}
-    return len(weekdays) == 1
+    weekday_mask = 0  # bit i is set when a transaction falls on weekday i
+    for t in same:
+        weekday_mask |= 1 << parse_date(t.date).weekday()
+    return weekday_mask.bit_count() == 1
 
 
 def get_recurrence_score_by_amount(
@@ -535,7 +510,7 @@ def get_recurrence_score_by_amount(
         return 0.0  # Not enough data to infer recurrence
 
     # Sort transactions by date
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in similar_transactions)
+    dates = sorted(parse_datetime(t.date).date() for t in similar_transactions)
     gaps = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
 
     if len(gaps) <= 1:
@@ -600,14 +575,14 @@ def get_days_since_last_transaction(transaction: Transaction, all_transactions:
     A larger value means more “stale” activity before this one.
     """
     user_past = [
-        datetime.strptime(t.date, "%Y-%m-%d").date()
+        parse_datetime(t.date).date()
         for t in all_transactions
         if t.user_id == transaction.user_id and t.date < transaction.date
     ]
     if not user_past:
         return 0  # no prior history
     last = max(user_past)
-    current = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    current = parse_datetime(transaction.date).date()
     return (current - last).days
 
 
@@ -618,9 +593,7 @@ def get_normalized_recency(transaction: Transaction, all_transactions: list[Tran
     Values ≫1 indicate unusually long gaps, ≪1 unusually tight.
     """
     # collect and sort all dates for this user
-    dates = sorted(
-        datetime.strptime(t.date, "%Y-%m-%d").date() for t in all_transactions if t.user_id == transaction.user_id
-    )
+    dates = sorted(parse_datetime(t.date).date() for t in all_transactions if t.user_id == transaction.user_id)
     if len(dates) < 2:
         return 0.0
 
@@ -643,9 +616,9 @@ def get_transaction_recency_score(transaction: Transaction, all_transactions: li
         return 0.0
 
     # Convert dates and sort
-    user_transactions = sorted(user_transactions, key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-    dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in user_transactions]
-    target_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    user_transactions = sorted(user_transactions, key=lambda t: parse_datetime(t.date))
+    dates = [parse_datetime(t.date) for t in user_transactions]
+    target_date = parse_datetime(transaction.date)
 
     earliest = dates[0]
     latest = dates[-1]
@@ -661,15 +634,13 @@ def get_n_transactions_last_30_days(
 ) -> int:
     """Count how many transactions this user made in the `window_days` before this transaction (excluding it)."""
     user_id = transaction.user_id
-    window_start = datetime.strptime(transaction.date, "%Y-%m-%d").date() - timedelta(days=window_days)
+    window_start = parse_datetime(transaction.date).date() - timedelta(days=window_days)
 
     return sum(
         1
         for t in all_transactions
         if t.user_id == user_id
-        and window_start
-        <= datetime.strptime(t.date, "%Y-%m-%d").date()
-        < datetime.strptime(transaction.date, "%Y-%m-%d").date()
+        and window_start <= parse_datetime(t.date).date() < parse_datetime(transaction.date).date()
     )
 
 
@@ -695,11 +666,9 @@ def afterpay_has_3_similar_in_6_weeks(transaction: Transaction, all_transactions
     same_amount_txns = [
         t
         for t in all_transactions
-        if t.user_id == transaction.user_id
-        and "afterpay" in t.name.lower()
-        and abs(t.amount - transaction.amount) < 0.01
+        if t.user_id == transaction.user_id and "afterpay" in t.name_lower and abs(t.amount - transaction.amount) < 0.01
     ]
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_amount_txns)
+    dates = sorted(parse_datetime(t.date).date() for t in same_amount_txns)
     return any((dates[i + 2] - dates[i]).days <= 42 for i in range(len(dates) - 2))
 
 
@@ -710,14 +679,12 @@ def afterpay_is_first_of_series(transaction: Transaction, all_transactions: list
     same_amount_txns = [
         t
         for t in all_transactions
-        if t.user_id == transaction.user_id
-        and "afterpay" in t.name.lower()
-        and abs(t.amount - transaction.amount) < 0.01
+        if t.user_id == transaction.user_id and "afterpay" in t.name_lower and abs(t.amount - transaction.amount) < 0.01
     ]
     if len(same_amount_txns) < 3:
         return False
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_amount_txns)
-    if datetime.strptime(transaction.date, "%Y-%m-%d").date() != dates[0]:
+    dates = sorted(parse_datetime(t.date).date() for t in same_amount_txns)
+    if parse_datetime(transaction.date).date() != dates[0]:
         return False
     gaps = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
     return any(12 <= g <= 16 for g in gaps)
@@ -730,14 +697,10 @@ def afterpay_likely_payment(transaction: Transaction, all_transactions: list[Tra
     same_amount_txns = [
         t
         for t in all_transactions
-        if t.user_id == transaction.user_id
-        and "afterpay" in t.name.lower()
-        and abs(t.amount - transaction.amount) < 0.01
-    ]
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_amount_txns)
-    recent_matches = [
-        d for d in dates if abs((datetime.strptime(transaction.date, "%Y-%m-%d").date() - d).days) in [14, 28]
+        if t.user_id == transaction.user_id and "afterpay" in t.name_lower and abs(t.amount - transaction.amount) < 0.01
     ]
+    dates = sorted(parse_datetime(t.date).date() for t in same_amount_txns)
+    recent_matches = [d for d in dates if abs((parse_datetime(transaction.date).date() - d).days) in [14, 28]]
     return len(recent_matches) >= 2
 
 
@@ -750,7 +713,7 @@ def afterpay_prev_same_amount_count(transaction: Transaction, all_transactions:
         for t in all_transactions
         if (
             t.user_id == transaction.user_id
-            and "afterpay" in t.name.lower()
+            and "afterpay" in t.name_lower
             and abs(t.amount - transaction.amount) < 0.01
             and t.date < transaction.date
         )
@@ -763,7 +726,7 @@ def afterpay_future_same_amount_exists(transaction: Transaction, all_transaction
     """
     return any(
         t.user_id == transaction.user_id
-        and "afterpay" in t.name.lower()
+        and "afterpay" in t.name_lower
         and abs(t.amount - transaction.amount) < 0.01
         and t.date > transaction.date
         for t in all_transactions
@@ -774,7 +737,7 @@ def afterpay_recurrence_score(transaction: Transaction, all_transactions: list[T
     """
     Computes a recurrence score (0 to 1) for Afterpay transactions based on timing, amount patterns, and frequency.
     """
-    if "afterpay" not in transaction.name.lower():
+    if "afterpay" not in transaction.name_lower:
         return 0.0
 
     score = 0.0
@@ -804,9 +767,7 @@ def is_moneylion_common_amount(transaction: Transaction, all_transactions: list[
     """
     Returns True if the transaction amount is among the user's top 3 most frequent MoneyLion amounts.
     """
-    relevant = [
-        t.amount for t in all_transactions if t.user_id == transaction.user_id and "moneylion" in t.name.lower()
-    ]
+    relevant = [t.amount for t in all_transactions if t.user_id == transaction.user_id and "moneylion" in t.name_lower]
     if len(relevant) < 3:
         return False
     freq = Counter(relevant).most_common(3)
@@ -822,7 +783,7 @@ def moneylion_days_since_last_same_amount(transaction: Transaction, all_transact
         for t in all_transactions
         if (
             t.user_id == transaction.user_id
-            and "moneylion" in t.name.lower()
+            and "moneylion" in t.name_lower
             and t.amount == transaction.amount
             and t.date < transaction.date
         )
@@ -831,8 +792,8 @@ def moneylion_days_since_last_same_amount(transaction: Transaction, all_transact
         return -1
     last = max(t.date for t in prior)
     try:
-        d1 = datetime.strptime(transaction.date, "%Y-%m-%d")
-        d2 = datetime.strptime(last, "%Y-%m-%d")
+        d1 = parse_datetime(transaction.date)
+        d2 = parse_datetime(last)
         return (d1 - d2).days
     except Exception:
         return -1
@@ -845,13 +806,13 @@ def moneylion_is_biweekly(transaction: Transaction, all_transactions: list[Trans
     relevant = [
         t
         for t in all_transactions
-        if t.user_id == transaction.user_id and "moneylion" in t.name.lower() and t.date < transaction.date
+        if t.user_id == transaction.user_id and "moneylion" in t.name_lower and t.date < transaction.date
     ]
     if len(relevant) < 2:
         return False
     relevant_sorted = sorted(relevant, key=lambda x: x.date)
     try:
-        dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in relevant_sorted]
+        dates = [parse_datetime(t.date) for t in relevant_sorted]
         diffs = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
         count = sum(12 <= d <= 16 for d in diffs)
         return count >= 2
@@ -866,12 +827,12 @@ def moneylion_weekday_pattern(transaction: Transaction, all_transactions: list[T
     relevant = [
         t
         for t in all_transactions
-        if t.user_id == transaction.user_id and "moneylion" in t.name.lower() and t.date < transaction.date
+        if t.user_id == transaction.user_id and "moneylion" in t.name_lower and t.date < transaction.date
     ]
     if len(relevant) < 3:
         return False
     try:
-        weekdays = [datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in relevant]
+        weekdays = [parse_datetime(t.date).weekday() for t in relevant]
         common_day, count = Counter(weekdays).most_common(1)[0]
         return count >= 3
     except Exception:
@@ -882,7 +843,7 @@ def apple_amount_close_to_median(transaction: Transaction, all_transactions: lis
     """
     Returns True if the transaction amount is within $1 of the user's median Apple transaction amount.
     """
-    relevant = [t.amount for t in all_transactions if t.user_id == transaction.user_id and "apple" in t.name.lower()]
+    relevant = [t.amount for t in all_transactions if t.user_id == transaction.user_id and "apple" in t.name_lower]
     if len(relevant) < 3:
         return False
     try:
@@ -897,16 +858,16 @@ def apple_total_same_amount_past_6m(transaction: Transaction, all_transactions:
     Returns the number of times the user paid the same amount to Apple in the past 180 days.
     """
     try:
-        txn_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+        txn_date = parse_datetime(transaction.date)
         prior = [
             t
             for t in all_transactions
             if (
                 t.user_id == transaction.user_id
-                and "apple" in t.name.lower()
+                and "apple" in t.name_lower
                 and t.amount == transaction.amount
                 and t.date < transaction.date
-                and (txn_date - datetime.strptime(t.date, "%Y-%m-%d")).days <= 180
+                and (txn_date - parse_datetime(t.date)).days <= 180
             )
         ]
         return len(prior)
@@ -921,7 +882,7 @@ def apple_std_dev_amounts(transaction: Transaction, all_transactions: list[Trans
     relevant = [
         t.amount
         for t in all_transactions
-        if t.user_id == transaction.user_id and "apple" in t.name.lower() and t.date < transaction.date
+        if t.user_id == transaction.user_id and "apple" in t.name_lower and t.date < transaction.date
     ]
     if len(relevant) < 3:
         return -1.0
@@ -946,13 +907,13 @@ def apple_days_since_first_seen_amount(transaction: Transaction, all_transaction
         relevant = [
             t.date
             for t in all_transactions
-            if t.user_id == transaction.user_id and "apple" in t.name.lower() and t.amount == transaction.amount
+            if t.user_id == transaction.user_id and "apple" in t.name_lower and t.amount == transaction.amount
         ]
         if not relevant:
             return -1
         first_seen = min(relevant)
-        d1 = datetime.strptime(transaction.date, "%Y-%m-%d")
-        d2 = datetime.strptime(first_seen, "%Y-%m-%d")
+        d1 = parse_datetime(transaction.date)
+        d2 = parse_datetime(first_seen)
         return (d1 - d2).days
     except Exception:
         return -1
@@ -962,7 +923,7 @@ def get_rolling_mean_amount(transaction: Transaction, all_transactions: list[Tra
     """Calculate rolling mean of last n amounts for this user+merchant combination."""
     same_user_merchant = sorted(
         [t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name],
-        key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"),
+        key=lambda t: parse_datetime(t.date),
     )
     last_n = [t.amount for t in same_user_merchant if t.date <= transaction.date][-window:]
     return float(np.mean(last_n)) if last_n else 0.0
@@ -976,8 +937,8 @@ def get_interval_variance_ratio(transaction: Transaction, all_transactions: list
 
     intervals = []
     for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
+        d1 = parse_datetime(t1.date).date()
+        d2 = parse_datetime(t2.date).date()
         intervals.append((d2 - d1).days)
 
     if not intervals:
@@ -996,14 +957,11 @@ def get_day_of_month_consistency(transaction: Transaction, all_transactions: lis
     merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
     same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
     same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
-    doms = [datetime.strptime(t.date, "%Y-%m-%d").day for t in same_amt_sorted]
+    doms = [parse_datetime(t.date).day for t in same_amt_sorted]
     if not doms:
         return False
 
-    try:
-        mode_dom = statistics.mode(doms)
-    except statistics.StatisticsError:
-        mode_dom = doms[0]
+    mode_dom = statistics.mode(doms)
     return all(abs(d - mode_dom) <= 1 for d in doms)
 
 
@@ -1015,8 +973,8 @@ def get_seasonality_score(transaction: Transaction, all_transactions: list[Trans
 
     intervals = []
     for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
+        d1 = parse_datetime(t1.date).date()
+        d2 = parse_datetime(t2.date).date()
         intervals.append((d2 - d1).days)
 
     if not intervals:
@@ -1028,36 +986,26 @@ def get_seasonality_score(transaction: Transaction, all_transactions: list[Trans
 
 
 def get_amount_drift_slope(transaction: Transaction, all_transactions: list[Transaction]) -> float:
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    same_amt_sorted = sorted(merchant_transactions, key=lambda t: t.date)
-    if len(same_amt_sorted) <= 1:
-        return 0.0
-    dates_ord = [datetime.strptime(t.date, "%Y-%m-%d").toordinal() for t in same_amt_sorted]
-    amounts = [t.amount for t in same_amt_sorted]
-    if len(dates_ord) <= 1 or len(set(amounts)) == 1:
-        return 0.0
-    try:
-        return float(np.polyfit(dates_ord, amounts, 1)[0])
-    except Exception:
+    arrays = get_transaction_arrays(all_transactions)
+    is_merchant = arrays.names == transaction.name
+    amounts = arrays.amounts[is_merchant]
+    if len(amounts) <= 1 or amounts.min() == amounts.max():
         return 0.0
+    return get_linear_slope(arrays.days[is_merchant], amounts)
 
 
 def get_burstiness_ratio(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate ratio of recent transactions (last 3 months) to previous 3 months."""
-    trans_date = datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    trans_date = parse_datetime(transaction.date).date()
     three_m_ago = trans_date - timedelta(days=90)
 
     merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
     same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
     same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
 
-    last_3m = sum(
-        1 for t in same_amt_sorted if three_m_ago <= datetime.strptime(t.date, "%Y-%m-%d").date() <= trans_date
-    )
+    last_3m = sum(1 for t in same_amt_sorted if three_m_ago <= parse_datetime(t.date).date() <= trans_date)
     prior_3m = sum(
-        1
-        for t in same_amt_sorted
-        if (three_m_ago - timedelta(days=90)) <= datetime.strptime(t.date, "%Y-%m-%d").date() < three_m_ago
+        1 for t in same_amt_sorted if (three_m_ago - timedelta(days=90)) <= parse_datetime(t.date).date() < three_m_ago
     )
 
     return (last_3m / prior_3m) if prior_3m else float(last_3m)
@@ -1071,8 +1019,8 @@ def get_serial_autocorrelation(transaction: Transaction, all_transactions: list[
 
     intervals = []
     for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
+        d1 = parse_datetime(t1.date).date()
+        d2 = parse_datetime(t2.date).date()
         intervals.append((d2 - d1).days)
 
     if len(intervals) <= 1:
@@ -1090,7 +1038,7 @@ def get_weekday_concentration(transaction: Transaction, all_transactions: list[T
     same_amt = [t for t in merchant_transactions if t.amount == transaction.amount]
     same_amt_sorted = sorted(same_amt, key=lambda t: t.date)
 
-    weekdays = [datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in same_amt_sorted]
+    weekdays = [parse_datetime(t.date).weekday() for t in same_amt_sorted]
     if not weekdays:
         return 0.0
 
@@ -1106,8 +1054,8 @@ def get_interval_consistency_ratio(transaction: Transaction, all_transactions: l
 
     intervals = []
     for t1, t2 in pairwise(same_amt_sorted):
-        d1 = datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.strptime(t2.date, "%Y-%m-%d").date()
+        d1 = parse_datetime(t1.date).date()
+        d2 = parse_datetime(t2.date).date()
         intervals.append((d2 - d1).days)
 
     if not intervals:
@@ -1137,12 +1085,11 @@ def get_amount_mad(transaction: Transaction, all_transactions: list[Transaction]
 
 def get_amount_iqr(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Return Interquartile Range (IQR) of amounts for this merchant."""
-    merchant_transactions = [t for t in all_transactions if t.name == transaction.name]
-    amounts = [t.amount for t in merchant_transactions]
-    if not amounts:
+    arrays = get_transaction_arrays(all_transactions)
+    amounts = np.sort(arrays.amounts[arrays.names == transaction.name])
+    if not len(amounts):
         return 0.0
-    amt_q1, amt_q3 = np.percentile(amounts, [25, 75])
-    return float(amt_q3 - amt_q1)
+    return get_sorted_percentile(amounts, 75) - get_sorted_percentile(amounts, 25)
 
 
 def get_new_features(transaction: Transaction, all_transactions: list[Transaction]) -> dict[str, int | bool | float]:
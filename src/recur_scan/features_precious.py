@@ -1,13 +1,14 @@
 import collections
-import datetime
 import itertools
 import math
+import re
 import statistics
 from typing import Any
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_epoch_day, get_linear_slope, parse_datetime
 
 # Allowed feature value type
 FeatureValue = float | int | bool
@@ -19,44 +20,51 @@ def amount_ends_in_00(transaction: Transaction) -> bool:
     return amount_str.endswith("00")
 
 
+RECURRING_KEYWORDS = frozenset({
+    "at&t",
+    "google play",
+    "verizon",
+    "vz wireless",
+    "vzw",
+    "t-mobile",
+    "apple",
+    "disney+",
+    "disney mobile",
+    "hbo max",
+    "amazon prime",
+    "netflix",
+    "spotify",
+    "hulu",
+    "la fitness",
+    "cleo ai",
+    "atlas",
+    "google storage",
+    "google drive",
+    "youtube premium",
+    "afterpay",
+    "amazon+",
+    "walmart+",
+    "amazonprime",
+    "duke energy",
+    "adobe",
+    # "healthy.line",  # too specific
+    "canva pty limite",
+    "brigit",
+    "cleo",
+    "microsoft",
+    "earnin",
+})
+RECURRING_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, RECURRING_KEYWORDS)))
+UTILITY_KEYWORDS = ("utility", "utilities", "electric", "water", "gas", "power", "energy")
+UTILITY_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, UTILITY_KEYWORDS)))
+PHONE_KEYWORDS = ("at&t", "t-mobile", "verizon")
+PHONE_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, PHONE_KEYWORDS)))
+
+
 def is_recurring_merchant(transaction: Transaction) -> bool:
     """Check if the transaction's merchant is a known recurring company"""
-    recurring_keywords = {
-        "at&t",
-        "google play",
-        "verizon",
-        "vz wireless",
-        "vzw",
-        "t-mobile",
-        "apple",
-        "disney+",
-        "disney mobile",
-        "hbo max",
-        "amazon prime",
-        "netflix",
-        "spotify",
-        "hulu",
-        "la fitness",
-        "cleo ai",
-        "atlas",
-        "google storage",
-        "google drive",
-        "youtube premium",
-        "afterpay",
-        "amazon+",
-        "walmart+",
-        "amazonprime",
-        "duke energy",
-        "adobe",
-        # "healthy.line",  # too specific
-        "canva pty limite",
-        "brigit",
-        "cleo",
-        "microsoft",
-        "earnin",
-    }
-    merchant_name = transaction.name.lower()
-    return any(keyword in merchant_name for keyword in recurring_keywords)
+    merchant_name = transaction.name_lower
+    return RECURRING_KEYWORDS_PATTERN.search(merchant_name) is not None
 
 
 def get_n_transactions_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -82,10 +90,7 @@ def get_avg_days_between_same_merchant_amount(transaction: Transaction, all_tran
     if len(same_transactions) < 2:
         return 0.0
     intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
+        (parse_datetime(t2.date).date() - parse_datetime(t1.date).date()).days
         for t1, t2 in itertools.pairwise(same_transactions)
     ]
     return sum(intervals) / len(intervals) if intervals else 0.0
@@ -102,18 +107,12 @@ def get_stddev_days_between_same_merchant_amount(
     if len(same_transactions) < 2:
         return 0.0
     intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
+        (parse_datetime(t2.date).date() - parse_datetime(t1.date).date()).days
         for t1, t2 in itertools.pairwise(same_transactions)
     ]
     if len(intervals) <= 1:
         return 0.0
-    try:
-        return statistics.stdev(intervals)
-    except statistics.StatisticsError:
-        return 0.0
+    return statistics.stdev(intervals)
 
 
 def get_days_since_last_same_merchant_amount(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -125,8 +124,8 @@ def get_days_since_last_same_merchant_amount(transaction: Transaction, all_trans
     ]
     if not same_transactions:
         return 0
-    last_date = max(datetime.datetime.strptime(t.date, "%Y-%m-%d").date() for t in same_transactions)
-    transaction_date = datetime.datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    last_date = max(parse_datetime(t.date).date() for t in same_transactions)
+    transaction_date = parse_datetime(transaction.date).date()
     return (transaction_date - last_date).days
 
 
@@ -139,10 +138,7 @@ def get_recurring_frequency(transaction: Transaction, all_transactions: list[Tra
     if len(same_transactions) < 2:
         return 0
     intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
+        (parse_datetime(t2.date).date() - parse_datetime(t1.date).date()).days
         for t1, t2 in itertools.pairwise(same_transactions)
     ]
     if not intervals:
@@ -160,15 +156,14 @@ def get_recurring_frequency(transaction: Transaction, all_transactions: list[Tra
 
 def get_is_utility(transaction: Transaction) -> bool:
     """Determine if the transaction is related to utilities"""
-    utility_keywords = {"utility", "utilities", "electric", "water", "gas", "power", "energy"}
-    merchant_name = transaction.name.lower()
-    return any(keyword in merchant_name for keyword in utility_keywords)
+    merchant_name = transaction.name_lower
+    return UTILITY_KEYWORDS_PATTERN.search(merchant_name) is not None
 
 
 def get_is_phone(transaction: Transaction) -> bool:
     """Determine if the transaction is related to phone services"""
-    merchant_name = transaction.name.lower()
-    return ("at&t" in merchant_name) or ("t-mobile" in merchant_name) or ("verizon" in merchant_name)
+    merchant_name = transaction.name_lower
+    return PHONE_KEYWORDS_PATTERN.search(merchant_name) is not None
 
 
 def is_subscription_amount(transaction: Transaction) -> bool:
@@ -181,7 +176,7 @@ def get_additional_features(
     transaction: Transaction, all_transactions: list[Transaction]
 ) -> dict[str, float | int | bool]:
     """Extract additional temporal and merchant consistency features that are not already included."""
-    trans_date = datetime.datetime.strptime(transaction.date, "%Y-%m-%d").date()
+    trans_date = parse_datetime(transaction.date).date()
     day_of_week: int = trans_date.weekday()
     day_of_month: int = trans_date.day
     # is_weekend: bool = day_of_week >= 5
@@ -190,14 +185,14 @@ def get_additional_features(
         [t for t in all_transactions if t.name == transaction.name], key=lambda x: x.date
     )
     if same_merchant_transactions:
-        first_date = datetime.datetime.strptime(same_merchant_transactions[0].date, "%Y-%m-%d").date()
+        first_date = parse_datetime(same_merchant_transactions[0].date).date()
         days_since_first: int = (trans_date - first_date).days
     else:
         days_since_first = 0
     intervals = []
     for t1, t2 in itertools.pairwise(same_merchant_transactions):
-        d1 = datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        d2 = datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
+        d1 = parse_datetime(t1.date).date()
+        d2 = parse_datetime(t2.date).date()
         intervals.append((d2 - d1).days)
     min_interval: int = min(intervals) if intervals else 0
     max_interval: int = max(intervals) if intervals else 0
@@ -205,8 +200,7 @@ def get_additional_features(
     merchant_recent_count: int = sum(
         1
         for t in all_transactions
-        if t.name == transaction.name
-        and (trans_date - datetime.datetime.strptime(t.date, "%Y-%m-%d").date()).days <= 30
+        if t.name == transaction.name and (trans_date - parse_datetime(t.date).date()).days <= 30
     )
     merchant_amounts = [t.amount for t in all_transactions if t.name == transaction.name]
     if merchant_amounts:
@@ -274,13 +268,13 @@ def get_new_features(
     # 2. Rolling mean of the last 3 amounts for this user+merchant
     same_user_merchant = sorted(
         [t for t in all_transactions if t.user_id == transaction.user_id and t.name == transaction.name],
-        key=lambda t: datetime.datetime.strptime(t.date, "%Y-%m-%d"),
+        key=lambda t: parse_datetime(t.date),
     )
     last_three = [t.amount for t in same_user_merchant if t.date <= transaction.date][-3:]
     rolling_mean = float(np.mean(last_three)) if last_three else 0.0
 
     # 3-5. Calendar features
-    dt = datetime.datetime.strptime(transaction.date, "%Y-%m-%d")
+    dt = parse_datetime(transaction.date)
     # day_of_week = dt.weekday()  # 0=Monday … 6=Sunday
     day_of_month = dt.day  # 1-31
     # month = dt.month  # 1-12
@@ -288,7 +282,7 @@ def get_new_features(
     # 6. Days since last same-merchant & same-amount transaction
     previous = [t for t in same_user_merchant if t.amount == amt and t.date < transaction.date]
     if previous:
-        last_date = max(datetime.datetime.strptime(t.date, "%Y-%m-%d").date() for t in previous)
+        last_date = max(parse_datetime(t.date).date() for t in previous)
         days_since_last = (dt.date() - last_date).days
     else:
         days_since_last = 0
@@ -307,10 +301,7 @@ def get_new_features(
         key=lambda t: t.date,
     )
     intervals = [
-        (
-            datetime.datetime.strptime(t2.date, "%Y-%m-%d").date()
-            - datetime.datetime.strptime(t1.date, "%Y-%m-%d").date()
-        ).days
+        (parse_datetime(t2.date).date() - parse_datetime(t1.date).date()).days
         for t1, t2 in itertools.pairwise(same_amt)
     ]
 
@@ -329,12 +320,9 @@ def get_new_features(
         median_interval = mad_interval = 0.0
 
     # Day-of-Month Consistency
-    doms = [datetime.datetime.strptime(t.date, "%Y-%m-%d").day for t in same_amt]
+    doms = [parse_datetime(t.date).day for t in same_amt]
     if doms:
-        try:
-            mode_dom = statistics.mode(doms)
-        except statistics.StatisticsError:
-            mode_dom = doms[0]
+        mode_dom = statistics.mode(doms)
         dom_consistency = all(abs(d - mode_dom) <= 1 for d in doms)
     else:
         dom_consistency = False
@@ -349,12 +337,8 @@ def get_new_features(
 
     # Amount Drift (linear slope over time)
     if len(same_amt) > 1:
-        dates_ord = [datetime.datetime.strptime(t.date, "%Y-%m-%d").toordinal() for t in same_amt]
-        amounts = [t.amount for t in same_amt]
-        try:
-            slope = np.polyfit(dates_ord, amounts, 1)[0]
-        except Exception:
-            slope = 0.0
+        dates_ord = np.array([get_epoch_day(t.date) for t in same_amt])
+        slope = get_linear_slope(dates_ord, np.array([t.amount for t in same_amt]))
     else:
         slope = 0.0
 
@@ -396,7 +380,7 @@ def get_new_features(
     cos_doy = math.cos(2 * math.pi * doy / 365)
 
     # Weekday Concentration
-    weekdays = [datetime.datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in same_amt]
+    weekdays = [parse_datetime(t.date).weekday() for t in same_amt]
     top_count = max(collections.Counter(weekdays).values(), default=0)
     weekday_concentration = top_count / len(weekdays) if weekdays else 0
 
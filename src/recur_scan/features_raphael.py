@@ -1,32 +1,29 @@
 import difflib
-from datetime import datetime
+import re
 
 import numpy as np
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import count_days_apart, get_epoch_day, get_transaction_arrays, parse_date, parse_datetime
 
 
 # ===== ORIGINAL FUNCTIONS (KEPT IN PLACE) =====
 def get_n_transactions_same_day(transaction: Transaction, all_transactions: list[Transaction], n_days_off: int) -> int:
-    transaction_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    transaction_date = parse_date(transaction.date)
     transaction_day = transaction_date.day
 
-    count = 0
-    for t in all_transactions:
-        if t.name == transaction.name:  # Only consider transactions with same name
-            t_date = datetime.strptime(t.date, "%Y-%m-%d")
-            # Check if day of month is within tolerance, accounting for month boundaries
-            day_diff = abs(t_date.day - transaction_day)
-            if day_diff <= n_days_off:
-                count += 1
-            # Special case for month boundaries (e.g., Jan 31 and Feb 1 with n_days_off=1)
-            elif (transaction_day > 28 and t_date.day < 3) or (transaction_day < 3 and t_date.day > 28):
-                month_diff = abs((t_date.month - transaction_date.month) % 12)
-                if month_diff == 1 and (31 - transaction_day + t_date.day) <= n_days_off:
-                    count += 1
+    arrays = get_transaction_arrays(all_transactions)
+    same_name = arrays.names == transaction.name  # Only consider transactions with same name
+    days = arrays.days_of_month
+    # Check if day of month is within tolerance, accounting for month boundaries
+    within = np.abs(days - transaction_day) <= n_days_off
+    # Special case for month boundaries (e.g., Jan 31 and Feb 1 with n_days_off=1)
+    if transaction_day > 28 or transaction_day < 3:
+        at_boundary = days < 3 if transaction_day > 28 else days > 28
+        month_diff = (arrays.months % 12 + 1 - transaction_date.month) % 12
+        within |= at_boundary & (month_diff == 1) & (31 - transaction_day + days <= n_days_off)
 
-    return count
+    return int(np.count_nonzero(same_name & within))
 
 
 def get_n_transactions_days_apart(
@@ -39,15 +36,8 @@ def get_n_transactions_days_apart(
     Get the number of transactions in all_transactions that are within n_days_off of
     being n_days_apart from transaction.
     """
-    transaction_date = parse_date(transaction.date)
-    count = 0
-
-    for t in all_transactions:
-        days_difference = abs((parse_date(t.date) - transaction_date).days)
-        if abs(days_difference - n_days_apart) <= n_days_off:
-            count += 1
-
-    return count
+    days = get_transaction_arrays(all_transactions).days
+    return count_days_apart(days, get_epoch_day(transaction.date), n_days_apart, n_days_off)
 
 
 def get_pct_transactions_days_apart(
@@ -87,13 +77,11 @@ def get_is_common_subscription_amount(transaction: Transaction) -> bool:
 
 def get_occurs_same_week(transaction: Transaction, transactions: list[Transaction]) -> bool:
     """Checks if the transaction occurs in the same week of the month across multiple months."""
-    transaction_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    transaction_date = parse_datetime(transaction.date)
     transaction_week = transaction_date.day // 7  # Determine which week in the month (0-4)
 
     same_week_count = sum(
-        1
-        for t in transactions
-        if t.name == transaction.name and datetime.strptime(t.date, "%Y-%m-%d").day // 7 == transaction_week
+        1 for t in transactions if t.name == transaction.name and parse_datetime(t.date).day // 7 == transaction_week
     )
 
     return same_week_count >= 2  # True if found at least twice
@@ -104,7 +92,7 @@ def get_is_similar_name(
 ) -> bool:
     """Checks if a transaction has a similar name to other past transactions."""
     for t in transactions:
-        similarity = difflib.SequenceMatcher(None, transaction.name.lower(), t.name.lower()).ratio()
+        similarity = difflib.SequenceMatcher(None, transaction.name_lower, t.name_lower).ratio()
         if similarity >= similarity_threshold:
             return True  # If a close match is found, return True
     return False
@@ -112,9 +100,7 @@ def get_is_similar_name(
 
 def get_is_fixed_interval(transaction: Transaction, transactions: list[Transaction], margin: int = 1) -> bool:
     """Returns True if a transaction recurs at fixed intervals (weekly, bi-weekly, monthly)."""
-    transaction_dates = sorted([
-        datetime.strptime(t.date, "%Y-%m-%d") for t in transactions if t.name == transaction.name
-    ])
+    transaction_dates = sorted([parse_datetime(t.date) for t in transactions if t.name == transaction.name])
 
     if len(transaction_dates) < 2:
         return False  # Not enough transactions to determine intervals
@@ -150,9 +136,9 @@ def get_is_weekday_consistent(transaction: Transaction, transactions: list[Trans
     if len(same_name_txns) < 2:
         return False
 
-    transaction_weekday = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    transaction_weekday = parse_datetime(transaction.date).weekday()
     return all(
-        datetime.strptime(t.date, "%Y-%m-%d").weekday() == transaction_weekday for t in same_name_txns[-3:]
+        parse_datetime(t.date).weekday() == transaction_weekday for t in same_name_txns[-3:]
     )  # Check last 3 occurrences
 
 
@@ -162,28 +148,25 @@ def get_is_seasonal(transaction: Transaction, transactions: list[Transaction]) -
     if len(same_name_txns) < 2:
         return False
 
-    dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in same_name_txns]
+    dates = [parse_datetime(t.date) for t in same_name_txns]
     intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     return all(360 <= interval <= 370 for interval in intervals)
 
 
 def get_amount_variation(transaction: Transaction, transactions: list[Transaction]) -> float:
     """Calculate coefficient of variation for amounts."""
-    same_name_txns = [t for t in transactions if t.name == transaction.name]
-    if len(same_name_txns) < 2:
+    arrays = get_transaction_arrays(transactions)
+    amounts = arrays.amounts[arrays.names == transaction.name]
+    if len(amounts) < 2:
         return 0.0
 
-    amounts = [t.amount for t in same_name_txns]
-    if len(set(amounts)) <= 1:
+    if amounts.min() == amounts.max():
         return 0.0
-    try:
-        mean = sum(amounts) / len(amounts)
-        if abs(mean) < 1e-8:
-            return 0.0
-        std_dev = (sum((x - mean) ** 2 for x in amounts) / len(amounts)) ** 0.5
-        return float((std_dev / mean) * 100)
-    except Exception:
+    mean = float(amounts.mean())
+    if abs(mean) < 1e-8:
         return 0.0
+    std_dev = float(amounts.std())
+    return (std_dev / mean) * 100
 
 
 def get_has_trial_period(transaction: Transaction, transactions: list[Transaction]) -> bool:
@@ -194,7 +177,7 @@ def get_has_trial_period(transaction: Transaction, transactions: list[Transactio
 
 def get_description_pattern(transaction: Transaction) -> int:
     """Extract payment pattern from description"""
-    desc = transaction.name.lower()
+    desc = transaction.name_lower
     patterns = {
         1: "ach" in desc,
         2: "auto" in desc or "autopay" in desc,
@@ -206,7 +189,7 @@ def get_description_pattern(transaction: Transaction) -> int:
 
 def get_is_weekend_transaction(transaction: Transaction) -> bool:
     """Check if transaction occurs on weekend"""
-    return datetime.strptime(transaction.date, "%Y-%m-%d").weekday() >= 5
+    return parse_datetime(transaction.date).weekday() >= 5
 
 
 def get_merchant_fingerprint(transaction: Transaction, transactions: list[Transaction]) -> float:
@@ -216,7 +199,7 @@ def get_merchant_fingerprint(transaction: Transaction, transactions: list[Transa
     # Calculate stability scores (0-1)
     if len(same_merchant) > 1:
         amounts = [t.amount for t in same_merchant]
-        days = [datetime.strptime(t.date, "%Y-%m-%d").day for t in same_merchant]
+        days = [parse_datetime(t.date).day for t in same_merchant]
         # Penalize amount variation more strongly
         try:
             amount_stability = 1 - min(1, (float(np.std(amounts)) / (float(np.mean(amounts)) + 1e-6)) ** 1.5)
@@ -229,7 +212,7 @@ def get_merchant_fingerprint(transaction: Transaction, transactions: list[Transa
         day_stability = 0
 
     # Payment method clues
-    method_score = 0.5 if any("ach" in t.name.lower() or "autopay" in t.name.lower() for t in same_merchant) else 0
+    method_score = 0.5 if any("ach" in t.name_lower or "autopay" in t.name_lower for t in same_merchant) else 0
 
     # Adjusted weights: make perfect patterns score high
     return float(max(0.0, min(1.0, (amount_stability * 0.7) + (day_stability * 0.2) + (method_score * 0.1))))
@@ -249,7 +232,7 @@ def get_recurrence_confidence_score(transaction: Transaction, transactions: list
         return 0.0
 
     amounts = [t.amount for t in same_merchant]
-    days = [datetime.strptime(t.date, "%Y-%m-%d").day for t in same_merchant]
+    days = [parse_datetime(t.date).day for t in same_merchant]
 
     # Stronger penalty for amount variation
     try:
@@ -260,7 +243,7 @@ def get_recurrence_confidence_score(transaction: Transaction, transactions: list
         day_stability = 0
 
     # Payment method clues
-    method_score = 0.5 if any("ach" in t.name.lower() or "autopay" in t.name.lower() for t in same_merchant) else 0
+    method_score = 0.5 if any("ach" in t.name_lower or "autopay" in t.name_lower for t in same_merchant) else 0
 
     # Special case: only two transactions and large differences
     if len(same_merchant) == 2 and (abs(amounts[0] - amounts[1]) > 0.5 * max(amounts) or abs(days[0] - days[1]) > 10):
@@ -270,6 +253,12 @@ def get_recurrence_confidence_score(transaction: Transaction, transactions: list
     return float(max(0.0, min(1.0, (amount_stability * 0.85) + (day_stability * 0.05) + (method_score * 0.1))))
 
 
+SUBSCRIPTION_KEYWORDS = ("subscription", "membership", "renewal")
+SUBSCRIPTION_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, SUBSCRIPTION_KEYWORDS)))
+TRUSTED_MERCHANTS = ("netflix", "spotify", "amazon prime", "mortgage", "rent")
+TRUSTED_MERCHANTS_PATTERN = re.compile("|".join(map(re.escape, TRUSTED_MERCHANTS)))
+
+
 def get_transaction_trust_score(transaction: Transaction, transactions: list[Transaction]) -> float:
     """
     Calculates a 0-1 score focusing on precision by verifying:
@@ -289,10 +278,9 @@ def get_transaction_trust_score(transaction: Transaction, transactions: list[Tra
     }
 
     # 1. Merchant Reputation (30% weight)
-    trusted_merchants = {"netflix", "spotify", "amazon prime", "mortgage", "rent"}
-    if any(m in transaction.name.lower() for m in trusted_merchants):
+    if TRUSTED_MERCHANTS_PATTERN.search(transaction.name_lower):
         trust_signals["merchant_reputation"] = 1.0
-    elif "ach" in transaction.name.lower():
+    elif "ach" in transaction.name_lower:
         trust_signals["merchant_reputation"] = 0.8
 
     # 2. Amount Validation (25% weight)
@@ -304,14 +292,14 @@ def get_transaction_trust_score(transaction: Transaction, transactions: list[Tra
 
     # 3. Temporal Plausibility (25% weight)
     if len(same_merchant) >= 2:
-        dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in same_merchant])
+        dates = sorted([parse_datetime(t.date) for t in same_merchant])
         intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
         if all(15 <= i <= 45 for i in intervals):  # Valid recurring range
             trust_signals["temporal_plausibility"] = 1.0
 
     # 4. Behavioral Consistency (20% weight)
-    desc = transaction.name.lower()
-    if any(kw in desc for kw in {"subscription", "membership", "renewal"}):
+    desc = transaction.name_lower
+    if SUBSCRIPTION_KEYWORDS_PATTERN.search(desc):
         trust_signals["behavioral_consistency"] = 1.0
     elif "payment" in desc:
         trust_signals["behavioral_consistency"] = 0.8
@@ -326,6 +314,10 @@ def get_transaction_trust_score(transaction: Transaction, transactions: list[Tra
     return sum(trust_signals[s] * weights[s] for s in trust_signals)
 
 
+MERCHANT_BONUS_KEYWORDS = ("autopay", "subscription", "prime", "netflix", "spotify")
+MERCHANT_BONUS_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, MERCHANT_BONUS_KEYWORDS)))
+
+
 def get_recurring_confidence(transaction: Transaction, transactions: list[Transaction]) -> float:
     """
     Calculates a 0-1 confidence score for recurring transactions by:
@@ -338,7 +330,7 @@ def get_recurring_confidence(transaction: Transaction, transactions: list[Transa
         return 0.0
 
     # 1. Interval Analysis (Allows ±7 day variance)
-    dates = sorted(datetime.strptime(t.date, "%Y-%m-%d") for t in same_merchant)
+    dates = sorted(parse_datetime(t.date) for t in same_merchant)
     intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
     if not intervals:
         return 0.0
@@ -352,10 +344,8 @@ def get_recurring_confidence(transaction: Transaction, transactions: list[Transa
     amount_score = max(0.0, 1 - (amount_var / (min(amounts) + 1e-6)) ** 2)
 
     # 3. Merchant pattern (bonus for keywords)
-    name = transaction.name.lower()
-    merchant_bonus = (
-        0.05 if any(kw in name for kw in ["autopay", "subscription", "prime", "netflix", "spotify"]) else 0.0
-    )
+    name = transaction.name_lower
+    merchant_bonus = 0.05 if MERCHANT_BONUS_KEYWORDS_PATTERN.search(name) else 0.0
 
     # Special case: only two transactions and large differences
     if len(same_merchant) == 2 and (abs(amounts[0] - amounts[1]) > 0.5 * max(amounts) or abs(intervals[0] - 30) > 20):
@@ -442,6 +432,18 @@ def get_is_recurring_charge(
     return len(recent_txns) >= 2
 
 
+APPLE_SERVICES = (
+    "Apple Music",
+    "Apple TV+",
+    "Apple Arcade",
+    "iCloud",
+    "Apple Fitness+",
+    "Apple News+",
+    "Apple One",
+)
+APPLE_SERVICES_PATTERN = re.compile("|".join(re.escape(service.lower()) for service in APPLE_SERVICES))
+
+
 def is_apple_subscription_service(transaction_name: str) -> bool:
     """
     Args:
@@ -449,16 +451,7 @@ def is_apple_subscription_service(transaction_name: str) -> bool:
     Returns:
         True if this is a known Apple subscription service
     """
-    apple_services = {
-        "Apple Music",
-        "Apple TV+",
-        "Apple Arcade",
-        "iCloud",
-        "Apple Fitness+",
-        "Apple News+",
-        "Apple One",
-    }
-    return any(service.lower() in transaction_name.lower() for service in apple_services)
+    return APPLE_SERVICES_PATTERN.search(transaction_name.lower()) is not None
 
 
 def apple_transaction_amount_profile(amount: float) -> float:
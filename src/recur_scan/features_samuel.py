@@ -1,5 +1,6 @@
+import re
 from collections import Counter
-from statistics import StatisticsError, mean, mode
+from statistics import mean, mode
 
 import numpy as np
 
@@ -7,54 +8,63 @@ from recur_scan.transactions import Transaction
 from recur_scan.utils import parse_date
 
 
+def _same_vendor_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> list[Transaction]:
+    """Get the transactions with the same vendor name as transaction, ignoring case and surrounding spaces."""
+    name = transaction.name_lower.strip()
+    # names of the same vendor are usually identical, so compare them as-is before normalizing
+    return [t for t in all_transactions if t.name == transaction.name or t.name_lower.strip() == name]
+
+
+ALWAYS_RECURRING_VENDORS = frozenset([
+    "google storage",
+    "netflix",
+    "hulu",
+    "spotify",
+    "amazon prime",
+    "apple music",
+    "microsoft 365",
+    "dropbox",
+    "adobe creative cloud",
+    "discord nitro",
+    "zoom subscription",
+    "patreon",
+    "new york times",
+    "wall street journal",
+    "github copilot",
+    "notion",
+    "evernote",
+    "expressvpn",
+    "nordvpn",
+    "youtube premium",
+    "linkedin premium",
+    "at&t",
+    "afterpay",
+    "amazon+",
+    "walmart+",
+    "amazonprime",
+    "t-mobile",
+    "duke energy",
+    "adobe",
+    "charter comm",
+    "boostmobile",
+    "verizon",
+    "disney+",
+])
+
+
 def get_is_always_recurring(transaction: Transaction) -> bool:
     """Check if the transaction is always recurring because of the vendor name - check lowercase match."""
-    always_recurring_vendors = {
-        "google storage",
-        "netflix",
-        "hulu",
-        "spotify",
-        "amazon prime",
-        "apple music",
-        "microsoft 365",
-        "dropbox",
-        "adobe creative cloud",
-        "discord nitro",
-        "zoom subscription",
-        "patreon",
-        "new york times",
-        "wall street journal",
-        "github copilot",
-        "notion",
-        "evernote",
-        "expressvpn",
-        "nordvpn",
-        "youtube premium",
-        "linkedin premium",
-        "at&t",
-        "afterpay",
-        "amazon+",
-        "walmart+",
-        "amazonprime",
-        "t-mobile",
-        "duke energy",
-        "adobe",
-        "charter comm",
-        "boostmobile",
-        "verizon",
-        "disney+",
-    }
-    return transaction.name.lower() in always_recurring_vendors
+    return transaction.name_lower in ALWAYS_RECURRING_VENDORS
 
 
 def get_transaction_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get frequency of transactions with same name."""
-    return sum(1 for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip())
+    return len(_same_vendor_transactions(transaction, all_transactions))
 
 
 def get_amount_std_dev(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get standard deviation of amounts for similar transactions."""
-    amounts = [t.amount for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()]
+    amounts = [t.amount for t in _same_vendor_transactions(transaction, all_transactions)]
     if len(amounts) <= 1:
         return 0.0
     try:
@@ -65,7 +75,7 @@ def get_amount_std_dev(transaction: Transaction, all_transactions: list[Transact
 
 def get_median_transaction_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get median amount for similar transactions."""
-    amounts = [t.amount for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()]
+    amounts = [t.amount for t in _same_vendor_transactions(transaction, all_transactions)]
     return float(np.median(amounts)) if amounts else 0.0
 
 
@@ -113,7 +123,7 @@ def get_amount_above_mean(transaction: Transaction, all_transactions: list[Trans
 
 def get_amount_equal_previous(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Check if amount equals previous transaction with same name."""
-    relevant = [t for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()]
+    relevant = _same_vendor_transactions(transaction, all_transactions)
     relevant.sort(key=lambda t: parse_date(t.date))
     for idx, t in enumerate(relevant):
         if t == transaction and idx > 0:
@@ -133,9 +143,7 @@ def get_has_digits_in_name(transaction: Transaction) -> bool:
 
 def get_average_days_between_transactions(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Calculate average days between similar transactions."""
-    dates = sorted([
-        parse_date(t.date) for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()
-    ])
+    dates = sorted([parse_date(t.date) for t in _same_vendor_transactions(transaction, all_transactions)])
     if len(dates) < 2:
         return 0.0
     gaps = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
@@ -147,9 +155,8 @@ def get_transaction_count_last_90_days(transaction: Transaction, all_transaction
     txn_date = parse_date(transaction.date)
     return sum(
         1
-        for t in all_transactions
-        if t.name.lower().strip() == transaction.name.lower().strip()
-        and 0 <= (txn_date - parse_date(t.date)).days <= 90
+        for t in _same_vendor_transactions(transaction, all_transactions)
+        if 0 <= (txn_date - parse_date(t.date)).days <= 90
     )
 
 
@@ -168,16 +175,18 @@ def get_amount_decimal_places(transaction: Transaction) -> int:
     return len(str(transaction.amount).split(".")[-1]) if "." in str(transaction.amount) else 0
 
 
+SUBSCRIPTION_KEYWORDS = ("subscription", "subscr", "renewal", "monthly", "yearly", "annual", "billed")
+SUBSCRIPTION_KEYWORDS_PATTERN = re.compile("|".join(map(re.escape, SUBSCRIPTION_KEYWORDS)))
+
+
 def get_contains_subscription_keywords(transaction: Transaction) -> bool:
     """Check if name contains subscription keywords."""
-    keywords = {"subscription", "subscr", "renewal", "monthly", "yearly", "annual", "billed"}
-    name = transaction.name.lower()
-    return any(kw in name for kw in keywords)
+    return SUBSCRIPTION_KEYWORDS_PATTERN.search(transaction.name_lower) is not None
 
 
 def get_is_fixed_amount(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Check if amount is always the same for similar transactions."""
-    amounts = [t.amount for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()]
+    amounts = [t.amount for t in _same_vendor_transactions(transaction, all_transactions)]
     return len(set(amounts)) == 1 if amounts else False
 
 
@@ -188,31 +197,24 @@ def get_name_length(transaction: Transaction) -> int:
 
 def get_most_common_amount(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get most common amount for similar transactions."""
-    amounts = [t.amount for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()]
+    amounts = [t.amount for t in _same_vendor_transactions(transaction, all_transactions)]
     return mode(amounts) if amounts else 0.0
 
 
 def get_amount_difference_from_mode(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Get absolute difference from mode amount."""
-    try:
-        return abs(transaction.amount - get_most_common_amount(transaction, all_transactions))
-    except (StatisticsError, ValueError):
-        return 0.0
+    return abs(transaction.amount - get_most_common_amount(transaction, all_transactions))
 
 
 def get_transaction_date_is_first(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Check if this is the first transaction with this name."""
-    dates = sorted([
-        parse_date(t.date) for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()
-    ])
+    dates = sorted([parse_date(t.date) for t in _same_vendor_transactions(transaction, all_transactions)])
     return parse_date(transaction.date) == dates[0] if dates else False
 
 
 def get_transaction_date_is_last(transaction: Transaction, all_transactions: list[Transaction]) -> bool:
     """Check if this is the last transaction with this name."""
-    dates = sorted([
-        parse_date(t.date) for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()
-    ])
+    dates = sorted([parse_date(t.date) for t in _same_vendor_transactions(transaction, all_transactions)])
     return parse_date(transaction.date) == dates[-1] if dates else False
 
 
@@ -245,9 +247,7 @@ def get_transaction_name_is_title_case(transaction: Transaction) -> bool:
 
 def get_days_since_last_transaction(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get days since last transaction with same name."""
-    dates = sorted([
-        parse_date(t.date) for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()
-    ])
+    dates = sorted([parse_date(t.date) for t in _same_vendor_transactions(transaction, all_transactions)])
     txn_date = parse_date(transaction.date)
     idx = dates.index(txn_date) if txn_date in dates else -1
     return (txn_date - dates[idx - 1]).days if idx > 0 else -1
@@ -255,9 +255,7 @@ def get_days_since_last_transaction(transaction: Transaction, all_transactions:
 
 def get_days_until_next_transaction(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get days until next transaction with same name."""
-    dates = sorted([
-        parse_date(t.date) for t in all_transactions if t.name.lower().strip() == transaction.name.lower().strip()
-    ])
+    dates = sorted([parse_date(t.date) for t in _same_vendor_transactions(transaction, all_transactions)])
     txn_date = parse_date(transaction.date)
     idx = dates.index(txn_date) if txn_date in dates else -1
     return (dates[idx + 1] - txn_date).days if 0 <= idx < len(dates) - 1 else -1
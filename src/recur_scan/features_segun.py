@@ -1,7 +1,10 @@
 from datetime import datetime
 from statistics import median, stdev
 
+import numpy as np
+
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_transaction_arrays, parse_datetime
 
 
 def get_total_transaction_amount(all_transactions: list[Transaction]) -> float:
@@ -58,7 +61,7 @@ def get_transaction_amount_range(all_transactions: list[Transaction]) -> float:
 
 def get_unique_transaction_amount_count(all_transactions: list[Transaction]) -> int:
     """Get the number of unique transaction amounts"""
-    return len({t.amount for t in all_transactions})
+    return len(get_transaction_arrays(all_transactions).unique_amounts)
 
 
 def get_transaction_amount_frequency(transaction: Transaction, all_transactions: list[Transaction]) -> int:
@@ -68,7 +71,7 @@ def get_transaction_amount_frequency(transaction: Transaction, all_transactions:
 
 def get_transaction_day_of_week(transaction: Transaction) -> int:
     """Get the day of the week for the transaction (0=Monday, 6=Sunday)"""
-    return datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    return parse_datetime(transaction.date).weekday()
 
 
 def get_transaction_time_of_day(transaction: Transaction) -> int:
@@ -93,10 +96,7 @@ def get_average_transaction_interval(all_transactions: list[Transaction]) -> flo
     if len(all_transactions) < 2:
         return 0.0
     intervals = [
-        (
-            datetime.strptime(all_transactions[i].date, "%Y-%m-%d")
-            - datetime.strptime(all_transactions[i - 1].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(all_transactions[i].date) - parse_datetime(all_transactions[i - 1].date)).days
         for i in range(1, len(all_transactions))
     ]
     return sum(intervals) / len(intervals)
@@ -110,10 +110,7 @@ def get_transaction_interval_std(all_transactions: list[Transaction]) -> float:
     if len(all_transactions) < 2:
         return 0.0
     intervals = [
-        (
-            datetime.strptime(all_transactions[i].date, "%Y-%m-%d")
-            - datetime.strptime(all_transactions[i - 1].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(all_transactions[i].date) - parse_datetime(all_transactions[i - 1].date)).days
         for i in range(1, len(all_transactions))
     ]
     if len(intervals) < 2:  # Standard deviation requires at least two data points
@@ -131,12 +128,8 @@ def get_transaction_amount_percentage(transaction: Transaction, all_transactions
 
 def get_transaction_recency(transaction: Transaction, all_transactions: list[Transaction]) -> int:
     """Get the number of days since the last transaction."""
-    transaction_date = datetime.strptime(transaction.date, "%Y-%m-%d")
-    previous_dates = [
-        datetime.strptime(t.date, "%Y-%m-%d")
-        for t in all_transactions
-        if datetime.strptime(t.date, "%Y-%m-%d") < transaction_date
-    ]
+    transaction_date = parse_datetime(transaction.date)
+    previous_dates = [parse_datetime(t.date) for t in all_transactions if parse_datetime(t.date) < transaction_date]
     if not previous_dates:
         return 0
     last_transaction_date = max(previous_dates)
@@ -147,14 +140,14 @@ def get_transaction_frequency_per_month(all_transactions: list[Transaction]) ->
     """Get the average number of transactions per month."""
     if not all_transactions:
         return 0.0
-    transaction_dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions]
+    transaction_dates = [parse_datetime(t.date) for t in all_transactions]
     months = {(date.year, date.month) for date in transaction_dates}
     return len(all_transactions) / len(months)
 
 
 def get_transaction_is_weekend(transaction: Transaction) -> bool:
     """Check if the transaction is on a weekend."""
-    transaction_date = datetime.strptime(transaction.date, "%Y-%m-%d")
+    transaction_date = parse_datetime(transaction.date)
     return transaction_date.weekday() >= 5  # 5 = Saturday, 6 = Sunday
 
 
@@ -172,10 +165,7 @@ def transaction_day_of_month(transaction: Transaction) -> int:
 def is_recurring_day(all_transactions: list[Transaction]) -> bool:
     """Check if a recurring day pattern exists (e.g., 7-day or 30-day intervals)."""
     days = [
-        (
-            datetime.strptime(all_transactions[i].date, "%Y-%m-%d")
-            - datetime.strptime(all_transactions[i - 1].date, "%Y-%m-%d")
-        ).days
+        (parse_datetime(all_transactions[i].date) - parse_datetime(all_transactions[i - 1].date)).days
         for i in range(1, len(all_transactions))
     ]
     return any(abs(day - 7) <= 1 or abs(day - 30) <= 1 for day in days)
@@ -183,10 +173,14 @@ def is_recurring_day(all_transactions: list[Transaction]) -> bool:
 
 def transaction_amount_similarity(transaction: Transaction, all_transactions: list[Transaction]) -> float:
     """Measure how similar the transaction amount is to previous transactions."""
-    amounts = [t.amount for t in all_transactions if t != transaction]
-    if not amounts:
-        return 0.0
-    return min(abs(transaction.amount - amount) for amount in amounts)
+    differences = np.abs(get_transaction_arrays(all_transactions).amounts - transaction.amount)
+    is_same_amount = differences == 0
+    if is_same_amount.any():
+        # another transaction with the same amount makes the minimum 0; copies of the transaction itself do not count
+        if any(t.amount == transaction.amount and t != transaction for t in all_transactions):
+            return 0.0
+        differences = differences[~is_same_amount]
+    return float(differences.min()) if len(differences) else 0.0
 
 
 # (Segun F2)
@@ -199,8 +193,8 @@ def markovian_probability(transaction: Transaction, all_transactions: list[Trans
         return 0.0
 
     # Get the day of the week for each transaction (0=Monday, 6=Sunday)
-    days_of_week = [datetime.strptime(t.date, "%Y-%m-%d").weekday() for t in all_transactions]
-    current_day = datetime.strptime(transaction.date, "%Y-%m-%d").weekday()
+    days_of_week = [parse_datetime(t.date).weekday() for t in all_transactions]
+    current_day = parse_datetime(transaction.date).weekday()
 
     # Build a transition matrix (7x7 for days of the week)
     transition_counts = [[0] * 7 for _ in range(7)]
@@ -223,9 +217,7 @@ def markovian_probability(transaction: Transaction, all_transactions: list[Trans
 
     # Get the previous transaction's day of the week
     previous_dates = [
-        datetime.strptime(t.date, "%Y-%m-%d")
-        for t in all_transactions
-        if datetime.strptime(t.date, "%Y-%m-%d") < datetime.strptime(transaction.date, "%Y-%m-%d")
+        parse_datetime(t.date) for t in all_transactions if parse_datetime(t.date) < parse_datetime(transaction.date)
     ]
     if not previous_dates:
         return 0.0
@@ -244,8 +236,8 @@ def calculate_streak(all_transactions: list[Transaction]) -> int:
         return 0
 
     # Sort transactions by date
-    sorted_transactions = sorted(all_transactions, key=lambda t: datetime.strptime(t.date, "%Y-%m-%d"))
-    dates = [datetime.strptime(t.date, "%Y-%m-%d") for t in sorted_transactions]
+    sorted_transactions = sorted(all_transactions, key=lambda t: parse_datetime(t.date))
+    dates = [parse_datetime(t.date) for t in sorted_transactions]
 
     if not dates:
         return 0
@@ -9,15 +9,16 @@ from numpy import ndarray
 from scipy.stats import mode
 
 from recur_scan.transactions import Transaction
-from recur_scan.utils import parse_date
+from recur_scan.utils import cache_by_list_identity, get_transaction_arrays, get_transaction_stats, parse_date
 
 
 def _precompute_dates_and_intervals(all_transactions: list[Transaction]) -> tuple[list["date"], list[int]]:
     """Precompute sorted dates and intervals to avoid redundant calculations."""
     if len(all_transactions) < 2:
         return [], []
-    dates = sorted([parse_date(t.date) for t in all_transactions])
-    intervals = [(dates[i] - dates[i - 1]).days for i in range(1, len(dates))]
+    arrays = get_transaction_arrays(all_transactions)
+    dates: list[date] = arrays.days.astype("datetime64[D]").tolist()
+    intervals: list[int] = arrays.intervals.tolist()
     return dates, intervals
 
 
@@ -44,12 +45,9 @@ def get_interval_consistency(all_transactions: list[Transaction]) -> float:
 def get_amount_variability(all_transactions: list[Transaction]) -> float:
     if not all_transactions:
         return 0.0
-    amounts = np.fromiter((t.amount for t in all_transactions), float)
-    mean_amount = float(np.mean(amounts))
-    try:
-        return float(np.std(amounts) / mean_amount) if mean_amount > 0 else 0.0
-    except Exception:
-        return 0.0
+    stats = get_transaction_stats(all_transactions)
+    mean_amount = stats.amount_mean
+    return stats.amount_std / mean_amount if mean_amount > 0 else 0.0
 
 
 def get_amount_range(all_transactions: list[Transaction]) -> float:
@@ -63,6 +61,7 @@ def get_transaction_count(all_transactions: list[Transaction]) -> int:
     return len(all_transactions)
 
 
+@cache_by_list_identity()
 def get_interval_mode(all_transactions: list[Transaction]) -> float:
     _, intervals = _precompute_dates_and_intervals(all_transactions)
     if not intervals:
@@ -190,7 +189,7 @@ def get_amount_similarity_ratio(transaction: Transaction, all_transactions: list
         return 0.0
     median_amount = float(np.median(amounts))
     threshold = max(0.1 * median_amount, 0.01)
-    similar = sum(1 for a in amounts if abs(a - transaction.amount) <= threshold)
+    similar = int(np.count_nonzero(np.abs(amounts - transaction.amount) <= threshold))
     return similar / len(amounts) if amounts.size else 0.0
 
 
@@ -227,6 +226,7 @@ def get_merchant_recurrence_score(transaction: Transaction, all_transactions: li
         return 0.0
 
 
+@cache_by_list_identity()
 def get_day_of_month_consistency(all_transactions: list[Transaction]) -> float:
     if len(all_transactions) < 2:
         return 0.0
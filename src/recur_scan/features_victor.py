@@ -1,90 +1,61 @@
-from datetime import datetime
-
 import numpy as np
 
 from recur_scan.transactions import Transaction
+from recur_scan.utils import get_sorted_median, get_transaction_arrays, get_transaction_stats, parse_datetime
+
+COMMON_INTERVALS = np.array([7, 14, 28, 30, 90, 180, 365])
 
 
 def get_avg_days_between(all_transactions: list[Transaction]) -> float:
     """Calculate average days between transactions."""
     if len(all_transactions) < 2:
         return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions])
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-    return float(np.mean(intervals)) if intervals else 0.0
+    return get_transaction_stats(all_transactions).interval_mean
 
 
 def interval_variability(all_transactions: list[Transaction]) -> float:
     """Calculate sample standard deviation of transaction intervals."""
-    if len(all_transactions) < 2:
-        return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions])
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-    if len(intervals) <= 1:
-        return 0.0
-    try:
-        return float(np.std(intervals, ddof=1)) if intervals else 0.0
-    except Exception:
-        return 0.0
+    # 0.0 for fewer than two intervals
+    return get_transaction_stats(all_transactions).interval_sample_std
 
 
 def amount_cluster_count(all_transactions: list[Transaction], tolerance: float = 0.05) -> float:
     """Count clusters of transaction amounts within tolerance."""
     if not all_transactions:
         return 0.0
-    amounts = [t.amount for t in all_transactions]
-    if not amounts:
-        return 0.0
-    clusters = []
-    sorted_amounts = sorted(amounts)
-    current_cluster = [sorted_amounts[0]]
-    for i in range(1, len(sorted_amounts)):
-        if abs(sorted_amounts[i] - current_cluster[-1]) <= current_cluster[-1] * tolerance:
-            current_cluster.append(sorted_amounts[i])
-        else:
-            clusters.append(current_cluster)
-            current_cluster = [sorted_amounts[i]]
-    clusters.append(current_cluster)
-    return len(clusters)
+    # a new cluster starts wherever a sorted amount is not within tolerance of the one before it
+    sorted_amounts = get_transaction_arrays(all_transactions).sorted_amounts
+    previous = sorted_amounts[:-1]
+    in_cluster = np.abs(sorted_amounts[1:] - previous) <= previous * tolerance
+    return 1 + int(np.count_nonzero(~in_cluster))
 
 
 def recurring_day_of_month(all_transactions: list[Transaction]) -> float:
     """Check if transactions occur on consistent days of the month."""
-    days = [datetime.strptime(t.date, "%Y-%m-%d").day for t in all_transactions]
-    if not days:
+    days = get_transaction_arrays(all_transactions).days_of_month
+    if not len(days):
         return 0.0
-    most_common_day = max(set(days), key=days.count)
-    return days.count(most_common_day) / len(days)
+    return int(np.bincount(days).max()) / len(days)
 
 
 def near_interval_ratio(all_transactions: list[Transaction], tolerance: int = 5) -> float:
     """Calculate ratio of intervals near common periods (e.g., weekly, monthly)."""
     if len(all_transactions) < 2:
         return 0.0
-    dates = sorted([datetime.strptime(t.date, "%Y-%m-%d") for t in all_transactions])
-    intervals = [(dates[i + 1] - dates[i]).days for i in range(len(dates) - 1)]
-    if not intervals:
-        return 0.0
-    common_intervals = [7, 14, 28, 30, 90, 180, 365]
-    near_count = 0
-    for interval in intervals:
-        for common in common_intervals:
-            if abs(interval - common) <= tolerance:
-                near_count += 1
-                break  # Count at most one match per interval
-    return near_count / len(intervals)
+    intervals = get_transaction_arrays(all_transactions).intervals
+    # an interval counts once if it is near any of the common periods
+    is_near = (np.abs(intervals[:, np.newaxis] - COMMON_INTERVALS) <= tolerance).any(axis=1)
+    return int(np.count_nonzero(is_near)) / len(intervals)
 
 
 def amount_stability_index(all_transactions: list[Transaction], tolerance: float = 0.1) -> float:
     """Calculate fraction of amounts within tolerance of the median."""
     if not all_transactions:
         return 0.0
-    amounts = [t.amount for t in all_transactions]
-    if not amounts:
-        return 0.0
-    median_amount = np.median(amounts)
-    within_tolerance = len([amount for amount in amounts if abs(amount - median_amount) <= median_amount * tolerance])
-    return within_tolerance / len(amounts)
+    sorted_amounts = get_transaction_arrays(all_transactions).sorted_amounts
+    median_amount = get_sorted_median(sorted_amounts)
+    within_tolerance = int(np.count_nonzero(np.abs(sorted_amounts - median_amount) <= median_amount * tolerance))
+    return within_tolerance / len(sorted_amounts)
 
 
 def merchant_recurrence_score(all_transactions: list[Transaction], merchant_scores: dict[str, float]) -> float:
@@ -103,9 +74,9 @@ def sequence_length(all_transactions: list[Transaction]) -> float:
 def get_count_same_amount_monthly(all_transactions: list[Transaction], current_transaction: Transaction) -> float:
     """Count transactions for the same user, vendor, and amount within 25-35 days."""
     user_id = current_transaction.user_id
-    vendor = current_transaction.name.lower()
+    vendor = current_transaction.name_lower
     amount = current_transaction.amount
-    current_date = datetime.strptime(current_transaction.date, "%Y-%m-%d")
+    current_date = parse_datetime(current_transaction.date)
 
     target_vendors = ["apple", "brigit", "cleo ai", "cleo"]
 
@@ -114,13 +85,8 @@ def get_count_same_amount_monthly(all_transactions: list[Transaction], current_t
 
     count = 0
     for t in all_transactions:
-        if (
-            t.user_id == user_id
-            and t.name.lower() in target_vendors
-            and t.amount == amount
-            and t != current_transaction
-        ):
-            delta = abs((datetime.strptime(t.date, "%Y-%m-%d") - current_date).days)
+        if t.user_id == user_id and t.name_lower in target_vendors and t.amount == amount and t != current_transaction:
+            delta = abs((parse_datetime(t.date) - current_date).days)
             if 25 <= delta <= 35:
                 count += 1
     return float(count)
@@ -128,7 +94,7 @@ def get_count_same_amount_monthly(all_transactions: list[Transaction], current_t
 
 def is_small_fixed_amount(current_transaction: Transaction) -> float:
     """Check if the transaction amount is small (≤$10) and subscription-like."""
-    vendor = current_transaction.name.lower()
+    vendor = current_transaction.name_lower
     amount = current_transaction.amount
 
     target_vendors = ["apple", "brigit", "cleo ai", "cleo"]
@@ -144,9 +110,9 @@ def is_small_fixed_amount(current_transaction: Transaction) -> float:
 def get_days_since_last_same_amount(all_transactions: list[Transaction], current_transaction: Transaction) -> float:
     """Calculate days since the last transaction for the same user, vendor, and amount."""
     user_id = current_transaction.user_id
-    vendor = current_transaction.name.lower()
+    vendor = current_transaction.name_lower
     amount = current_transaction.amount
-    current_date = datetime.strptime(current_transaction.date, "%Y-%m-%d")
+    current_date = parse_datetime(current_transaction.date)
 
     target_vendors = ["apple", "brigit", "cleo ai", "cleo"]
 
@@ -157,12 +123,12 @@ def get_days_since_last_same_amount(all_transactions: list[Transaction], current
     for t in all_transactions:
         if (
             t.user_id == user_id
-            and t.name.lower() in target_vendors
+            and t.name_lower in target_vendors
             and t.amount == amount
             and t != current_transaction
-            and datetime.strptime(t.date, "%Y-%m-%d") < current_date
+            and parse_datetime(t.date) < current_date
         ):
-            days = (current_date - datetime.strptime(t.date, "%Y-%m-%d")).days
+            days = (current_date - parse_datetime(t.date)).days
             if days < min_days:
                 min_days = days
     return float(min_days)
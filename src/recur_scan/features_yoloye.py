@@ -2,11 +2,12 @@ from datetime import datetime
 
 from recur_scan.features_dallanq import get_n_transactions_days_apart
 from recur_scan.transactions import Transaction
+from recur_scan.utils import parse_datetime
 
 
 def _get_days(date: str) -> int:
     """Convert a date string (YYYY-MM-DD) into days since epoch (Jan 1, 1970)."""
-    return (datetime.strptime(date, "%Y-%m-%d") - datetime(1970, 1, 1)).days
+    return (parse_datetime(date) - datetime(1970, 1, 1)).days
 
 
 def get_n_transactions_delayed(
@@ -1,7 +1,9 @@
 import csv
 import os
+import sys
 from collections import defaultdict
 from dataclasses import asdict, dataclass, fields
+from functools import cached_property
 
 from loguru import logger
 
@@ -14,6 +16,11 @@ class Transaction:
     date: str  # date of the transaction
     amount: float  # amount of the transaction
 
+    @cached_property
+    def name_lower(self) -> str:
+        """Lowercase vendor name, computed on first use and then kept on the instance."""
+        return self.name.lower()
+
 
 # Create a type alias for grouped transactions that maps a tuple of (user_id, name) to a list of transactions
 type GroupedTransactions = dict[tuple[str, str], list[Transaction]]
@@ -28,6 +35,8 @@ def _parse_transactions(
     transactions = []
     labels = []
 
+    # user ids, vendor names and dates repeat on many rows, so intern them to keep one copy of each
+    # (which also lets comparisons between them succeed on identity)
     with open(path, newline="") as f:
         reader = csv.DictReader(f)
         for ix, row in enumerate(reader):
@@ -35,9 +44,9 @@ def _parse_transactions(
                 transactions.append(
                     Transaction(
                         id=ix if set_id else 0,
-                        user_id=row["user_id"],
-                        name=row["name"],
-                        date=row["date"],
+                        user_id=sys.intern(row["user_id"]),
+                        name=sys.intern(row["name"]),
+                        date=sys.intern(row["date"]),
                         amount=float(row["amount"]),
                     )
                 )
@@ -167,8 +176,8 @@ def read_test_transactions(path: str) -> list[Transaction]:
                     Transaction(
                         id=ix,
                         user_id=user_id,
-                        name=row["DESTINATION"],
-                        date=row["TRANSACTED_AT"],
+                        name=sys.intern(row["DESTINATION"]),
+                        date=sys.intern(row["TRANSACTED_AT"]),
                         amount=amount_dollars,
                     )
                 )
@@ -213,9 +222,9 @@ def read_earnin_test_transactions(path: str) -> list[Transaction]:
                 transactions.append(
                     Transaction(
                         id=ix,
-                        user_id=row["userid"],
-                        name=row["memo"] or row["description"],
-                        date=row["postedon"].split("T")[0],  # convert YYYY-MM-DDTJJ:MM:SSZ to YYYY-MM-DD
+                        user_id=sys.intern(row["userid"]),
+                        name=sys.intern(row["memo"] or row["description"]),
+                        date=sys.intern(row["postedon"].split("T")[0]),  # convert YYYY-MM-DDTJJ:MM:SSZ to YYYY-MM-DD
                         amount=float(row["amount"]),
                     )
                 )
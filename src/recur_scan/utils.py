@@ -1,5 +1,14 @@
+import re
+from collections.abc import Callable
 from datetime import date, datetime
-from functools import lru_cache
+from functools import lru_cache, wraps
+from typing import NamedTuple, TypeVar
+
+import numpy as np
+
+from recur_scan.transactions import Transaction
+
+R = TypeVar("R")
 
 
 @lru_cache(maxsize=1024)
@@ -8,6 +17,294 @@ def parse_date(date_str: str) -> date:
     return datetime.strptime(date_str, "%Y-%m-%d").date()
 
 
+@lru_cache(maxsize=4096)
+def parse_datetime(date_str: str) -> datetime:
+    """
+    Parse a date string into a datetime object (at midnight), like datetime.strptime(date_str, "%Y-%m-%d").
+
+    Feature functions parse the dates of every transaction in the list once per transaction, so the
+    result is cached per date string and each distinct date is parsed only once. datetime objects are
+    immutable, so the cached object can be shared.
+    """
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+
 def get_day(date: str) -> int:
     """Get the day of the month from a transaction date."""
     return int(date.split("-")[2])
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def get_epoch_day(date_str: str) -> int:
+    """
+    Get the number of days since 1970-01-01 for a date string, matching TransactionArrays.days.
+
+    The result is cached per date string, so each distinct date is converted to a day number only once.
+    """
+    return parse_date(date_str).toordinal() - _EPOCH_ORDINAL
+
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=4096)
+def get_name_words(name: str) -> frozenset[str]:
+    """
+    Get the lowercase words (runs of letters, digits and underscores) in a vendor name.
+
+    A single-word keyword matches the name as a whole word (like a \\b-delimited regex) exactly when
+    it is one of these words, so a list of such keywords can be checked with one set lookup instead of
+    an alternation regex: not KEYWORDS.isdisjoint(get_name_words(name)). The result is cached per name.
+
+    Args:
+        name: Vendor name
+
+    Returns:
+        Set of lowercase words in the name
+    """
+    return frozenset(_WORD_PATTERN.findall(name.lower()))
+
+
+class TransactionArrays(NamedTuple):
+    """Column-oriented (NumPy) view of a list of transactions, sorted by date."""
+
+    days: np.ndarray  # days since 1970-01-01 (int32)
+    amounts: np.ndarray  # transaction amounts (float64)
+    names: np.ndarray  # vendor names (object)
+    days_of_month: np.ndarray  # day of the month, 1-31 (int32)
+    months: np.ndarray  # months since 1970-01 (int32), so the calendar month is months % 12 + 1
+    intervals: np.ndarray  # days between consecutive transactions (int32), one element shorter than days
+    sorted_amounts: np.ndarray  # amounts in ascending order (float64)
+    sorted_intervals: np.ndarray  # intervals in ascending order (int32)
+    unique_amounts: np.ndarray  # distinct amounts, sorted (float64)
+    amount_counts: np.ndarray  # number of transactions with each of unique_amounts (int64)
+
+
+class TransactionStats(NamedTuple):
+    """Summary statistics of the amounts and intervals of a list of transactions (0.0 when undefined)."""
+
+    amount_mean: float
+    amount_median: float
+    amount_std: float  # population standard deviation (ddof=0)
+    amount_sample_std: float  # sample standard deviation (ddof=1)
+    interval_mean: float
+    interval_median: float
+    interval_std: float  # population standard deviation (ddof=0)
+    interval_sample_std: float  # sample standard deviation (ddof=1)
+
+
+def cache_by_list_identity(
+    maxsize: int = 256,
+) -> Callable[[Callable[[list[Transaction]], R]], Callable[[list[Transaction]], R]]:
+    """
+    Cache a function of a list of transactions on the identity of the list.
+
+    Feature functions are called once per transaction with the same list of transactions,
+    so anything that depends only on the list can be computed once per list. The cache keeps
+    a reference to the list, so its id cannot be reused while the entry is alive, and a change
+    in length invalidates the entry. The oldest entry is evicted once maxsize is reached.
+
+    Args:
+        maxsize: Maximum number of lists to keep results for
+
+    Returns:
+        Decorator for a function that takes the list as its only argument
+    """
+
+    def _decorator(func: Callable[[list[Transaction]], R]) -> Callable[[list[Transaction]], R]:
+        cache: dict[int, tuple[list[Transaction], int, R]] = {}
+
+        @wraps(func)
+        def _wrapper(transactions: list[Transaction]) -> R:
+            key = id(transactions)
+            cached = cache.get(key)
+            if cached is not None and cached[0] is transactions and cached[1] == len(transactions):
+                return cached[2]
+
+            result = func(transactions)
+            if len(cache) >= maxsize:
+                # evict the oldest entry (dicts preserve insertion order)
+                del cache[next(iter(cache))]
+            cache[key] = (transactions, len(transactions), result)
+            return result
+
+        return _wrapper
+
+    return _decorator
+
+
+@cache_by_list_identity()
+def get_transaction_arrays(transactions: list[Transaction]) -> TransactionArrays:
+    """
+    Get the date-sorted NumPy arrays for a list of transactions.
+
+    The result is cached on the identity of the list (see cache_by_list_identity).
+    Re-ordering the list in place is safe because the arrays are always sorted by date.
+    The returned arrays are read-only.
+
+    Args:
+        transactions: List of transactions
+
+    Returns:
+        TransactionArrays with one element per transaction, sorted by date
+    """
+    n = len(transactions)
+    # parse all the dates in one vectorized call instead of one strptime per transaction
+    dates = np.array([t.date for t in transactions], dtype="datetime64[D]")
+    order = np.argsort(dates, kind="stable")
+    dates = dates[order]
+    days = dates.astype(np.int32)
+    months = dates.astype("datetime64[M]")
+    amounts = np.fromiter((t.amount for t in transactions), dtype=np.float64, count=n)[order]
+    intervals = np.diff(days)
+    sorted_amounts = np.sort(amounts)
+    # distinct amounts and their counts, taken from the sorted amounts (same result as np.unique)
+    is_first = np.empty(n, dtype=bool)
+    is_first[:1] = True
+    is_first[1:] = sorted_amounts[1:] != sorted_amounts[:-1]
+    starts = np.flatnonzero(is_first)
+    unique_amounts = sorted_amounts[starts]
+    amount_counts = np.diff(np.append(starts, n))
+    arrays = TransactionArrays(
+        days=days,
+        amounts=amounts,
+        names=np.array([t.name for t in transactions], dtype=object)[order],
+        days_of_month=(dates - months).astype(np.int32) + 1,
+        months=months.astype(np.int32),
+        intervals=intervals,
+        sorted_amounts=sorted_amounts,
+        sorted_intervals=np.sort(intervals),
+        unique_amounts=unique_amounts,
+        amount_counts=amount_counts,
+    )
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+def _summarize(values: np.ndarray, sorted_values: np.ndarray) -> tuple[float, float, float, float]:
+    """Mean, median, population std and sample std of values, with 0.0 for the ones that are undefined."""
+    if not len(values):
+        return 0.0, 0.0, 0.0, 0.0
+    mean = float(values.mean())
+    std = float(values.std())
+    sample_std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+    return mean, get_sorted_median(sorted_values), std, sample_std
+
+
+@cache_by_list_identity()
+def get_transaction_stats(transactions: list[Transaction]) -> TransactionStats:
+    """
+    Get summary statistics of the amounts and intervals of a list of transactions.
+
+    The statistics are computed from the cached arrays (see get_transaction_arrays) and cached on
+    the identity of the list too, so features that need the same mean, median or standard deviation share it.
+
+    Args:
+        transactions: List of transactions
+
+    Returns:
+        TransactionStats for the amounts and the intervals (in days) between consecutive transactions
+    """
+    arrays = get_transaction_arrays(transactions)
+    return TransactionStats(
+        *_summarize(arrays.amounts, arrays.sorted_amounts),
+        *_summarize(arrays.intervals, arrays.sorted_intervals),
+    )
+
+
+def get_amount_count(transactions: list[Transaction], amount: float) -> int:
+    """Get the number of transactions with exactly the given amount, using the cached amount counts."""
+    arrays = get_transaction_arrays(transactions)
+    i = int(np.searchsorted(arrays.unique_amounts, amount))
+    if i < len(arrays.unique_amounts) and arrays.unique_amounts[i] == amount:
+        return int(arrays.amount_counts[i])
+    return 0
+
+
+def count_days_apart(sorted_days: np.ndarray, target: int, n_days_apart: int, n_days_off: int) -> int:
+    """
+    Count the days that are within n_days_off of being n_days_apart before or after target.
+
+    The days are sorted, so the matching days before and after target are two ranges of days, each
+    counted with a pair of binary searches (days are integers, so the end of a range [low, high] is
+    the start of high + 1). A day in both ranges, such as target itself when n_days_off >= n_days_apart,
+    is counted once.
+
+    Args:
+        sorted_days: Days (e.g. days since 1970-01-01) sorted in ascending order
+        target: Day to measure from
+        n_days_apart: Number of days apart to look for
+        n_days_off: Number of days the distance may differ from n_days_apart
+
+    Returns:
+        Number of days whose distance from target is within n_days_off of n_days_apart
+    """
+    bounds = sorted_days.searchsorted(
+        np.array([
+            target - n_days_apart - n_days_off,
+            min(target, target - n_days_apart + n_days_off + 1),
+            max(target, target + n_days_apart - n_days_off),
+            target + n_days_apart + n_days_off + 1,
+        ])
+    )
+    return int(max(bounds[1] - bounds[0], 0) + max(bounds[3] - bounds[2], 0))
+
+
+def get_sorted_percentile(sorted_values: np.ndarray, q: float, method: str = "linear") -> float:
+    """
+    Get the q-th percentile of values that are already sorted, without another sort or partition.
+
+    Gives the same result as np.percentile(sorted_values, q, method=method) for the "linear"
+    and "midpoint" methods.
+
+    Args:
+        sorted_values: Non-empty array sorted in ascending order
+        q: Percentile between 0 and 100
+        method: "linear" or "midpoint"
+
+    Returns:
+        The percentile as a float
+    """
+    index = q / 100 * (len(sorted_values) - 1)
+    lower = int(index)
+    gamma = index - lower
+    if method == "midpoint" and gamma > 0:
+        gamma = 0.5
+    elif method not in ("linear", "midpoint"):
+        raise ValueError(f"Unsupported percentile method: {method}")
+    a = float(sorted_values[lower])
+    b = float(sorted_values[min(lower + 1, len(sorted_values) - 1)])
+    # interpolate the way np.percentile does, from whichever end is closer
+    if gamma >= 0.5:
+        return b - (b - a) * (1 - gamma)
+    return a + (b - a) * gamma
+
+
+def get_linear_slope(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Get the least-squares slope of y over x in closed form, the same fit as np.polyfit(x, y, 1)[0].
+
+    Args:
+        x: Non-empty array of x values
+        y: Array of y values, the same length as x
+
+    Returns:
+        The slope as a float, or 0.0 when x has fewer than two distinct values
+    """
+    dx = x - x.mean()
+    denominator = float(np.dot(dx, dx))
+    if denominator == 0:
+        return 0.0
+    return float(np.dot(dx, y - y.mean())) / denominator
+
+
+def get_sorted_median(sorted_values: np.ndarray) -> float:
+    """Get the median of non-empty values that are already sorted, matching np.median."""
+    mid = len(sorted_values) // 2
+    if len(sorted_values) % 2:
+        return float(sorted_values[mid])
+    return (float(sorted_values[mid - 1]) + float(sorted_values[mid])) / 2
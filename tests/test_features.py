@@ -0,0 +1,30 @@
+import pytest
+
+from recur_scan.features import get_features, get_features_batch
+from recur_scan.transactions import Transaction
+
+
+def test_get_features_batch() -> None:
+    """Test that get_features_batch matches calling get_features for each transaction in turn."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="Netflix", amount=15.99, date="2024-03-01"),
+        Transaction(id=2, user_id="user1", name="Netflix", amount=15.99, date="2024-01-01"),
+        Transaction(id=3, user_id="user1", name="Netflix", amount=15.99, date="2024-02-01"),
+        Transaction(id=4, user_id="user1", name="Netflix", amount=17.99, date="2024-04-02"),
+    ]
+    group = list(transactions)
+    expected = [get_features(transaction, group) for transaction in transactions]
+
+    batch_features = get_features_batch(list(transactions))
+
+    assert len(batch_features) == len(transactions)
+    for features, expected_features in zip(batch_features, expected, strict=True):
+        assert features == pytest.approx(expected_features, nan_ok=True)
+
+    # only a subset of the group, still evaluated against the whole group
+    subset = [transactions[3], transactions[1]]
+    subset_features = get_features_batch(list(transactions), subset)
+
+    assert len(subset_features) == len(subset)
+    assert subset_features[0] == pytest.approx(expected[3], nan_ok=True)
+    assert subset_features[1] == pytest.approx(expected[1], nan_ok=True)
@@ -556,10 +556,10 @@ def test_get_amount_frequency_score() -> None:
 def test_calculate_day_of_month_consistency() -> None:
     """Test that calculate_day_of_month_consistency correctly scores day consistency."""
     dates = [
-        datetime.datetime.strptime("2023-01-15", "%Y-%m-%d"),
-        datetime.datetime.strptime("2023-02-15", "%Y-%m-%d"),
-        datetime.datetime.strptime("2023-03-16", "%Y-%m-%d"),  # +1 day
-        datetime.datetime.strptime("2023-04-14", "%Y-%m-%d"),  # -1 day
+        datetime.datetime.fromisoformat("2023-01-15"),
+        datetime.datetime.fromisoformat("2023-02-15"),
+        datetime.datetime.fromisoformat("2023-03-16"),  # +1 day
+        datetime.datetime.fromisoformat("2023-04-14"),  # -1 day
     ]
 
     consistency = calculate_day_of_month_consistency(dates)
@@ -32,6 +32,9 @@ def test_get_n_transactions_same_amount() -> None:
     ]
     assert get_n_transactions_same_amount(transactions[0], transactions) == 2
     assert get_n_transactions_same_amount(transactions[2], transactions) == 1
+    # only the transaction's user's transactions are counted
+    other_user = Transaction(id=5, user_id="user2", name="name1", amount=100, date="2024-01-04")
+    assert get_n_transactions_same_amount(other_user, [*transactions, other_user]) == 1
 
 
 # def test_get_days_between_std():
@@ -78,7 +78,7 @@ from recur_scan.transactions import Transaction
 # Helper function for parsing date
 def parse_date(date_str: str) -> date:
     """Parse a date string strictly in 'YYYY-MM-DD' format."""
-    return datetime.strptime(date_str, "%Y-%m-%d").date()
+    return date.fromisoformat(date_str)
 
 
 # Test function for is_albert_recurring_subscription
@@ -620,6 +620,10 @@ def test_proportional_timing_deviation():
     expected_value3 = max(0.0, 1 - (abs(26 - 10) / 10))  # Median interval = 10
     assert isclose(deviation3, expected_value3, rel_tol=1e-2), f"Expected {expected_value3}, got {deviation3}"
 
+    # The deviation is measured from the latest transaction even when the list is not in date order
+    deviation4 = proportional_timing_deviation(tx3, list(reversed(transactions)))
+    assert isclose(deviation4, expected_value3, rel_tol=1e-2), f"Expected {expected_value3}, got {deviation4}"
+
 
 def test_detect_common_interval():
     assert detect_common_interval([30, 60, 90]) is True
@@ -738,6 +742,14 @@ def test_amount_z_score():
     z_score2 = amount_z_score(tx2, transactions2)
     assert z_score2 == 0.0, f"Expected 0.0, got {z_score2}"
 
+    # Test with identical non-integer amounts (no variation, should return 0.0)
+    transactions3 = [
+        Transaction(id=i, user_id="u1", name="VendorC", date=f"2024-03-{i:02d}", amount=188.11) for i in range(1, 8)
+    ]
+    tx3 = Transaction(id=8, user_id="u1", name="VendorC", date="2024-03-08", amount=190.0)
+    z_score3 = amount_z_score(tx3, transactions3)
+    assert z_score3 == 0.0, f"Expected 0.0, got {z_score3}"
+
 
 def test_amount_stability_score():
     # Test with stable amounts (low variance)
@@ -756,6 +768,13 @@ def test_amount_stability_score():
     stability2 = amount_stability_score(transactions2)
     assert stability2 == 0.0, f"Expected 0.0, got {stability2}"
 
+    # Test with identical non-integer amounts (no variation, should return 1.0)
+    transactions3 = [
+        Transaction(id=i, user_id="u1", name="VendorC", date=f"2024-03-{i:02d}", amount=188.11) for i in range(1, 8)
+    ]
+    stability3 = amount_stability_score(transactions3)
+    assert stability3 == 1.0, f"Expected 1.0, got {stability3}"
+
 
 def test_recurrence_interval_variance():
     """
@@ -825,7 +844,7 @@ def test_get_days_since_last_transaction():
 
 def _parse_date(date_str: str) -> date:
     """Convert a date string to a datetime.date object."""
-    return datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
+    return datetime.date.fromisoformat(date_str)
 
 
 # --- Test vendor_recurrence_trend ---
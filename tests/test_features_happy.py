@@ -216,7 +216,7 @@ def test_subscription_keywords():
 def transactions():
     # Helper function to create date string
     def create_date(base_date, days_to_add):
-        new_date = datetime.strptime(base_date, "%Y-%m-%d") + timedelta(days=days_to_add)
+        new_date = datetime.fromisoformat(base_date) + timedelta(days=days_to_add)
         return new_date.strftime("%Y-%m-%d")
 
     return [
@@ -254,7 +254,7 @@ def transactions():
 @pytest.fixture(autouse=True)
 def mock_parse_date(monkeypatch):
     def mock_function(date_str):
-        return datetime.strptime(date_str, "%Y-%m-%d")
+        return datetime.fromisoformat(date_str)
 
     monkeypatch.setattr("src.recur_scan.features_happy.parse_date", mock_function)
 
@@ -801,6 +801,12 @@ def test_get_amount_zscore():
     assert abs(get_amount_zscore(txns[2], txns) - 1.0) < 0.01
 
 
+def test_get_amount_zscore_constant_amounts():
+    txns = [create_transaction(i, "user1", "StoreA", f"2024-01-{i:02d}", 188.11) for i in range(1, 8)]
+    assert get_amount_zscore(txns[0], txns) == 0.0
+    assert not is_amount_outlier(txns[0], txns)
+
+
 def test_is_amount_outlier():
     txns = [
         create_transaction(1, "user1", "StoreA", "2024-01-01", 10.0),
@@ -859,6 +865,11 @@ def test_get_amount_coefficient_of_variation():
     assert abs(get_amount_coefficient_of_variation(txns[1], txns) - 0.47) < 0.01
 
 
+def test_get_amount_coefficient_of_variation_constant_amounts():
+    txns = [create_transaction(i, "user1", "StoreA", f"2024-01-{i:02d}", 188.11) for i in range(1, 8)]
+    assert get_amount_coefficient_of_variation(txns[0], txns) == 0.0
+
+
 def test_get_unique_merchants_count():
     txns = [
         create_transaction(1, "user1", "StoreA", "2024-01-01", 10.0),
@@ -77,6 +77,9 @@ def test_get_n_transactions_days_apart() -> None:
     ]
     assert get_n_transactions_days_apart(transactions[0], transactions, 30, 0) == 1
     assert get_n_transactions_days_apart(transactions[0], transactions, 30, 1) == 2
+    # transactions before the current one count too, and the current one counts when within n_days_off of it
+    assert get_n_transactions_days_apart(transactions[2], transactions, 30, 1) == 1
+    assert get_n_transactions_days_apart(transactions[2], transactions, 1, 1) == 2
 
 
 def test_get_pct_transactions_days_apart() -> None:
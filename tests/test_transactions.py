@@ -0,0 +1,16 @@
+from dataclasses import asdict
+
+from recur_scan.transactions import Transaction
+
+
+def test_name_lower():
+    """Test that name_lower is the lowercase name and is not a dataclass field."""
+    transaction = Transaction(id=1, user_id="user1", name="Duke Energy", amount=50.0, date="2024-01-01")
+    assert transaction.name_lower == "duke energy"
+    # the value is computed once and kept on the instance
+    assert transaction.name_lower is transaction.name_lower
+    # it does not change the fields, equality or hash of the transaction
+    assert "name_lower" not in asdict(transaction)
+    other = Transaction(id=1, user_id="user1", name="Duke Energy", amount=50.0, date="2024-01-01")
+    assert transaction == other
+    assert hash(transaction) == hash(other)
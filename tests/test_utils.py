@@ -1,8 +1,24 @@
-from datetime import date
+from datetime import date, datetime
 
+import numpy as np
 import pytest
 
-from recur_scan.utils import get_day, parse_date
+from recur_scan.transactions import Transaction
+from recur_scan.utils import (
+    cache_by_list_identity,
+    count_days_apart,
+    get_amount_count,
+    get_day,
+    get_epoch_day,
+    get_linear_slope,
+    get_name_words,
+    get_sorted_median,
+    get_sorted_percentile,
+    get_transaction_arrays,
+    get_transaction_stats,
+    parse_date,
+    parse_datetime,
+)
 
 
 def test_parse_date():
@@ -15,8 +31,200 @@ def test_parse_date():
         parse_date("01/01/2024")
 
 
+def test_parse_datetime():
+    """Test parse_datetime function."""
+    assert parse_datetime("2024-01-01") == datetime(2024, 1, 1)
+    # the parsed value is cached per date string
+    assert parse_datetime("2024-01-01") is parse_datetime("2024-01-01")
+
+    with pytest.raises(ValueError, match=r"does not match format"):
+        parse_datetime("01/01/2024")
+
+
 def test_get_day():
     """Test get_day function."""
     assert get_day("2024-01-01") == 1
     assert get_day("2024-01-02") == 2
     assert get_day("2024-01-03") == 3
+
+
+def test_get_epoch_day():
+    """Test get_epoch_day function."""
+    assert get_epoch_day("1970-01-01") == 0
+    assert get_epoch_day("1970-01-02") == 1
+    assert get_epoch_day("2024-01-31") - get_epoch_day("2024-01-01") == 30
+    transactions = [Transaction(id=1, user_id="user1", name="name1", amount=20.0, date="2024-01-31")]
+    assert get_epoch_day("2024-01-31") == get_transaction_arrays(transactions).days[0]
+
+
+def test_get_name_words():
+    """Test get_name_words function."""
+    assert get_name_words("Planet Fitness") == {"planet", "fitness"}
+    assert get_name_words("AT&T Auto-Pay") == {"at", "t", "auto", "pay"}
+    assert get_name_words("sub_plan2") == {"sub_plan2"}
+    assert get_name_words("") == frozenset()
+    # a keyword only matches whole words
+    assert "sub" not in get_name_words("Subway")
+
+
+def test_cache_by_list_identity():
+    """Test cache_by_list_identity decorator."""
+    calls = []
+
+    @cache_by_list_identity(maxsize=2)
+    def total_amount(transactions: list[Transaction]) -> float:
+        calls.append(len(transactions))
+        return sum(t.amount for t in transactions)
+
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=10.0, date="2024-01-01"),
+        Transaction(id=2, user_id="user1", name="name1", amount=20.0, date="2024-01-02"),
+    ]
+    assert total_amount(transactions) == 30.0
+    assert total_amount(transactions) == 30.0
+    assert calls == [2]
+    # an equal but different list is computed again
+    assert total_amount(list(transactions)) == 30.0
+    assert calls == [2, 2]
+    # a change in length invalidates the entry
+    transactions.append(Transaction(id=3, user_id="user1", name="name1", amount=5.0, date="2024-01-03"))
+    assert total_amount(transactions) == 35.0
+    assert calls == [2, 2, 3]
+    # the oldest entry is evicted once maxsize is reached
+    others = [transactions[:1], transactions[:2]]
+    for other in others:
+        total_amount(other)
+    assert total_amount(transactions) == 35.0
+    assert calls == [2, 2, 3, 1, 2, 3]
+
+
+def test_get_transaction_arrays():
+    """Test get_transaction_arrays function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=20.0, date="2024-01-31"),
+        Transaction(id=2, user_id="user1", name="name2", amount=10.0, date="2024-01-01"),
+        Transaction(id=3, user_id="user1", name="name1", amount=30.0, date="2024-02-15"),
+    ]
+    arrays = get_transaction_arrays(transactions)
+    # arrays are sorted by date
+    assert np.diff(arrays.days).tolist() == [30, 15]
+    assert arrays.intervals.tolist() == [30, 15]
+    assert arrays.amounts.tolist() == [10.0, 20.0, 30.0]
+    assert arrays.names.tolist() == ["name2", "name1", "name1"]
+    assert arrays.days_of_month.tolist() == [1, 31, 15]
+    assert (arrays.months % 12 + 1).tolist() == [1, 1, 2]
+    assert arrays.unique_amounts.tolist() == [10.0, 20.0, 30.0]
+    assert arrays.amount_counts.tolist() == [1, 1, 1]
+    assert arrays.sorted_amounts.tolist() == [10.0, 20.0, 30.0]
+    assert arrays.sorted_intervals.tolist() == [15, 30]
+    assert arrays.months[0] == (2024 - 1970) * 12
+    # arrays are cached on the identity of the list
+    assert get_transaction_arrays(transactions) is arrays
+    # sorting the list in place does not invalidate the arrays
+    transactions.sort(key=lambda t: t.amount)
+    assert get_transaction_arrays(transactions) is arrays
+    # changing the length of the list rebuilds them
+    transactions.append(Transaction(id=4, user_id="user1", name="name1", amount=40.0, date="2024-03-15"))
+    assert get_transaction_arrays(transactions).amounts.tolist() == [10.0, 20.0, 30.0, 40.0]
+    # an empty list gives empty arrays
+    assert len(get_transaction_arrays([]).days) == 0
+    assert len(get_transaction_arrays([]).intervals) == 0
+
+
+def test_get_amount_count():
+    """Test get_amount_count function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=9.99, date="2024-01-01"),
+        Transaction(id=2, user_id="user1", name="name1", amount=15.0, date="2024-01-02"),
+        Transaction(id=3, user_id="user1", name="name1", amount=9.99, date="2024-01-03"),
+    ]
+    assert get_amount_count(transactions, 9.99) == 2
+    assert get_amount_count(transactions, 15.0) == 1
+    assert get_amount_count(transactions, 20.0) == 0
+    assert get_amount_count(transactions, 1.0) == 0
+    assert get_amount_count([], 9.99) == 0
+
+
+def test_count_days_apart():
+    """Test count_days_apart function."""
+    days = np.array([0, 7, 13, 14, 15, 21, 28, 30], dtype=np.int32)
+    # exactly 14 days from day 14: day 0 before and day 28 after
+    assert count_days_apart(days, 14, 14, 0) == 2
+    # within a day of 14 days from day 28: days 13, 14 and 15 before (day 42 after is missing)
+    assert count_days_apart(days, 28, 14, 1) == 3
+    # within 2 days of 7 apart from day 14: 7 before, 21 after
+    assert count_days_apart(days, 14, 7, 2) == 2
+    # a range that covers the target day counts it (and its neighbours) once
+    assert count_days_apart(days, 14, 1, 1) == 3
+    assert count_days_apart(np.array([], dtype=np.int32), 14, 7, 1) == 0
+    # same result as checking every day
+    for target in range(-5, 40):
+        for n_days_apart in range(20):
+            for n_days_off in range(4):
+                expected = sum(abs(abs(int(day) - target) - n_days_apart) <= n_days_off for day in days)
+                assert count_days_apart(days, target, n_days_apart, n_days_off) == expected
+
+
+def test_get_transaction_stats():
+    """Test get_transaction_stats function."""
+    transactions = [
+        Transaction(id=1, user_id="user1", name="name1", amount=20.0, date="2024-01-31"),
+        Transaction(id=2, user_id="user1", name="name1", amount=10.0, date="2024-01-01"),
+        Transaction(id=3, user_id="user1", name="name1", amount=30.0, date="2024-02-15"),
+        Transaction(id=4, user_id="user1", name="name1", amount=60.0, date="2024-02-19"),
+    ]
+    stats = get_transaction_stats(transactions)
+    amounts = [10.0, 20.0, 30.0, 60.0]
+    intervals = [30, 15, 4]
+    assert stats.amount_mean == pytest.approx(30.0)
+    assert stats.amount_median == pytest.approx(25.0)
+    assert stats.amount_std == pytest.approx(np.std(amounts))
+    assert stats.amount_sample_std == pytest.approx(np.std(amounts, ddof=1))
+    assert stats.interval_mean == pytest.approx(np.mean(intervals))
+    assert stats.interval_median == pytest.approx(15.0)
+    assert stats.interval_std == pytest.approx(np.std(intervals))
+    assert stats.interval_sample_std == pytest.approx(np.std(intervals, ddof=1))
+    # statistics are cached with the arrays
+    assert get_transaction_stats(transactions) is stats
+    # and recomputed when the list changes length
+    transactions.pop()
+    assert get_transaction_stats(transactions).amount_median == pytest.approx(20.0)
+    # undefined statistics are 0.0
+    single = get_transaction_stats(transactions[:1])
+    assert single.amount_mean == pytest.approx(20.0)
+    assert single.amount_sample_std == 0.0
+    assert single.interval_mean == 0.0
+    assert single.interval_sample_std == 0.0
+    assert get_transaction_stats([]).amount_mean == 0.0
+
+
+def test_get_sorted_percentile():
+    """Test get_sorted_percentile function."""
+    values = np.array([1.0, 2.0, 4.0, 8.0, 16.0])
+    for q in (0, 5, 25, 50, 60, 75, 95, 100):
+        assert get_sorted_percentile(values, q) == pytest.approx(np.percentile(values, q))
+        assert get_sorted_percentile(values, q, method="midpoint") == pytest.approx(
+            np.percentile(values, q, method="midpoint")
+        )
+    assert get_sorted_percentile(values, 60) == pytest.approx(5.6)
+    assert get_sorted_percentile(values, 60, method="midpoint") == 6.0
+    assert get_sorted_percentile(np.array([7]), 25) == 7.0
+    with pytest.raises(ValueError, match="Unsupported percentile method"):
+        get_sorted_percentile(values, 50, method="nearest")
+
+
+def test_get_linear_slope():
+    """Test get_linear_slope function."""
+    assert get_linear_slope(np.array([0, 1, 2, 3]), np.array([1.0, 3.0, 5.0, 7.0])) == pytest.approx(2.0)
+    x = np.array([3, 10, 11, 40])
+    y = np.array([9.99, 10.99, 9.5, 12.0])
+    assert get_linear_slope(x, y) == pytest.approx(np.polyfit(x, y, 1)[0])
+    # the slope is undefined when x does not vary
+    assert get_linear_slope(np.array([5, 5, 5]), np.array([1.0, 2.0, 3.0])) == 0.0
+
+
+def test_get_sorted_median():
+    """Test get_sorted_median function."""
+    assert get_sorted_median(np.array([1.0, 2.0, 10.0])) == 2.0
+    assert get_sorted_median(np.array([1, 2, 4, 10])) == 3.0
+    assert get_sorted_median(np.array([5.0])) == 5.0